@@ -0,0 +1,162 @@
+""" Benchmark suite of the adapter against the in-process fake MCPO of fake_mcpo.py:
+
+    - list_tools_ollama: cold discovery time of N servers x M tools, fresh adapter and connections per run
+    - call_tool: sequential latency p50/p99 and throughput, parallel throughput of call_tools_from_response
+    - retained memory per registered tool
+    - MCPOService time to ready with the stub MCP server of the tests, if mcpo is installed
+
+    Save a run with --json and compare later runs against it with --baseline, a metric that got worse
+    by more than --tolerance fails the run with exit code 1.
+
+    python benchmarks/bench_adapter.py [--servers 4] [--tools 50] [--calls 500] [--latency 0.0]
+                                       [--json results.json] [--baseline results.json] [--tolerance 0.25]
+"""
+import argparse
+import gc
+import json
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter
+
+from fake_mcpo import FakeMCPOServer, create_app, server_name
+
+# Metrics where a higher value is better, every other metric is a duration or a size
+HIGHER_IS_BETTER = ("calls_per_second", "parallel_calls_per_second")
+
+
+def _percentile(timings: List[float], q: float) -> float:
+    ordered = sorted(timings)
+    return ordered[max(int(len(ordered) * q) - 1, 0)]
+
+
+def _tool_call(index: int, tools: int, servers: int) -> dict:
+    name = f"{server_name(index % servers)}_tool_{index % tools}"
+    return {"function": {"name": name, "arguments": {"path": f"/data/{index}", "limit": 10}}}
+
+
+def measure_discovery(server: FakeMCPOServer, runs: int = 5) -> float:
+    """ Milliseconds of a cold `list_tools_ollama`, best of `runs` """
+    timings = []
+    for _ in range(runs):
+        with OllamaMCPOAdapter(server.host, server.port) as adapter:
+            start = time.perf_counter()
+            adapter.list_tools_ollama()
+            timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def measure_memory(server: FakeMCPOServer) -> float:
+    """ Bytes retained by the registry per registered tool """
+    with OllamaMCPOAdapter(server.host, server.port) as adapter:
+        adapter.client.get(f"{server.base_url}/openapi.json")  # open the connection outside of the measurement
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tools = adapter.list_tools_ollama()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+    return retained / max(len(tools), 1)
+
+
+def measure_calls(server: FakeMCPOServer, calls: int, tools: int, servers: int) -> Dict[str, float]:
+    with OllamaMCPOAdapter(server.host, server.port) as adapter:
+        adapter.list_tools_ollama()
+        tool_calls = [_tool_call(i, tools, servers) for i in range(calls)]
+        adapter.call_tool(tool_calls[0])  # warm up
+
+        timings = []
+        start = time.perf_counter()
+        for tool_call in tool_calls:
+            call_start = time.perf_counter()
+            adapter.call_tool(tool_call)
+            timings.append(time.perf_counter() - call_start)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = adapter.call_tools_from_response(tool_calls, parallel=True, max_workers=16)
+        parallel = time.perf_counter() - start
+
+    errors = [result for result in results if isinstance(result, dict) and "error" in result]
+    if errors:
+        raise RuntimeError(f"{len(errors)} tool calls failed, eg. {errors[0]}")
+
+    return {"call_p50_ms": statistics.median(timings) * 1000, "call_p99_ms": _percentile(timings, 0.99) * 1000,
+            "calls_per_second": calls / sequential, "parallel_calls_per_second": calls / parallel}
+
+
+def measure_service_startup(runs: int = 3) -> Optional[float]:
+    """ Milliseconds until a MCPOService in thread launch mode is ready, None without mcpo """
+    if shutil.which("mcpo") is None:
+        return None
+    from bench_startup import measure_startup
+    from ollama_mcpo_adapter.service import THREAD
+    return statistics.median(measure_startup(THREAD, runs, 4292)) * 1000
+
+
+def run(servers: int = 4, tools: int = 50, calls: int = 500, latency: float = 0.0,
+        startup: bool = True) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    with FakeMCPOServer(create_app(servers, tools, latency)) as server:
+        results["list_tools_ms"] = measure_discovery(server)
+        results["bytes_per_tool"] = measure_memory(server)
+        results.update(measure_calls(server, calls, tools, servers))
+
+    startup_ms = measure_service_startup() if startup else None
+    if startup_ms is not None:
+        results["service_startup_ms"] = startup_ms
+    return results
+
+
+def regressions(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """ Descriptions of the metrics that got worse than the baseline by more than `tolerance` """
+    found = []
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if not reference or not value:
+            continue
+        worse = reference / value - 1 if name in HIGHER_IS_BETTER else value / reference - 1
+        if worse > tolerance:
+            found.append(f"{name}: {value:.3f} vs. baseline {reference:.3f} ({worse * 100:+.1f}%)")
+    return found
+
+
+def _report(results: Dict[str, float]) -> None:
+    for name, value in results.items():
+        print(f"{name:<28} {value:12.3f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=4, help="Number of fake MCP servers")
+    parser.add_argument("--tools", type=int, default=50, help="Number of tools per server")
+    parser.add_argument("--calls", type=int, default=500, help="Number of tool calls to measure")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every fake tool call takes")
+    parser.add_argument("--no-startup", action="store_true", help="Skip the MCPOService startup measurement")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="Fail if results are worse than this earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    print(f"{args.servers} servers x {args.tools} tools, {args.calls} calls, {args.latency * 1000:.1f} ms latency")
+    results = run(args.servers, args.tools, args.calls, args.latency, not args.no_startup)
+    _report(results)
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline is not None:
+        found = regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
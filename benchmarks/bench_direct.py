@@ -0,0 +1,64 @@
+""" Per-call latency of the same tool on the same stub MCP server: through MCPO (HTTP POST -> MCPO -> stdio)
+    versus DirectMCPAdapter (persistent stdio MCP session, no HTTP hop and no MCPO process).
+
+    python benchmarks/bench_direct.py [calls]
+"""
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter
+from ollama_mcpo_adapter.direct import DirectMCPAdapter
+from ollama_mcpo_adapter.service import MCPOService, THREAD
+
+STUB_SERVER = Path(__file__).parent.parent.joinpath("test", "data", "stub", "stub_mcp_server.py")
+CONFIG = {"mcpServers": {"stub": {"command": sys.executable, "args": [STUB_SERVER.as_posix()]}}}
+TOOL_CALL = {"function": {"name": "stub_echo", "arguments": {"text": "Hello from the benchmark"}}}
+
+
+def _measure(adapter: OllamaMCPOAdapter, calls: int) -> List[float]:
+    adapter.list_tools_ollama()
+    adapter.call_tool(TOOL_CALL)  # warm up
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        result = adapter.call_tool(TOOL_CALL)
+        timings.append(time.perf_counter() - start)
+    if result != TOOL_CALL["function"]["arguments"]["text"]:
+        raise RuntimeError(f"Unexpected tool result: {result}")
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> float:
+    mean = statistics.mean(timings) * 1000
+    p50 = statistics.median(timings) * 1000
+    p99 = sorted(timings)[int(len(timings) * 0.99) - 1] * 1000
+    print(f"{label:<8} mean {mean:7.3f} ms   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+    return mean
+
+
+def main(calls: int = 500) -> None:
+    with DirectMCPAdapter(config=CONFIG) as adapter:
+        direct = _report("direct", _measure(adapter, calls))
+
+    if shutil.which("mcpo") is None:
+        print("mcpo is not installed, skipping the MCPO path")
+        return
+
+    service = MCPOService("127.0.0.1", 4293, config=CONFIG, launch_mode=THREAD)
+    service.start(wait=True)
+    try:
+        with OllamaMCPOAdapter("127.0.0.1", 4293, config=CONFIG) as adapter:
+            mcpo = _report("mcpo", _measure(adapter, calls))
+    finally:
+        service.stop()
+        service.cleanup()
+
+    print(f"saved per call: {mcpo - direct:.3f} ms ({(1 - direct / mcpo) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,71 @@
+""" Micro benchmark: per-call latency of dispatch_tool_call with a fresh connection per call
+    versus the pooled keep-alive client owned by OllamaMCPOAdapter.
+
+    python benchmarks/bench_http_client.py [calls]
+"""
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import httpx
+
+from ollama_mcpo_adapter.dispatcher import dispatch_tool_call
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.dumps({"echo": json.loads(body or b"{}")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _measure(call: Callable[[], object], calls: int) -> List[float]:
+    call()  # warm up
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> float:
+    mean = statistics.mean(timings) * 1000
+    p50 = statistics.median(timings) * 1000
+    p99 = sorted(timings)[int(len(timings) * 0.99) - 1] * 1000
+    print(f"{label:<22} mean {mean:7.3f} ms   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+    return mean
+
+
+def main(calls: int = 500) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/time/get_current_time"
+    params = {"timezone": "Europe/Berlin"}
+
+    try:
+        fresh = _report("connection per call", _measure(lambda: dispatch_tool_call(url, params), calls))
+        with httpx.Client() as client:
+            pooled = _report("pooled client", _measure(lambda: dispatch_tool_call(url, params, client=client), calls))
+    finally:
+        server.shutdown()
+
+    print(f"saved per call: {fresh - pooled:.3f} ms ({(1 - pooled / fresh) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,46 @@
+""" Startup benchmark: wall clock time from MCPOService.start until every MCP server answers,
+    for mcpo launched from a spawned Python process versus supervised from a thread of this process.
+    Uses the stub MCP server of the tests, so no downloads are involved.
+
+    python benchmarks/bench_startup.py [runs]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from ollama_mcpo_adapter.service import MCPOService, PROCESS, THREAD
+
+STUB_SERVER = Path(__file__).parent.parent.joinpath("test", "data", "stub", "stub_mcp_server.py")
+CONFIG = {"mcpServers": {"stub": {"command": sys.executable, "args": [STUB_SERVER.as_posix()]}}}
+
+
+def measure_startup(launch_mode: str, runs: int, port: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        service = MCPOService("127.0.0.1", port, config=CONFIG, launch_mode=launch_mode)
+        start = time.perf_counter()
+        service.start(wait=True)
+        elapsed = time.perf_counter() - start
+        service.stop()
+        if not service.is_ready():
+            raise RuntimeError(f"mcpo did not become ready in {launch_mode} mode")
+        timings.append(elapsed)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> float:
+    mean = statistics.mean(timings) * 1000
+    print(f"{label:<10} mean {mean:8.1f} ms   min {min(timings) * 1000:8.1f} ms   max {max(timings) * 1000:8.1f} ms")
+    return mean
+
+
+def main(runs: int = 5) -> None:
+    process = _report("process", measure_startup(PROCESS, runs, 4290))
+    thread = _report("thread", measure_startup(THREAD, runs, 4291))
+    print(f"saved per start: {process - thread:.1f} ms ({(1 - thread / process) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,124 @@
+""" In-process fake of a MCPO instance for benchmarks: N MCP servers with M synthetic tools each.
+
+    Serves the root and per server OpenAPI specs in the shape MCPO generates and answers every tool
+    call with its arguments after a configurable latency. No mcpo, npx or uvx involved.
+
+    app = create_app(servers=4, tools=50, latency=0.001)
+    with FakeMCPOServer(app) as server:
+        adapter = OllamaMCPOAdapter(server.host, server.port)
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def server_name(index: int) -> str:
+    return f"server_{index}"
+
+
+def tool_spec(server: str, index: int) -> Dict[str, Any]:
+    """ OpenAPI operation and form model of one synthetic tool """
+    model = {
+        "type": "object", "title": f"tool_{index}_form_model", "required": ["path"],
+        "properties": {
+            "path": {"type": "string", "title": "Path", "description": f"Path the tool {index} of {server} works on"},
+            "limit": {"type": "integer", "title": "Limit", "default": 100, "description": "Maximum number of items"},
+            "recursive": {"type": "boolean", "title": "Recursive", "default": False},
+            "tags": {"type": "array", "title": "Tags", "items": {"type": "string"}},
+            "mode": {"anyOf": [{"type": "string", "enum": ["fast", "full"]}, {"type": "null"}], "title": "Mode"},
+        },
+    }
+    operation = {
+        "summary": f"Tool {index}",
+        "description": f"Synthetic tool number {index} of the {server} MCP server. Reads the given path and "
+                       f"returns up to `limit` items, optionally recursing into sub directories.",
+        "operationId": f"tool_tool_{index}_post",
+        "requestBody": {"content": {"application/json": {
+            "schema": {"$ref": f"#/components/schemas/tool_{index}_form_model"}}}, "required": True},
+        "responses": {"200": {"description": "Successful Response", "content": {"application/json": {"schema": {}}}}},
+    }
+    return {"operation": operation, "model": model}
+
+
+def server_openapi(server: str, tools: int) -> Dict[str, Any]:
+    paths, schemas = {}, {}
+    for index in range(tools):
+        spec = tool_spec(server, index)
+        paths[f"/tool_{index}"] = {"post": spec["operation"]}
+        schemas[f"tool_{index}_form_model"] = spec["model"]
+    return {"openapi": "3.1.0", "info": {"title": server, "version": "1.0.0"}, "paths": paths,
+            "components": {"schemas": schemas}}
+
+
+def root_openapi(servers: List[str]) -> Dict[str, Any]:
+    description = "MCP Tool Server\n" + "\n".join(f"- [{name}](/{name}/docs)" for name in servers)
+    return {"openapi": "3.1.0", "info": {"title": "MCP OpenAPI Proxy", "description": description,
+                                         "version": "1.0"}, "paths": {}}
+
+
+def create_app(servers: int = 4, tools: int = 50, latency: float = 0.0) -> FastAPI:
+    """ Fake MCPO app serving `servers` x `tools` tools, each tool call takes `latency` seconds """
+    names = [server_name(i) for i in range(servers)]
+    specs = {name: server_openapi(name, tools) for name in names}
+    root = root_openapi(names)
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+
+    @app.get("/openapi.json")
+    async def get_root_openapi() -> JSONResponse:
+        return JSONResponse(root)
+
+    @app.get("/{server}/openapi.json")
+    async def get_server_openapi(server: str) -> JSONResponse:
+        if server not in specs:
+            return JSONResponse({"detail": "Not Found"}, status_code=404)
+        return JSONResponse(specs[server])
+
+    @app.post("/{server}/{tool}")
+    async def call_tool(server: str, tool: str, request: Request) -> JSONResponse:
+        if server not in specs or f"/{tool}" not in specs[server]["paths"]:
+            return JSONResponse({"detail": "Not Found"}, status_code=404)
+        if latency:
+            await asyncio.sleep(latency)
+        return JSONResponse({"server": server, "tool": tool, "arguments": await request.json()})
+
+    return app
+
+
+class FakeMCPOServer:
+    """ Serves an ASGI app with uvicorn from a background thread on a free port """
+
+    def __init__(self, app: Any, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self._server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning",
+                                                     lifespan="off", access_log=False))
+        self._thread = threading.Thread(target=self._server.run, name="FakeMCPOServer", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> None:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Fake MCPO server did not start")
+            time.sleep(0.01)
+        self.port = self._server.servers[0].sockets[0].getsockname()[1]
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+    def __enter__(self) -> 'FakeMCPOServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
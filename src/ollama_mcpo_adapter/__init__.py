@@ -1,7 +1,33 @@
-from dotenv import load_dotenv
-load_dotenv()
+import importlib
+from typing import Any, List
 
-from .adapter import OllamaMCPOAdapter
-from .service import MCPOService
+# Public names and their submodules, imported on first access so that importing the package stays cheap
+_LAZY_IMPORTS = {
+    "OllamaMCPOAdapter": ".adapter",
+    "AsyncOllamaMCPOAdapter": ".async_adapter",
+    "MCPOService": ".service",
+    "MCPOCluster": ".cluster",
+}
 
-__all__ = ["OllamaMCPOAdapter", "MCPOService"]
+__all__ = ["OllamaMCPOAdapter", "AsyncOllamaMCPOAdapter", "MCPOService", "MCPOCluster", "load_dotenv"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+def load_dotenv(*args, **kwargs) -> bool:
+    """ Load environment variables, eg. WIN_NODEJS_NPX_PATH, from a .env file. Call it before creating
+        services or adapters, arguments are passed to dotenv.load_dotenv
+    """
+    from dotenv import load_dotenv as _load_dotenv
+    return _load_dotenv(*args, **kwargs)
@@ -1,22 +1,79 @@
+import functools
 import json
 import logging
 import re
 import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Any, Sequence, Optional, Union
+from typing import List, Dict, Any, Sequence, Optional, Set, Union, Tuple, Collection, TYPE_CHECKING
 
 import httpx
-from ollama import Message
 
+from .catalog_cache import ToolCatalogCache, CatalogEntry, ToolEntry, spec_hash, options_hash
+from .coalescing import SingleFlight
+from .compaction import SchemaCompactor
 from .config_parser import parse_to_config, get_mcp_server_names
-from .dispatcher import dispatch_tool_call
+from .dispatcher import dispatch_tool_call, stream_tool_call, CONNECT_ERRORS, DispatchInfo
+from .metrics import Metrics
+from .passthrough import RawToolResult
+from .pool import EndpointPool, EndpointLike, MCPOEndpoint
+from .registry import ToolRegistrySnapshot, ToolRecord
+from .resilience import ResiliencePolicy, CallBudget
+from .result_cache import ToolResultCache, MISS
+from .scheduler import ToolCallScheduler
+from .schema import SchemaNormalizer
+from .streaming import ToolResultStream, DEFAULT_CHUNK_SIZE
+from .tool_selector import ToolSelector
+from .validation import ArgumentValidator, ArgumentError, VALIDATION_ERROR
 
+if TYPE_CHECKING:
+    # ollama is only needed for type hints, tool calls are read like dicts
+    from ollama import Message
 
-class OllamaMCPOAdapter:
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+class MCPOAdapterBase:
+    """ Transport independent part of the adapters: OpenAPI parsing, tool registry and tool call decoding """
     SERVER_DESCRIPTION_PATTERN = re.compile(r"\[([\w_-]+)]")  # find [time] [file-system] [some-123_name]
 
     def __init__(self, host: str = "localhost", port: int = 5090, config: Optional[Dict] = None,
-                 config_path: Optional[Union[str, Path]] = None):
+                 config_path: Optional[Union[str, Path]] = None, limits: Optional[httpx.Limits] = None,
+                 timeout: Union[float, httpx.Timeout, None] = DEFAULT_TIMEOUT, http2: bool = False,
+                 catalog_cache: Optional[ToolCatalogCache] = None, result_cache: Optional[ToolResultCache] = None,
+                 endpoints: Union[Sequence[EndpointLike], EndpointPool, None] = None,
+                 health_check_interval: Optional[float] = None, schema_compactor: Optional[SchemaCompactor] = None,
+                 metrics: Optional[Metrics] = None, resilience: Optional[ResiliencePolicy] = None,
+                 coalescer: Optional[SingleFlight] = None, validator: Optional[ArgumentValidator] = None):
+        """
+        :param host: MCPO host, ignored if `endpoints` are given
+        :param port: MCPO port, ignored if `endpoints` are given
+        :param config: MCP config to read the MCP server names from instead of the MCPO docs
+        :param config_path: path to a MCP config file, alternative to `config`
+        :param limits: connection pool limits of the HTTP client
+        :param timeout: timeout of the HTTP client
+        :param http2: enable HTTP/2 (requires the h2 package: pip install httpx[http2])
+        :param catalog_cache: keeps parsed tools between calls and processes
+        :param result_cache: answers repeated calls of idempotent tools
+        :param endpoints: several MCPO instances serving the same config, "host:port" strings, (host, port)
+                          tuples or an EndpointPool. Tool calls are load balanced and fail over between them.
+        :param health_check_interval: seconds between active health checks of the `endpoints`
+        :param schema_compactor: shrinks the parsed tool definitions, see `schema_compactor.report()` for the savings
+        :param metrics: records tool call latency, payload sizes, errors, cache hits and discovery durations
+        :param resilience: timeout budgets, retries of idempotent tools and circuit breakers per MCP server
+        :param coalescer: shares one in-flight request between identical concurrent calls of idempotent tools
+        :param validator: checks and coerces tool call arguments against the tool schemas, invalid calls are
+                          answered with the problems found instead of being dispatched
+        """
+        self.pool: Optional[EndpointPool] = None
+        if endpoints is not None:
+            self.pool = endpoints if isinstance(endpoints, EndpointPool) else EndpointPool(endpoints)
+            host, port = self.pool.endpoints[0].host, self.pool.endpoints[0].port
+        self.health_check_interval = health_check_interval
+
         if host == "0.0.0.0":
             host = socket.gethostbyname(socket.gethostname())
 
@@ -27,8 +84,82 @@ class OllamaMCPOAdapter:
         if config is not None or config_path is not None:
             self.mcp_config = parse_to_config(config, config_path)
 
-        self.tool_registry: Dict[str, str] = {}
-        self.ollama_tools: List[Dict[str, Any]] = []
+        self._tools = ToolRegistrySnapshot()
+        # Tools their MCP server marks read-only, cacheable without being listed in the result cache allow list.
+        # Rebuilt with every registry snapshot from the hints of the last tool listing of each server.
+        self.read_only_tools: Set[str] = set()
+        self._read_only_hints: Dict[str, Set[str]] = {}
+        self._registry_lock = threading.Lock()
+        self._selector: Tuple[Optional[ToolRegistrySnapshot], Optional[ToolSelector]] = (None, None)
+
+        self.limits = limits or DEFAULT_LIMITS
+        self.timeout = timeout
+        self.http2 = http2
+        self.catalog_cache = catalog_cache
+        self.result_cache = result_cache
+        self.schema_compactor = schema_compactor
+        self.metrics = metrics
+        self.resilience = resilience
+        self.coalescer = coalescer
+        self.validator = validator
+
+    @property
+    def server_base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def discovery_base_url(self) -> str:
+        """ Base url of the MCPO instance to fetch the OpenAPI specs from """
+        if self.pool is None:
+            return self.server_base_url
+        return self.pool.pick().base_url
+
+    def _endpoint_url(self, tool_url: str, endpoint: MCPOEndpoint) -> str:
+        """ Move a registered tool url to another MCPO instance of the pool """
+        return f"{endpoint.base_url}{tool_url[len(self.server_base_url):]}"
+
+    @property
+    def tool_registry(self) -> Dict[str, str]:
+        """ Tool name to tool url of the current registry snapshot """
+        return self._tools.tool_registry
+
+    @property
+    def tool_servers(self) -> Dict[str, str]:
+        """ Tool name to MCP server name of the current registry snapshot """
+        return self._tools.tool_servers
+
+    @property
+    def ollama_tools(self) -> List[Dict[str, Any]]:
+        """ Ollama tool definitions of the current registry snapshot """
+        return self._tools.ollama_tools
+
+    def tool_record(self, tool_name: str) -> Optional[ToolRecord]:
+        """ Registry record of a tool: server, url, parameters schema and Ollama definition """
+        return self._tools.get(tool_name)
+
+    @property
+    def servers(self) -> List[str]:
+        """ Names of the MCP servers with registered tools """
+        return list(self._tools.servers)
+
+    @property
+    def circuit_breakers(self) -> Dict[str, Dict[str, Any]]:
+        """ Circuit breaker state per MCP server, empty without a resilience policy """
+        return self.resilience.states() if self.resilience is not None else {}
+
+    @property
+    def tool_selector(self) -> ToolSelector:
+        """ BM25 index over the current registry snapshot, rebuilt after registry changes """
+        tools, selector = self._selector
+        if tools is not self._tools:
+            tools = self._tools
+            selector = ToolSelector(tools.ollama_tools)
+            self._selector = (tools, selector)
+        return selector
+
+    def select_tools(self, query: str, k: int = 8, always: Collection[str] = ()) -> List[Dict[str, Any]]:
+        """ Ollama tool definitions of the `k` tools most relevant for `query`, plus the tools named in `always` """
+        return self.tool_selector.select(query, k, always)
 
     @staticmethod
     def _resolve_ref(ref: str, schemas: Dict[str, Any]) -> Dict[str, Any]:
@@ -37,57 +168,290 @@ class OllamaMCPOAdapter:
             return schemas.get(key, {})
         return {}
 
+    def _parse_openapi_tools(self, name: str, spec: Dict[str, Any],
+                             server_base_url: str) -> List[ToolEntry]:
+        """ Convert the OpenAPI spec of MCP server `name` into (tool name, tool url, Ollama tool definition) """
+        tools = []
+        normalizer = SchemaNormalizer(spec)
+
+        for path, methods in spec.get("paths", {}).items():
+            if "post" not in methods:
+                continue
+
+            post = methods["post"]
+            tool_name = f"{name}_{path.strip('/').replace('/', '_')}"
+            description = post.get("description", "")
+            body = post.get("requestBody", {})
+
+            schema = body.get("content", {}).get("application/json", {}).get("schema", {})
+            tool_def = {"type": "function", "function": {"name": tool_name, "description": description,
+                "parameters": normalizer.parameters(schema)}}
+            if self.schema_compactor is not None:
+                tool_def = self.schema_compactor.compact_tool(tool_def)
+
+            tools.append((tool_name, f"{server_base_url}/{name}{path}", tool_def))
+        return tools
+
     @staticmethod
-    def _clean_properties(props: Dict[str, Any]) -> Dict[str, Any]:
-        cleaned = {}
-        for name, definition in props.items():
-            definition.pop("title", None)
-            if definition.get("description", "").strip() == "":
-                definition.pop("description", None)
-            cleaned[name] = definition
-        return cleaned
-
-    def list_tools_ollama(self) -> List[Dict[str, Any]]:
-        """ Contacts the MCPO FastAPI server docs and retrieves available MCP servers and their functions """
-        self.ollama_tools.clear()
-        self.tool_registry.clear()
-
-        server_base_url = f"http://{self.host}:{self.port}"
-
-        for name in self._discover_servers(server_base_url):
-            openapi_url = f"{server_base_url}/{name}/openapi.json"
+    def _needs_refresh(name: str, refresh: Union[bool, Collection[str]]) -> bool:
+        if isinstance(refresh, bool):
+            return refresh
+        return name in refresh
+
+    def _catalog_lookup(self, name: str, refresh: bool) -> Tuple[Optional[CatalogEntry], Dict[str, str]]:
+        """ Return the cached tools entry of server `name` and the headers to revalidate it """
+        if self.catalog_cache is None or refresh:
+            return None, {}
+
+        entry = self.catalog_cache.get(self.host, self.port, name)
+        if entry is not None and entry.options != self._parse_options_hash():
+            return None, {}  # parsed with other options, the spec needs to be parsed again
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        return entry, headers
+
+    def _tools_from_spec_response(self, name: str, response: httpx.Response, entry: Optional[CatalogEntry],
+                                  server_base_url: str) -> List[ToolEntry]:
+        """ Parse the OpenAPI spec response of server `name` unless the cached entry is still valid """
+        if entry is not None and response.status_code == 304:
+            self.catalog_cache.touch(self.host, self.port, name, entry)
+            return entry.tools
+
+        response.raise_for_status()
+        if self.catalog_cache is None:
+            return self._parse_openapi_tools(name, response.json(), server_base_url)
+
+        content_hash = spec_hash(response.content)
+        if entry is not None and entry.spec_hash == content_hash:
+            self.catalog_cache.touch(self.host, self.port, name, entry)
+            return entry.tools
+
+        tools = self._parse_openapi_tools(name, response.json(), server_base_url)
+        entry = CatalogEntry(tools, content_hash, response.headers.get("etag"), options=self._parse_options_hash())
+        self.catalog_cache.put(self.host, self.port, name, entry)
+        return tools
+
+    def _parse_options_hash(self) -> str:
+        """ Hash of the options that change the parsed tools, cached tools are only used if it matches """
+        compactor = self.schema_compactor
+        return options_hash({"schema_compactor": compactor.settings() if compactor is not None else None})
+
+    def _swap_tools(self, snapshot: ToolRegistrySnapshot) -> None:
+        self._compile_validators(snapshot)
+        with self._registry_lock:
+            self._set_snapshot(snapshot)
+
+    def _replace_server_tools(self, server_name: str, tools: List[ToolEntry]) -> List[Dict[str, Any]]:
+        """ Swap in the new tools of one server, the tools of every other server stay untouched """
+        with self._registry_lock:
+            snapshot = self._tools.with_server(server_name, tools)
+            self._compile_validators(snapshot)
+            self._set_snapshot(snapshot)
+            return snapshot.server_tools(server_name)
+
+    def _set_snapshot(self, snapshot: ToolRegistrySnapshot) -> None:
+        """ Install a registry snapshot together with its read-only tools, the caller holds the registry lock """
+        self._tools = snapshot
+        self.read_only_tools = {name for names in self._read_only_hints.values() for name in names if name in snapshot}
+
+    def _compile_validators(self, snapshot: ToolRegistrySnapshot) -> None:
+        if self.validator is not None:
+            self.validator.compile(snapshot)
+
+    def remove_server(self, server_name: str) -> None:
+        """ Remove the tools of one MCP server from the registry """
+        with self._registry_lock:
+            self._read_only_hints.pop(server_name, None)
+            self._set_snapshot(self._tools.without_server(server_name))
+
+    def _server_names_from_openapi(self, spec: Dict[str, Any]) -> List[str]:
+        desc = spec.get("info", {}).get("description", "")
+        return self.SERVER_DESCRIPTION_PATTERN.findall(desc)
+
+    def _prepare_tool_call(self, tool_call: 'Message.ToolCall') -> Tuple[str, str, Dict[str, Any]]:
+        """ Decode a tool call into the tool name, tool url and its parameters
+
+            :raises ArgumentError: if a validator rejects the arguments
+        """
+        function = tool_call.get("function", {})
+        tool_name = function.get("name")
+        args_json = function.get("arguments", "{}")
+
+        # Ollama hands over arguments already decoded, only OpenAI style tool calls carry a JSON string
+        if isinstance(args_json, dict):
+            params = args_json
+        elif isinstance(args_json, (str, bytes, bytearray)):
             try:
-                spec = httpx.get(openapi_url).json()
-                schemas = spec.get("components", {}).get("schemas", {})
+                params = json.loads(args_json)
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid JSON arguments: {args_json}")
+        else:
+            params = args_json
 
-                for path, methods in spec.get("paths", {}).items():
-                    if "post" not in methods:
-                        continue
+        record = self._tools.get(tool_name)
+        if record is None:
+            raise ValueError(f"Tool '{tool_name}' not found in registry.")
+        if self.validator is not None:
+            params = self.validator.validate(record, params)
+
+        return tool_name, record.url, params
 
-                    post = methods["post"]
-                    tool_name = f"{name}_{path.strip('/').replace('/', '_')}"
-                    description = post.get("description", "")
-                    body = post.get("requestBody", {})
+    def _cached_result(self, tool_name: str, params: Dict[str, Any]) -> Any:
+        if self.result_cache is None:
+            return MISS
+        read_only = tool_name in self.read_only_tools
+        result = self.result_cache.get(tool_name, params, read_only)
+        if self.metrics is not None and self.result_cache.is_cacheable(tool_name, read_only):
+            self.metrics.cache(tool_name, hit=result is not MISS)
+        return result
 
-                    schema = body.get("content", {}).get("application/json", {}).get("schema", {})
-                    if "$ref" in schema:
-                        schema = self._resolve_ref(schema["$ref"], schemas)
+    @staticmethod
+    def _decoded(result: Any) -> Any:
+        """ Results are shared by the cache and coalesced calls in whichever form was dispatched first """
+        return result.json() if isinstance(result, RawToolResult) else result
 
-                    cleaned_properties = self._clean_properties(schema.get("properties", {}))
-                    required = schema.get("required", [])
+    def _store_result(self, tool_name: str, params: Dict[str, Any], result: Any) -> None:
+        if self.result_cache is not None:
+            self.result_cache.put(tool_name, params, result, tool_name in self.read_only_tools)
 
-                    tool_def = {"type": "function", "function": {"name": tool_name, "description": description,
-                        "parameters": {"type": "object", "properties": cleaned_properties, "required": required}}}
+    def _rejected_call(self, error: ArgumentError) -> Dict[str, Any]:
+        if self.metrics is not None:
+            self.metrics.rejected(error.tool_name, self._tools.server_of(error.tool_name), VALIDATION_ERROR)
+        return error.result()
 
-                    full_url = f"{server_base_url}/{name}{path}"
-                    self.tool_registry[tool_name] = full_url
-                    self.ollama_tools.append(tool_def)
+    def _record_coalesced(self, tool_name: str, shared: bool) -> None:
+        if shared and self.metrics is not None:
+            self.metrics.coalesced(tool_name)
 
+    def _call_budget(self, tool_name: str) -> Optional[CallBudget]:
+        if self.resilience is None:
+            return None
+        return self.resilience.budget(tool_name, self._tools.server_of(tool_name))
+
+    def _record_tool_call(self, tool_name: str, start: float, info: DispatchInfo) -> None:
+        if self.metrics is not None:
+            self.metrics.tool_call(tool_name, self._tools.server_of(tool_name), time.perf_counter() - start,
+                                   info.request_bytes, info.response_bytes, info.error)
+
+    def _record_discovery(self, server_name: str, start: float, error: Optional[Exception] = None) -> None:
+        if self.metrics is not None:
+            self.metrics.discovery(server_name, time.perf_counter() - start,
+                                   type(error).__name__ if error is not None else None)
+
+    def _create_scheduler(self, tool_calls: Sequence['Message.ToolCall'], max_workers: int,
+                          max_per_server: Union[int, Dict[str, int], None],
+                          sequential_tools: Optional[Collection[str]]) -> ToolCallScheduler:
+        tool_names = [call.get("function", {}).get("name") for call in tool_calls]
+        tools = self._tools
+        servers = [tools.server_of(name) for name in tool_names]
+        return ToolCallScheduler(servers, tool_names, max_workers, max_per_server, sequential_tools)
+
+
+class OllamaMCPOAdapter(MCPOAdapterBase):
+    def __init__(self, host: str = "localhost", port: int = 5090, config: Optional[Dict] = None,
+                 config_path: Optional[Union[str, Path]] = None, client: Optional[httpx.Client] = None, **kwargs):
+        """ Adapter between a MCPO instance and Ollama tool calling.
+
+            Discovery and tool dispatch share one pooled, keep-alive httpx.Client. Pass your own `client`
+            to control it completely, otherwise one is created on first use from the `limits`, `timeout` and
+            `http2` options and closed with `close()`. See MCPOAdapterBase for all keyword options.
+        """
+        super().__init__(host, port, config, config_path, **kwargs)
+
+        self._client = client
+        self._owns_client = client is None
+        self._client_lock = threading.Lock()
+
+        self._health_check_stop = threading.Event()
+        self._health_check_thread: Optional[threading.Thread] = None
+        if self.pool is not None and self.health_check_interval:
+            self._health_check_thread = threading.Thread(target=self._run_health_checks, daemon=True,
+                                                         name="mcpo-health-check")
+            self._health_check_thread.start()
+
+    @property
+    def client(self) -> httpx.Client:
+        """ The pooled HTTP client shared by discovery and tool dispatch """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(limits=self.limits, timeout=self.timeout, http2=self.http2)
+        return self._client
+
+    def close(self) -> None:
+        """ Stop health checks and close the pooled HTTP client if it was created by this adapter """
+        if self._health_check_thread is not None:
+            self._health_check_stop.set()
+            self._health_check_thread.join()
+            self._health_check_thread = None
+
+        with self._client_lock:
+            if self._client is not None and self._owns_client:
+                self._client.close()
+                self._client = None
+
+    def __enter__(self) -> 'OllamaMCPOAdapter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _run_health_checks(self) -> None:
+        while not self._health_check_stop.wait(self.health_check_interval):
+            try:
+                self.check_endpoints()
+            except Exception as e:
+                logging.warning(f"MCPO endpoint health check failed: {e}")
+
+    def check_endpoints(self) -> List[MCPOEndpoint]:
+        """ Probe all MCPO endpoints, eject dead ones and return the healthy ones """
+        if self.pool is None:
+            return []
+        return self.pool.check_health(self.client)
+
+    def list_tools_ollama(self, refresh: Union[bool, Collection[str]] = False) -> List[Dict[str, Any]]:
+        """ Contacts the MCPO FastAPI server docs and retrieves available MCP servers and their functions
+
+            :param refresh: bypass the catalog cache for all (True) or the given server names
+        """
+        server_base_url = self.server_base_url
+        servers = {}
+
+        for name in self._discover_servers(self.discovery_base_url):
+            try:
+                servers[name] = self._load_server_tools(name, server_base_url, self._needs_refresh(name, refresh))
             except Exception as e:
-                logging.warning(f"Failed to load tools from {openapi_url}: {e}")
+                logging.warning(f"Failed to load tools from {server_base_url}/{name}/openapi.json: {e}")
 
+        self._swap_tools(ToolRegistrySnapshot(servers))
         return self.ollama_tools
 
+    def add_server(self, server_name: str) -> List[Dict[str, Any]]:
+        """ Load the tools of one MCP server, catalog cache permitting, and add them to the registry """
+        return self._replace_server_tools(server_name, self._load_server_tools(server_name, self.server_base_url))
+
+    def refresh_server(self, server_name: str) -> List[Dict[str, Any]]:
+        """ Re-fetch the tools of one MCP server and swap them into the registry, other servers are untouched """
+        tools = self._load_server_tools(server_name, self.server_base_url, refresh=True)
+        return self._replace_server_tools(server_name, tools)
+
+    def _load_server_tools(self, name: str, server_base_url: str, refresh: bool = False) -> List[ToolEntry]:
+        start = time.perf_counter()
+        try:
+            tools = self._fetch_server_tools(name, server_base_url, refresh)
+        except Exception as e:
+            self._record_discovery(name, start, e)
+            raise
+        self._record_discovery(name, start)
+        return tools
+
+    def _fetch_server_tools(self, name: str, server_base_url: str, refresh: bool) -> List[ToolEntry]:
+        entry, headers = self._catalog_lookup(name, refresh)
+        if entry is not None and self.catalog_cache.is_fresh(entry):
+            return entry.tools
+
+        response = self.client.get(f"{self.discovery_base_url}/{name}/openapi.json", headers=headers)
+        return self._tools_from_spec_response(name, response, entry, server_base_url)
+
     def _discover_servers(self, server_base_url: str) -> List[str]:
         """ Return a list of MCP Server names from the automatically generated MCPO docs description
             or from an existing MCP Configuration
@@ -95,31 +459,155 @@ class OllamaMCPOAdapter:
         if self.mcp_config is not None:
             return get_mcp_server_names(self.mcp_config)
 
-        response = httpx.get(f"{server_base_url}/openapi.json")
+        response = self.client.get(f"{server_base_url}/openapi.json")
         if response.status_code > 210:
             raise ConnectionError("MCPO service is not available or not ready")
 
-        desc = response.json().get("info", {}).get("description", "")
-        return self.SERVER_DESCRIPTION_PATTERN.findall(desc)
+        return self._server_names_from_openapi(response.json())
 
-    def call_tool(self, tool_call: Message.ToolCall) -> Any:
-        function = tool_call.get("function", {})
-        tool_name = function.get("name")
-        args_json = function.get("arguments", "{}")
+    def call_tool(self, tool_call: 'Message.ToolCall') -> Any:
+        return self._decoded(self._call_tool(tool_call, raw=False))
 
+    def call_tool_raw(self, tool_call: 'Message.ToolCall') -> RawToolResult:
+        """ Call a tool without decoding its result.
+
+            The returned RawToolResult keeps the response body as sent by MCPO, use `tool_message()` or
+            `text()` to pass it on to the model as it is and `json()` only if the result is needed decoded.
+        """
+        return RawToolResult.from_result(self._call_tool(tool_call, raw=True))
+
+    def call_tool_message(self, tool_call: 'Message.ToolCall', max_bytes: Optional[int] = None) -> Dict[str, str]:
+        """ Call a tool and return its undecoded result as Ollama `tool` message, cut to `max_bytes` if given """
+        return self.call_tool_raw(tool_call).tool_message(tool_call.get("function", {}).get("name"), max_bytes)
+
+    def _call_tool(self, tool_call: 'Message.ToolCall', raw: bool) -> Any:
         try:
-            if isinstance(args_json, (str, bytes, bytearray)):
-                params = json.loads(args_json)
-            else:
-                params = args_json
-        except json.JSONDecodeError:
-            raise ValueError(f"Invalid JSON arguments: {args_json}")
+            tool_name, tool_url, params = self._prepare_tool_call(tool_call)
+        except ArgumentError as e:
+            return self._rejected_call(e)
+        result = self._cached_result(tool_name, params)
+        if result is not MISS:
+            return result
+        if self.coalescer is None:
+            return self._call_uncached(tool_name, tool_url, params, raw)
 
-        if tool_name not in self.tool_registry:
-            raise ValueError(f"Tool '{tool_name}' not found in registry.")
+        result, shared = self.coalescer.call(tool_name, params,
+                                             lambda: self._call_uncached(tool_name, tool_url, params, raw))
+        self._record_coalesced(tool_name, shared)
+        return result
+
+    def _call_uncached(self, tool_name: str, tool_url: str, params: Dict[str, Any], raw: bool = False) -> Any:
+        info, start = DispatchInfo(), time.perf_counter()
+        result = self._resilient_dispatch(tool_name, tool_url, params, info, raw)
+        self._record_tool_call(tool_name, start, info)
+        self._store_result(tool_name, params, result)
+        return result
+
+    def _resilient_dispatch(self, tool_name: str, tool_url: str, params: Dict[str, Any], info: DispatchInfo,
+                            raw: bool = False) -> Any:
+        budget = self._call_budget(tool_name)
+        if budget is None:
+            return self._dispatch(tool_url, params, info, raw=raw)
+
+        while True:
+            rejected = budget.start(info)
+            if rejected is not None:
+                return rejected
+            result = self._dispatch(tool_url, params, info, budget.timeout(), raw)
+            delay = budget.finish(info)
+            if delay is None:
+                return result
+            logging.info(f"Retrying {tool_name} in {delay:.2f}s after {info.error}")
+            time.sleep(delay)
+
+    def _dispatch(self, tool_url: str, params: Dict[str, Any], info: Optional[DispatchInfo] = None,
+                  timeout: Optional[float] = None, raw: bool = False) -> Any:
+        if self.pool is None:
+            return dispatch_tool_call(tool_url, params, client=self.client, info=info, timeout=timeout, raw=raw)
+
+        # Route to the least busy healthy instance, fail over if the request could not be delivered
+        tried: List[MCPOEndpoint] = []
+        while True:
+            endpoint = self.pool.acquire(exclude=tried)
+            try:
+                result = dispatch_tool_call(self._endpoint_url(tool_url, endpoint), params, client=self.client,
+                                            raise_connect_errors=True, info=info, timeout=timeout, raw=raw)
+                self.pool.mark_healthy(endpoint)
+                return result
+            except CONNECT_ERRORS as e:
+                self.pool.mark_failed(endpoint)
+                tried.append(endpoint)
+                if len(tried) >= len(self.pool):
+                    if info is not None:
+                        info.record(error=e)
+                    return {"error": str(e)}
+            finally:
+                self.pool.release(endpoint)
+
+    def call_tool_stream(self, tool_call: 'Message.ToolCall', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         max_bytes: Optional[int] = None) -> ToolResultStream:
+        """ Call a tool and stream its result instead of decoding it as a whole.
+
+            Iterate the returned stream for raw chunks, use `iter_json()` to parse the items of a top level
+            array incrementally or `iter_text()` to unquote a top level string, eg. file contents, piece by
+            piece. Reading stops after `max_bytes`, see `stream.truncated`. With several MCPO instances the
+            call fails over like `call_tool` if an instance can not be reached.
+
+            Streamed calls bypass the result cache, coalescing, the resilience policy and metrics. The
+            arguments are validated and the timeouts of the HTTP client apply to every read.
+
+            :raises httpx.HTTPError: if the tool call failed
+        """
+        _, tool_url, params = self._prepare_tool_call(tool_call)
+        if self.pool is None:
+            return stream_tool_call(tool_url, params, self.client, chunk_size, max_bytes)
+
+        # Route like _dispatch, the instance counts as busy until the stream is closed
+        tried: List[MCPOEndpoint] = []
+        while True:
+            endpoint = self.pool.acquire(exclude=tried)
+            try:
+                stream = stream_tool_call(self._endpoint_url(tool_url, endpoint), params, self.client, chunk_size,
+                                          max_bytes, on_close=functools.partial(self.pool.release, endpoint))
+            except CONNECT_ERRORS:
+                self.pool.mark_failed(endpoint)
+                self.pool.release(endpoint)
+                tried.append(endpoint)
+                if len(tried) >= len(self.pool):
+                    raise
+                continue
+            except BaseException:
+                self.pool.release(endpoint)
+                raise
+            self.pool.mark_healthy(endpoint)
+            return stream
+
+    def call_tools_from_response(self, tool_calls: Sequence['Message.ToolCall'], parallel: bool = False,
+                                 max_workers: int = 8, max_per_server: Union[int, Dict[str, int], None] = None,
+                                 sequential_tools: Optional[Collection[str]] = None) -> List[Any]:
+        """ Execute the tool calls of a model response and return their results in the original order.
+
+            :param parallel: run independent calls concurrently on up to `max_workers` threads
+            :param max_per_server: maximum calls in flight per MCP server, a number for every server
+                                   or a mapping of server name to limit
+            :param sequential_tools: tool or server names whose calls must keep the response order,
+                                     each of them waits for the previous one
+        """
+        if not parallel:
+            return [self.call_tool(call) for call in tool_calls]
+
+        scheduler = self._create_scheduler(tool_calls, max_workers, max_per_server, sequential_tools)
+        futures: List[Optional[Future]] = [None] * len(tool_calls)
+        running: Dict[Future, int] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcpo-tool-call") as executor:
+            while not scheduler.finished:
+                for index in scheduler.take_ready():
+                    futures[index] = executor.submit(self.call_tool, tool_calls[index])
+                    running[futures[index]] = index
 
-        tool_url = self.tool_registry[tool_name]
-        return dispatch_tool_call(tool_url, params)
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    scheduler.finish(running.pop(future))
 
-    def call_tools_from_response(self, tool_calls: Sequence[Message.ToolCall]) -> List[Any]:
-        return [self.call_tool(call) for call in tool_calls]
+        return [future.result() for future in futures]
@@ -0,0 +1,299 @@
+import asyncio
+import functools
+import logging
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Sequence, Optional, Union, Collection, TYPE_CHECKING
+
+import httpx
+
+from .adapter import MCPOAdapterBase
+from .catalog_cache import ToolEntry
+from .config_parser import get_mcp_server_names
+from .dispatcher import async_dispatch_tool_call, async_stream_tool_call, CONNECT_ERRORS, DispatchInfo
+from .passthrough import RawToolResult
+from .pool import MCPOEndpoint
+from .registry import ToolRegistrySnapshot
+from .result_cache import MISS
+from .streaming import AsyncToolResultStream, DEFAULT_CHUNK_SIZE
+from .validation import ArgumentError
+
+if TYPE_CHECKING:
+    # ollama is only needed for type hints, tool calls are read like dicts
+    from ollama import Message
+
+
+class AsyncOllamaMCPOAdapter(MCPOAdapterBase):
+    def __init__(self, host: str = "localhost", port: int = 5090, config: Optional[Dict] = None,
+                 config_path: Optional[Union[str, Path]] = None, client: Optional[httpx.AsyncClient] = None,
+                 **kwargs):
+        """ asyncio counterpart of OllamaMCPOAdapter built on a pooled httpx.AsyncClient.
+
+            The OpenAPI specs of all MCP servers are fetched concurrently, the resulting tool
+            definitions are identical to the ones of the synchronous adapter.
+            See MCPOAdapterBase for all keyword options.
+        """
+        super().__init__(host, port, config, config_path, **kwargs)
+
+        self._client = client
+        self._owns_client = client is None
+        self._health_check_task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """ The pooled HTTP client shared by discovery and tool dispatch """
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+        return self._client
+
+    async def aclose(self) -> None:
+        """ Stop health checks and close the pooled HTTP client if it was created by this adapter """
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            try:
+                await self._health_check_task
+            except asyncio.CancelledError:
+                pass
+            self._health_check_task = None
+
+        if self._client is not None and self._owns_client:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def __aenter__(self) -> 'AsyncOllamaMCPOAdapter':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    def _ensure_health_checks(self) -> None:
+        """ Start the periodic endpoint health checks on the running event loop """
+        if self.pool is not None and self.health_check_interval and self._health_check_task is None:
+            self._health_check_task = asyncio.ensure_future(self._run_health_checks())
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_endpoints()
+            except Exception as e:
+                logging.warning(f"MCPO endpoint health check failed: {e}")
+
+    async def check_endpoints(self) -> List[MCPOEndpoint]:
+        """ Probe all MCPO endpoints, eject dead ones and return the healthy ones """
+        if self.pool is None:
+            return []
+        return await self.pool.async_check_health(self.client)
+
+    async def list_tools_ollama(self, refresh: Union[bool, Collection[str]] = False) -> List[Dict[str, Any]]:
+        """ Contacts the MCPO FastAPI server docs and retrieves available MCP servers and their functions
+
+            :param refresh: bypass the catalog cache for all (True) or the given server names
+        """
+        self._ensure_health_checks()
+        server_base_url = self.server_base_url
+        names = await self._discover_servers(self.discovery_base_url)
+        results = await asyncio.gather(*(self._load_server_tools(name, server_base_url,
+                                                                 self._needs_refresh(name, refresh))
+                                         for name in names), return_exceptions=True)
+
+        servers = {name: tools for name, tools in zip(names, results) if not isinstance(tools, BaseException)}
+        for name, tools in zip(names, results):
+            if isinstance(tools, BaseException):
+                logging.warning(f"Failed to load tools from {server_base_url}/{name}/openapi.json: {tools}")
+
+        self._swap_tools(ToolRegistrySnapshot(servers))
+        return self.ollama_tools
+
+    async def add_server(self, server_name: str) -> List[Dict[str, Any]]:
+        """ Load the tools of one MCP server, catalog cache permitting, and add them to the registry """
+        tools = await self._load_server_tools(server_name, self.server_base_url)
+        return self._replace_server_tools(server_name, tools)
+
+    async def refresh_server(self, server_name: str) -> List[Dict[str, Any]]:
+        """ Re-fetch the tools of one MCP server and swap them into the registry, other servers are untouched """
+        tools = await self._load_server_tools(server_name, self.server_base_url, refresh=True)
+        return self._replace_server_tools(server_name, tools)
+
+    async def _load_server_tools(self, name: str, server_base_url: str, refresh: bool = False) -> List[ToolEntry]:
+        start = time.perf_counter()
+        try:
+            tools = await self._fetch_server_tools(name, server_base_url, refresh)
+        except Exception as e:
+            self._record_discovery(name, start, e)
+            raise
+        self._record_discovery(name, start)
+        return tools
+
+    async def _fetch_server_tools(self, name: str, server_base_url: str, refresh: bool) -> List[ToolEntry]:
+        entry, headers = self._catalog_lookup(name, refresh)
+        if entry is not None and self.catalog_cache.is_fresh(entry):
+            return entry.tools
+
+        response = await self.client.get(f"{self.discovery_base_url}/{name}/openapi.json", headers=headers)
+        return self._tools_from_spec_response(name, response, entry, server_base_url)
+
+    async def _discover_servers(self, server_base_url: str) -> List[str]:
+        """ Return a list of MCP Server names from the automatically generated MCPO docs description
+            or from an existing MCP Configuration
+        """
+        if self.mcp_config is not None:
+            return get_mcp_server_names(self.mcp_config)
+
+        response = await self.client.get(f"{server_base_url}/openapi.json")
+        if response.status_code > 210:
+            raise ConnectionError("MCPO service is not available or not ready")
+
+        return self._server_names_from_openapi(response.json())
+
+    async def call_tool(self, tool_call: 'Message.ToolCall') -> Any:
+        return self._decoded(await self._call_tool(tool_call, raw=False))
+
+    async def call_tool_raw(self, tool_call: 'Message.ToolCall') -> RawToolResult:
+        """ Call a tool without decoding its result, see OllamaMCPOAdapter.call_tool_raw """
+        return RawToolResult.from_result(await self._call_tool(tool_call, raw=True))
+
+    async def call_tool_message(self, tool_call: 'Message.ToolCall',
+                                max_bytes: Optional[int] = None) -> Dict[str, str]:
+        """ Call a tool and return its undecoded result as Ollama `tool` message, cut to `max_bytes` if given """
+        result = await self.call_tool_raw(tool_call)
+        return result.tool_message(tool_call.get("function", {}).get("name"), max_bytes)
+
+    async def _call_tool(self, tool_call: 'Message.ToolCall', raw: bool) -> Any:
+        try:
+            tool_name, tool_url, params = self._prepare_tool_call(tool_call)
+        except ArgumentError as e:
+            return self._rejected_call(e)
+        result = self._cached_result(tool_name, params)
+        if result is not MISS:
+            return result
+        if self.coalescer is None:
+            return await self._call_uncached(tool_name, tool_url, params, raw)
+
+        result, shared = await self.coalescer.acall(tool_name, params,
+                                                    lambda: self._call_uncached(tool_name, tool_url, params, raw))
+        self._record_coalesced(tool_name, shared)
+        return result
+
+    async def _call_uncached(self, tool_name: str, tool_url: str, params: Dict[str, Any], raw: bool = False) -> Any:
+        info, start = DispatchInfo(), time.perf_counter()
+        result = await self._resilient_dispatch(tool_name, tool_url, params, info, raw)
+        self._record_tool_call(tool_name, start, info)
+        self._store_result(tool_name, params, result)
+        return result
+
+    async def _resilient_dispatch(self, tool_name: str, tool_url: str, params: Dict[str, Any],
+                                  info: DispatchInfo, raw: bool = False) -> Any:
+        budget = self._call_budget(tool_name)
+        if budget is None:
+            return await self._dispatch(tool_url, params, info, raw=raw)
+
+        while True:
+            rejected = budget.start(info)
+            if rejected is not None:
+                return rejected
+            result = await self._dispatch(tool_url, params, info, budget.timeout(), raw)
+            delay = budget.finish(info)
+            if delay is None:
+                return result
+            logging.info(f"Retrying {tool_name} in {delay:.2f}s after {info.error}")
+            await asyncio.sleep(delay)
+
+    async def _dispatch(self, tool_url: str, params: Dict[str, Any], info: Optional[DispatchInfo] = None,
+                        timeout: Optional[float] = None, raw: bool = False) -> Any:
+        if self.pool is None:
+            return await async_dispatch_tool_call(tool_url, params, self.client, info=info, timeout=timeout, raw=raw)
+
+        # Route to the least busy healthy instance, fail over if the request could not be delivered
+        self._ensure_health_checks()
+        tried: List[MCPOEndpoint] = []
+        while True:
+            endpoint = self.pool.acquire(exclude=tried)
+            try:
+                result = await async_dispatch_tool_call(self._endpoint_url(tool_url, endpoint), params, self.client,
+                                                        raise_connect_errors=True, info=info, timeout=timeout,
+                                                        raw=raw)
+                self.pool.mark_healthy(endpoint)
+                return result
+            except CONNECT_ERRORS as e:
+                self.pool.mark_failed(endpoint)
+                tried.append(endpoint)
+                if len(tried) >= len(self.pool):
+                    if info is not None:
+                        info.record(error=e)
+                    return {"error": str(e)}
+            finally:
+                self.pool.release(endpoint)
+
+    async def call_tool_stream(self, tool_call: 'Message.ToolCall', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                               max_bytes: Optional[int] = None) -> AsyncToolResultStream:
+        """ Call a tool and stream its result instead of decoding it as a whole.
+
+            Iterate the returned stream with `async for` for raw chunks, use `aiter_json()` to parse the items
+            of a top level array incrementally or `aiter_text()` to unquote a top level string piece by piece.
+            Reading stops after `max_bytes`, see `stream.truncated`. With several MCPO instances the call
+            fails over like `call_tool` if an instance can not be reached.
+
+            Streamed calls bypass the result cache, coalescing, the resilience policy and metrics. The
+            arguments are validated and the timeouts of the HTTP client apply to every read.
+
+            :raises httpx.HTTPError: if the tool call failed
+        """
+        _, tool_url, params = self._prepare_tool_call(tool_call)
+        if self.pool is None:
+            return await async_stream_tool_call(tool_url, params, self.client, chunk_size, max_bytes)
+
+        # Route like _dispatch, the instance counts as busy until the stream is closed
+        self._ensure_health_checks()
+        tried: List[MCPOEndpoint] = []
+        while True:
+            endpoint = self.pool.acquire(exclude=tried)
+            try:
+                stream = await async_stream_tool_call(self._endpoint_url(tool_url, endpoint), params, self.client,
+                                                      chunk_size, max_bytes,
+                                                      on_close=functools.partial(self.pool.release, endpoint))
+            except CONNECT_ERRORS:
+                self.pool.mark_failed(endpoint)
+                self.pool.release(endpoint)
+                tried.append(endpoint)
+                if len(tried) >= len(self.pool):
+                    raise
+                continue
+            except BaseException:
+                self.pool.release(endpoint)
+                raise
+            self.pool.mark_healthy(endpoint)
+            return stream
+
+    async def call_tools_from_response(self, tool_calls: Sequence['Message.ToolCall'], parallel: bool = False,
+                                       max_workers: int = 8, max_per_server: Union[int, Dict[str, int], None] = None,
+                                       sequential_tools: Optional[Collection[str]] = None) -> List[Any]:
+        """ Execute the tool calls of a model response and return their results in the original order.
+
+            :param parallel: run independent calls concurrently, at most `max_workers` at a time
+            :param max_per_server: maximum calls in flight per MCP server, a number for every server
+                                   or a mapping of server name to limit
+            :param sequential_tools: tool or server names whose calls must keep the response order,
+                                     each of them waits for the previous one
+        """
+        if not parallel:
+            return [await self.call_tool(call) for call in tool_calls]
+
+        scheduler = self._create_scheduler(tool_calls, max_workers, max_per_server, sequential_tools)
+        tasks: List[Optional[asyncio.Task]] = [None] * len(tool_calls)
+        running: Dict[asyncio.Task, int] = {}
+
+        try:
+            while not scheduler.finished:
+                for index in scheduler.take_ready():
+                    tasks[index] = asyncio.ensure_future(self.call_tool(tool_calls[index]))
+                    running[tasks[index]] = index
+
+                completed, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in completed:
+                    scheduler.finish(running.pop(task))
+        finally:
+            for task in running:
+                task.cancel()
+
+        return [task.result() for task in tasks]
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# (tool name, tool url, Ollama tool definition)
+ToolEntry = Tuple[str, str, Dict[str, Any]]
+
+
+def spec_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def options_hash(options: Dict[str, Any]) -> str:
+    """ Hash of the options the tools were parsed with """
+    return spec_hash(json.dumps(options, sort_keys=True, separators=(",", ":")).encode())
+
+
+class CatalogEntry:
+    """ Parsed tools of one MCP server together with the validators of the spec they were parsed from
+        and the `options_hash` of the parse options, eg. the schema compaction settings.
+    """
+
+    def __init__(self, tools: List[ToolEntry], spec_hash: str, etag: Optional[str] = None,
+                 fetched_at: Optional[float] = None, options: Optional[str] = None) -> None:
+        self.tools = tools
+        self.spec_hash = spec_hash
+        self.etag = etag
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.options = options
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"tools": [list(tool) for tool in self.tools], "spec_hash": self.spec_hash, "etag": self.etag,
+                "fetched_at": self.fetched_at, "options": self.options}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CatalogEntry':
+        return cls([tuple(tool) for tool in data["tools"]], data["spec_hash"], data.get("etag"), data["fetched_at"],
+                   data.get("options"))
+
+
+class ToolCatalogCache:
+    """ Two tier (memory and optional disk) cache of parsed MCP server tools keyed by host, port and server name.
+
+        Entries younger than `ttl` seconds are used without contacting MCPO. Older entries are revalidated
+        with the spec ETag (If-None-Match) or, as MCPO does not send one, the sha256 hash of the spec so
+        an unchanged spec is never parsed again. Entries parsed with other options are not used.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, ttl: float = 300.0) -> None:
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir is not None else None
+        self.ttl = ttl
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._lock = threading.Lock()
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(host: str, port: Union[int, str], server: str) -> str:
+        return f"{host}:{port}/{server}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir.joinpath(f"{hashlib.sha1(key.encode()).hexdigest()}.json")
+
+    def get(self, host: str, port: Union[int, str], server: str) -> Optional[CatalogEntry]:
+        key = self.key(host, port, server)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None or self.cache_dir is None:
+            return entry
+
+        try:
+            entry = CatalogEntry.from_dict(json.loads(self._path(key).read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            logging.warning(f"Ignoring unreadable tool catalog cache entry for {key}: {e}")
+            return None
+
+        with self._lock:
+            return self._entries.setdefault(key, entry)
+
+    def put(self, host: str, port: Union[int, str], server: str, entry: CatalogEntry) -> None:
+        key = self.key(host, port, server)
+        with self._lock:
+            self._entries[key] = entry
+        self._write(key, entry)
+
+    def touch(self, host: str, port: Union[int, str], server: str, entry: CatalogEntry) -> None:
+        """ Mark a successfully revalidated entry as fresh again """
+        entry.fetched_at = time.time()
+        self.put(host, port, server, entry)
+
+    def is_fresh(self, entry: CatalogEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def invalidate(self, host: Optional[str] = None, port: Union[int, str, None] = None,
+                   server: Optional[str] = None) -> None:
+        """ Drop the entry of one server, of every server of one MCPO instance or, without arguments, all entries """
+        if server is not None:
+            prefix = self.key(host, port, server)
+        elif host is not None:
+            prefix = f"{host}:{port}/"
+        else:
+            prefix = ""
+
+        def matches(key: str) -> bool:
+            return key == prefix if server is not None else key.startswith(prefix)
+
+        with self._lock:
+            for key in [key for key in self._entries if matches(key)]:
+                self._entries.pop(key)
+
+        if self.cache_dir is None:
+            return
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                if matches(json.loads(path.read_text(encoding="utf-8")).get("key", "")):
+                    path.unlink(missing_ok=True)
+            except (ValueError, OSError):
+                path.unlink(missing_ok=True)
+
+    def _write(self, key: str, entry: CatalogEntry) -> None:
+        if self.cache_dir is None:
+            return
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps({"key": key, **entry.to_dict()}), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Could not write tool catalog cache entry for {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,190 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from ollama import Client, Message
+
+from .adapter import OllamaMCPOAdapter
+from .passthrough import RawToolResult
+
+DONE = "done"
+MAX_ROUNDS = "max_rounds"
+TOKEN_BUDGET = "token_budget"
+BYTE_BUDGET = "byte_budget"
+
+
+class RoundStats:
+    """ Timing and size of one chat round and its tool calls.
+
+        `tool_seconds` is the time spent waiting for tool results after the response stream ended,
+        tool execution that overlapped with the generation is part of `chat_seconds`.
+    """
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.chat_seconds = 0.0
+        self.first_tool_call_seconds: Optional[float] = None
+        self.tool_seconds = 0.0
+        self.total_seconds = 0.0
+        self.tool_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.result_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    def __repr__(self) -> str:
+        return (f"RoundStats({self.index}, total={self.total_seconds:.3f}s, chat={self.chat_seconds:.3f}s, "
+                f"tool_calls={self.tool_calls})")
+
+
+class ChatLoopResult:
+    """ Outcome of `OllamaToolLoop.run`: the full message history, per round stats and why the loop stopped """
+
+    def __init__(self, messages: List[Dict[str, Any]], rounds: List[RoundStats], stop_reason: str) -> None:
+        self.messages = messages
+        self.rounds = rounds
+        self.stop_reason = stop_reason
+
+    @property
+    def content(self) -> str:
+        """ Content of the last assistant message """
+        for message in reversed(self.messages):
+            if message.get("role") == "assistant":
+                return message.get("content") or ""
+        return ""
+
+    @property
+    def tokens(self) -> int:
+        return sum(r.prompt_tokens + r.completion_tokens for r in self.rounds)
+
+    @property
+    def result_bytes(self) -> int:
+        return sum(r.result_bytes for r in self.rounds)
+
+
+class OllamaToolLoop:
+    """ Drives the chat -> tool calls -> tool results -> chat loop against Ollama.
+
+        Responses are streamed and every tool call is dispatched as soon as it appears in the stream, so
+        tool execution overlaps with the rest of the generation. Results are appended undecoded as `tool`
+        messages and the loop continues until the model answers without tool calls or a limit is hit.
+    """
+
+    def __init__(self, adapter: OllamaMCPOAdapter, model: str, client: Optional[Client] = None,
+                 tools: Optional[Sequence[Mapping[str, Any]]] = None, max_rounds: int = 8,
+                 max_tokens: Optional[int] = None, max_bytes: Optional[int] = None,
+                 max_result_bytes: Optional[int] = None, parallel: bool = True, max_workers: int = 8,
+                 select_k: Optional[int] = None, **chat_kwargs) -> None:
+        """
+        :param adapter: adapter executing the tool calls
+        :param model: Ollama model name
+        :param client: Ollama client, a default client is created if omitted
+        :param tools: tool definitions sent to the model, default: every tool of the adapter
+        :param max_rounds: maximum number of chat requests
+        :param max_tokens: stop once prompt and completion tokens of all rounds exceed this budget
+        :param max_bytes: stop once the tool results of all rounds exceed this many bytes
+        :param max_result_bytes: truncate every single tool result to this many bytes
+        :param parallel: run the tool calls of one response concurrently, otherwise one after another
+        :param max_workers: maximum concurrent tool calls
+        :param select_k: without `tools`, only send the `select_k` tools most relevant for the last user message
+        :param chat_kwargs: passed on to `Client.chat`, eg. options or keep_alive
+        """
+        self.adapter = adapter
+        self.model = model
+        self.client = client or Client()
+        self.tools = tools
+        self.max_rounds = max_rounds
+        self.max_tokens = max_tokens
+        self.max_bytes = max_bytes
+        self.max_result_bytes = max_result_bytes
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.select_k = select_k
+        self.chat_kwargs = chat_kwargs
+
+    def run(self, messages: Sequence[Union[Mapping[str, Any], Message]]) -> ChatLoopResult:
+        """ Run the loop on a copy of `messages` """
+        history: List[Dict[str, Any]] = [self._to_dict(message) for message in messages]
+        tools = self.tools if self.tools is not None else self._default_tools(history)
+        rounds: List[RoundStats] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers if self.parallel else 1) as executor:
+            for index in range(self.max_rounds):
+                stats = RoundStats(index)
+                rounds.append(stats)
+                tool_calls = self._chat_round(history, tools, executor, stats)
+
+                if not tool_calls:
+                    return ChatLoopResult(history, rounds, DONE)
+
+                stop_reason = self._budget_exceeded(rounds)
+                if stop_reason:
+                    logging.info(f"Tool loop stopped after round {index}: {stop_reason}")
+                    return ChatLoopResult(history, rounds, stop_reason)
+
+        return ChatLoopResult(history, rounds, MAX_ROUNDS)
+
+    def _default_tools(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        tools = self.adapter.ollama_tools or self.adapter.list_tools_ollama()
+        if self.select_k is None:
+            return tools
+        query = next((m.get("content") or "" for m in reversed(history) if m.get("role") == "user"), "")
+        return self.adapter.select_tools(query, self.select_k)
+
+    def _chat_round(self, history: List[Dict[str, Any]], tools: Sequence[Mapping[str, Any]],
+                    executor: ThreadPoolExecutor, stats: RoundStats) -> List[Message.ToolCall]:
+        """ Stream one response, dispatching tool calls while it is generated, and append the messages """
+        start = time.perf_counter()
+        content, tool_calls, futures = [], [], []  # type: List[str], List[Message.ToolCall], list
+
+        for chunk in self.client.chat(self.model, messages=history, tools=tools, stream=True, **self.chat_kwargs):
+            if chunk.message.content:
+                content.append(chunk.message.content)
+            for tool_call in chunk.message.tool_calls or []:
+                if stats.first_tool_call_seconds is None:
+                    stats.first_tool_call_seconds = time.perf_counter() - start
+                tool_calls.append(tool_call)
+                futures.append(executor.submit(self.adapter.call_tool_raw, tool_call))
+            if chunk.done:
+                stats.prompt_tokens = chunk.prompt_eval_count or 0
+                stats.completion_tokens = chunk.eval_count or 0
+
+        stats.chat_seconds = time.perf_counter() - start
+        assistant: Dict[str, Any] = {"role": "assistant", "content": "".join(content)}
+        if tool_calls:
+            assistant["tool_calls"] = [self._to_dict(tool_call) for tool_call in tool_calls]
+        history.append(assistant)
+
+        # Results keep the order of the tool calls
+        for tool_call, future in zip(tool_calls, futures):
+            try:
+                raw = future.result()
+            except Exception as e:
+                # Unknown tool or malformed arguments, report it to the model instead of ending the loop
+                logging.warning(f"Tool call {tool_call.function.name} failed: {e}")
+                raw = RawToolResult.from_error(str(e))
+            result = raw.text(self.max_result_bytes)
+            stats.result_bytes += len(result.encode())
+            history.append({"role": "tool", "content": result, "tool_name": tool_call.function.name})
+
+        stats.tool_calls = len(tool_calls)
+        stats.total_seconds = time.perf_counter() - start
+        stats.tool_seconds = stats.total_seconds - stats.chat_seconds
+        return tool_calls
+
+    def _budget_exceeded(self, rounds: List[RoundStats]) -> Optional[str]:
+        tokens = sum(r.prompt_tokens + r.completion_tokens for r in rounds)
+        if self.max_tokens is not None and tokens >= self.max_tokens:
+            return TOKEN_BUDGET
+        if self.max_bytes is not None and sum(r.result_bytes for r in rounds) >= self.max_bytes:
+            return BYTE_BUDGET
+        return None
+
+    @staticmethod
+    def _to_dict(message: Union[Mapping[str, Any], Message, Message.ToolCall]) -> Dict[str, Any]:
+        if hasattr(message, "model_dump"):
+            return message.model_dump(exclude_none=True)
+        return dict(message)
@@ -0,0 +1,237 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import httpx
+
+from .config_parser import parse_to_config
+from .pool import EndpointPool
+from .service import MCPOService, PROCESS
+
+STARTING = "starting"
+READY = "ready"
+CRASHED = "crashed"
+STOPPED = "stopped"
+
+
+class MCPOWorker:
+    """ One MCPO instance of a cluster and its supervision state """
+
+    def __init__(self, index: int, host: str, port: int) -> None:
+        self.index = index
+        self.host = host
+        self.port = port
+        self.service: Optional[MCPOService] = None
+        self.state = STOPPED
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.started_at = 0.0
+        self.ready_at = 0.0
+        self.next_start = 0.0
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def alive(self) -> bool:
+        return self.service is not None and self.service.is_running()
+
+    @property
+    def time_to_ready(self) -> Optional[float]:
+        return self.ready_at - self.started_at if self.state == READY else None
+
+    def __repr__(self) -> str:
+        return f"MCPOWorker({self.endpoint}, state={self.state}, restarts={self.restarts})"
+
+
+class MCPOCluster:
+    """ Launches `workers` MCPO instances serving the same config on the ports `port` .. `port + workers - 1`.
+
+        A supervisor thread probes the workers until they answer, restarts crashed workers with exponential
+        backoff and keeps `pool` pointed at the ready workers. Hand the pool to any number of adapters to
+        load balance tool calls over the cluster.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5090, workers: int = 2, config: Optional[Dict] = None,
+                 config_path: Optional[Union[str, Path]] = None, timeout: float = 30.0, backoff: float = 1.0,
+                 max_backoff: float = 30.0, check_interval: float = 0.5, launch_mode: str = PROCESS,
+                 **pool_kwargs) -> None:
+        """
+        :param host: host all workers bind to
+        :param port: port of the first worker, the others use the following ports
+        :param workers: number of MCPO instances
+        :param config: MCP config dictionary
+        :param config_path: path to a MCP config file, alternative to `config`
+        :param timeout: seconds `start` waits for the workers to become ready
+        :param backoff: delay before the first restart of a crashed worker, doubled on every further crash
+        :param max_backoff: upper bound of the restart delay
+        :param check_interval: seconds between supervisor checks
+        :param launch_mode: how the workers launch mcpo, see MCPOService
+        :param pool_kwargs: passed on to the EndpointPool, eg. strategy or eject_seconds
+        """
+        if workers < 1:
+            raise ValueError("A cluster needs at least one worker")
+
+        self.host = host
+        self.config = parse_to_config(config, config_path)
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.check_interval = check_interval
+        self.launch_mode = launch_mode
+
+        self.workers = [MCPOWorker(i, host, port + i) for i in range(workers)]
+        self.pool = EndpointPool([worker.endpoint for worker in self.workers], **pool_kwargs)
+
+        self._lock = threading.Lock()
+        self._ready_changed = threading.Condition(self._lock)
+        self._stop_event = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+        self._client = httpx.Client(timeout=httpx.Timeout(2.0, connect=1.0))
+
+    @property
+    def endpoints(self) -> List[str]:
+        """ "host:port" of the workers that are ready to serve tool calls """
+        with self._lock:
+            return [worker.endpoint for worker in self.workers if worker.state == READY]
+
+    def adapter(self, **kwargs):
+        """ Create an OllamaMCPOAdapter balancing its calls over this cluster """
+        from .adapter import OllamaMCPOAdapter
+        return OllamaMCPOAdapter(config=self.config, endpoints=self.pool, **kwargs)
+
+    def async_adapter(self, **kwargs):
+        """ Create an AsyncOllamaMCPOAdapter balancing its calls over this cluster """
+        from .async_adapter import AsyncOllamaMCPOAdapter
+        return AsyncOllamaMCPOAdapter(config=self.config, endpoints=self.pool, **kwargs)
+
+    def start(self, wait: bool = True) -> None:
+        self._stop_event.clear()
+        for worker in self.workers:
+            self._start_worker(worker)
+
+        self._supervisor = threading.Thread(target=self._supervise, name="MCPOClusterSupervisor", daemon=True)
+        self._supervisor.start()
+
+        if wait:
+            self.wait_until_ready()
+
+    def wait_until_ready(self, min_workers: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """ Block until `min_workers` (default: all) workers are ready, returns False on timeout """
+        min_workers = len(self.workers) if min_workers is None else min_workers
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        with self._ready_changed:
+            while sum(worker.state == READY for worker in self.workers) < min_workers:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.info(f"Waiting for {min_workers} MCPO workers to be ready timed out.")
+                    return False
+                self._ready_changed.wait(remaining)
+        return True
+
+    def _start_worker(self, worker: MCPOWorker) -> None:
+        logging.info(f"Starting MCPO worker {worker.index} at {worker.endpoint}")
+        worker.service = MCPOService(worker.host, worker.port, config=self.config, timeout=self.timeout,
+                                     launch_mode=self.launch_mode)
+        worker.service.start(wait=False)
+        worker.started_at = time.monotonic()
+        worker.state = STARTING
+
+    def _stop_worker(self, worker: MCPOWorker) -> None:
+        if worker.service is None:
+            return
+        try:
+            worker.service.stop()
+            worker.service.cleanup()
+        except Exception as e:
+            logging.error(f"Error stopping MCPO worker {worker.index}: {e}")
+        worker.service = None
+
+    def _probe(self, worker: MCPOWorker) -> bool:
+        try:
+            return self._client.get(f"http://{worker.endpoint}{self.pool.health_path}").status_code < 400
+        except httpx.HTTPError:
+            return False
+
+    def _set_state(self, worker: MCPOWorker, state: str) -> None:
+        with self._ready_changed:
+            was_ready, worker.state = worker.state == READY, state
+            if was_ready == (state == READY):
+                return
+
+            ready = [w.endpoint for w in self.workers if w.state == READY]
+            # An empty pool is not allowed, adapters keep failing over between the ejected endpoints meanwhile
+            if ready:
+                self.pool.set_endpoints(ready)
+            self._ready_changed.notify_all()
+
+    def check_workers(self) -> None:
+        """ One supervisor pass: detect ready and crashed workers and restart due ones """
+        now = time.monotonic()
+        for worker in self.workers:
+            if self._stop_event.is_set():
+                return
+
+            if worker.state in (STARTING, READY) and not worker.alive:
+                self._schedule_restart(worker, now, "exited")
+            elif worker.state == STARTING and self._probe(worker):
+                worker.ready_at = time.monotonic()
+                worker.consecutive_failures = 0
+                logging.info(f"MCPO worker {worker.index} ready after {worker.time_to_ready or 0.0:.2f}s")
+                self._set_state(worker, READY)
+            elif worker.state == CRASHED and now >= worker.next_start:
+                worker.restarts += 1
+                try:
+                    self._start_worker(worker)
+                except Exception as e:
+                    self._schedule_restart(worker, now, f"failed to start ({e})")
+
+    def _schedule_restart(self, worker: MCPOWorker, now: float, reason: str) -> None:
+        """ Mark a worker crashed and restart it after a backoff that doubles with every consecutive failure """
+        worker.consecutive_failures += 1
+        delay = min(self.backoff * 2 ** (worker.consecutive_failures - 1), self.max_backoff)
+        logging.warning(f"MCPO worker {worker.index} at {worker.endpoint} {reason}, restarting in {delay:.1f}s")
+        worker.next_start = now + delay
+        self._stop_worker(worker)
+        self._set_state(worker, CRASHED)
+
+    def _supervise(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.check_workers()
+            except Exception as e:
+                logging.error(f"MCPO cluster supervisor error: {e}")
+            self._stop_event.wait(self.check_interval)
+
+    def stats(self) -> List[Dict]:
+        return [{"endpoint": worker.endpoint, "state": worker.state, "restarts": worker.restarts,
+                 "time_to_ready": worker.time_to_ready} for worker in self.workers]
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+            self._supervisor = None
+
+        # Signal every worker first so they shut down concurrently
+        for worker in self.workers:
+            if worker.service is not None:
+                worker.service.abort_event.set()
+        for worker in self.workers:
+            self._stop_worker(worker)
+            self._set_state(worker, STOPPED)
+
+    def close(self) -> None:
+        self.stop()
+        self._client.close()
+
+    def __enter__(self) -> 'MCPOCluster':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
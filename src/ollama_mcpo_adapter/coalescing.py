@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional, Tuple
+
+from .result_cache import DEFAULT_DENY, canonical_arguments, is_idempotent_tool
+
+CallKey = Tuple[str, str]
+
+
+class SingleFlight:
+    """ Coalesces identical concurrent calls of idempotent tools into one in-flight request.
+
+        The first caller of a tool with given arguments dispatches the request, callers arriving while it
+        is in flight wait for it and receive the same result object, which must be treated as read-only.
+        Unlike the result cache nothing is kept once the request finished. Only the tools listed in
+        `idempotent_tools` are coalesced, patterns matching `side_effect_tools` are excluded unless the
+        tool is named explicitly. Sync and asyncio callers are coalesced separately.
+    """
+
+    def __init__(self, idempotent_tools: Optional[Collection[str]] = None,
+                 side_effect_tools: Optional[Collection[str]] = DEFAULT_DENY) -> None:
+        """
+        :param idempotent_tools: tool names or patterns that may be coalesced, default: none
+        :param side_effect_tools: tool patterns excluded from `idempotent_tools` patterns
+        """
+        self.idempotent_tools = idempotent_tools
+        self.side_effect_tools = side_effect_tools or ()
+
+        self.calls = 0
+        self.coalesced = 0
+
+        self._idempotent: Dict[str, bool] = {}
+        self._in_flight: Dict[CallKey, Future] = {}
+        self._async_in_flight: Dict[Tuple[asyncio.AbstractEventLoop, CallKey], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def is_idempotent(self, tool_name: str) -> bool:
+        idempotent = self._idempotent.get(tool_name)
+        if idempotent is None:
+            idempotent = is_idempotent_tool(tool_name, self.idempotent_tools, self.side_effect_tools)
+            self._idempotent[tool_name] = idempotent
+        return idempotent
+
+    def call(self, tool_name: str, params: Any, dispatch: Callable[[], Any]) -> Tuple[Any, bool]:
+        """ Result of `dispatch()` or of the identical call already in flight, and whether it was shared """
+        if not self.is_idempotent(tool_name):
+            return dispatch(), False
+
+        key = (tool_name, canonical_arguments(params))
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = dispatch()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    async def acall(self, tool_name: str, params: Any, dispatch: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """ asyncio variant of `call` """
+        if not self.is_idempotent(tool_name):
+            return await dispatch(), False
+
+        key = (asyncio.get_running_loop(), (tool_name, canonical_arguments(params)))
+        with self._lock:
+            self.calls += 1
+            future = self._async_in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._async_in_flight[key] = asyncio.get_running_loop().create_future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # Shielded, a cancelled waiter must not cancel the request of the others
+            return await asyncio.shield(future), True
+
+        try:
+            result = await dispatch()
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved, no "never retrieved" warning without waiters
+            raise
+        finally:
+            with self._lock:
+                del self._async_in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """ Coalescible calls, calls answered by another in-flight request and their share """
+        with self._lock:
+            in_flight = len(self._in_flight) + len(self._async_in_flight)
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": in_flight,
+                    "coalesce_rate": self.coalesced / self.calls if self.calls else 0.0}
@@ -0,0 +1,202 @@
+import copy
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+EXAMPLE_KEYWORDS = ("examples", "example")
+# Keywords that hold sub-schemas, other keys (enum, const, required ...) hold plain values
+SCHEMA_KEYWORDS = ("items", "additionalProperties", "not", "contains", "propertyNames")
+SCHEMA_LIST_KEYWORDS = ("anyOf", "oneOf", "allOf", "prefixItems")
+BYTES_PER_TOKEN = 4
+
+
+def json_size(value: Any) -> int:
+    """ Size in bytes of the compact JSON the value is sent as """
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def estimate_tokens(size: int) -> int:
+    """ Rough token estimate of JSON, about 4 bytes per token for English text """
+    return (size + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def truncate_description(text: str, max_length: int) -> str:
+    """ Shorten a description to its leading sentences, or words, within `max_length` characters """
+    text = " ".join(text.split())
+    if len(text) <= max_length:
+        return text
+
+    cut = text[:max_length]
+    sentence_end = cut.rfind(". ")
+    if sentence_end >= max_length // 2:
+        return cut[:sentence_end + 1]
+    return cut[:max_length - 1].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+
+
+class ToolSizeReport:
+    """ Size of one tool definition before and after compaction """
+
+    def __init__(self, name: str, bytes_before: int, bytes_after: int) -> None:
+        self.name = name
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+
+    @property
+    def tokens_before(self) -> int:
+        return estimate_tokens(self.bytes_before)
+
+    @property
+    def tokens_after(self) -> int:
+        return estimate_tokens(self.bytes_after)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "bytes_before": self.bytes_before, "bytes_after": self.bytes_after,
+                "tokens_before": self.tokens_before, "tokens_after": self.tokens_after}
+
+    def __repr__(self) -> str:
+        return f"ToolSizeReport({self.name}, {self.bytes_before} -> {self.bytes_after} bytes)"
+
+
+class SchemaCompactor:
+    """ Shrinks Ollama tool definitions to reduce the prefill cost of every request.
+
+        - long descriptions are cut to their leading sentences
+        - `default` and `examples` are dropped
+        - schemas nested deeper than `max_depth` are reduced to their type
+        - sub-schemas repeated within one tool are moved to `$defs` and referenced, if that saves bytes.
+          Direct parameters are never replaced by references, so every parameter keeps its type.
+
+        The before/after size of every compacted tool is kept in `reports`.
+    """
+
+    def __init__(self, max_description: Optional[int] = 160, max_tool_description: Optional[int] = 400,
+                 drop_defaults: bool = True, drop_examples: bool = True, max_depth: Optional[int] = 4,
+                 dedupe: bool = True, dedupe_min_bytes: int = 64) -> None:
+        """
+        :param max_description: maximum characters of parameter descriptions, None to keep them
+        :param max_tool_description: maximum characters of the tool description, None to keep it
+        :param drop_defaults: drop `default` values
+        :param drop_examples: drop `examples` and `example`
+        :param max_depth: nesting depth below the parameters object after which schemas are reduced to their type
+        :param dedupe: move repeated sub-schemas to `$defs`
+        :param dedupe_min_bytes: only sub-schemas at least this large are moved
+        """
+        self.max_description = max_description
+        self.max_tool_description = max_tool_description
+        self.drop_defaults = drop_defaults
+        self.drop_examples = drop_examples
+        self.max_depth = max_depth
+        self.dedupe = dedupe
+        self.dedupe_min_bytes = dedupe_min_bytes
+        self.reports: Dict[str, ToolSizeReport] = {}
+
+    def compact_tool(self, tool: Dict[str, Any]) -> Dict[str, Any]:
+        """ Return a compacted copy of an Ollama tool definition """
+        compacted = copy.deepcopy(tool)
+        function = compacted.get("function", {})
+
+        description = function.get("description")
+        if isinstance(description, str) and self.max_tool_description is not None:
+            function["description"] = truncate_description(description, self.max_tool_description)
+
+        parameters = function.get("parameters")
+        if isinstance(parameters, dict):
+            parameters = self._compact(parameters, 0)
+            if self.dedupe:
+                parameters = self._dedupe(parameters)
+            function["parameters"] = parameters
+
+        name = function.get("name", "")
+        self.reports[name] = ToolSizeReport(name, json_size(tool), json_size(compacted))
+        return compacted
+
+    def settings(self) -> Dict[str, Any]:
+        """ Options the compacted tools depend on """
+        return {"max_description": self.max_description, "max_tool_description": self.max_tool_description,
+                "drop_defaults": self.drop_defaults, "drop_examples": self.drop_examples,
+                "max_depth": self.max_depth, "dedupe": self.dedupe, "dedupe_min_bytes": self.dedupe_min_bytes}
+
+    def compact_tools(self, tools: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.compact_tool(tool) for tool in tools]
+
+    def report(self) -> Dict[str, Any]:
+        """ Per tool and total sizes of all compacted tools """
+        tools = [report.to_dict() for report in self.reports.values()]
+        before = sum(report.bytes_before for report in self.reports.values())
+        after = sum(report.bytes_after for report in self.reports.values())
+        return {"tools": tools, "bytes_before": before, "bytes_after": after,
+                "tokens_before": estimate_tokens(before), "tokens_after": estimate_tokens(after)}
+
+    def _compact(self, schema: Any, depth: int) -> Any:
+        if not isinstance(schema, dict):
+            return schema
+        if self.max_depth is not None and depth > self.max_depth:
+            return {key: schema[key] for key in ("type",) if key in schema}
+
+        compacted = {}
+        for key, value in schema.items():
+            if key == "default" and self.drop_defaults:
+                continue
+            if key in EXAMPLE_KEYWORDS and self.drop_examples:
+                continue
+
+            if key == "description" and isinstance(value, str) and self.max_description is not None:
+                value = truncate_description(value, self.max_description)
+            elif key == "properties" and isinstance(value, dict):
+                value = {name: self._compact(prop, depth + 1) for name, prop in value.items()}
+            elif key in SCHEMA_KEYWORDS:
+                value = self._compact(value, depth + 1)
+            elif key in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+                value = [self._compact(member, depth + 1) for member in value]
+            compacted[key] = value
+        return compacted
+
+    def _sub_schemas(self, schema: Any, top_level: bool = False):
+        """ Yield every nested schema, not counting the parameters object and its direct properties """
+        if not isinstance(schema, dict):
+            return
+        for key, value in schema.items():
+            if key == "properties" and isinstance(value, dict):
+                for prop in value.values():
+                    if not top_level and isinstance(prop, dict):
+                        yield prop
+                    yield from self._sub_schemas(prop)
+            elif key in SCHEMA_KEYWORDS and isinstance(value, dict):
+                yield value
+                yield from self._sub_schemas(value)
+            elif key in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+                for member in value:
+                    if isinstance(member, dict):
+                        yield member
+                        yield from self._sub_schemas(member)
+
+    def _dedupe(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        counts = Counter(json.dumps(schema, sort_keys=True) for schema in self._sub_schemas(parameters, True))
+        repeated = {key: f"s{i}" for i, (key, count) in enumerate(counts.most_common())
+                    if count > 1 and len(key) >= self.dedupe_min_bytes}
+        if not repeated:
+            return parameters
+
+        def replace(schema: Any, top_level: bool = False) -> Any:
+            if not isinstance(schema, dict):
+                return schema
+            key = json.dumps(schema, sort_keys=True)
+            if not top_level and key in repeated:
+                return {"$ref": f"#/$defs/{repeated[key]}"}
+
+            replaced = {}
+            for keyword, value in schema.items():
+                if keyword == "properties" and isinstance(value, dict):
+                    # Direct parameters stay inline, their children may be references
+                    value = {name: replace(prop, top_level=schema is parameters) for name, prop in value.items()}
+                elif keyword in SCHEMA_KEYWORDS:
+                    value = replace(value)
+                elif keyword in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+                    value = [replace(member) for member in value]
+                replaced[keyword] = value
+            return replaced
+
+        definitions = {name: replace(json.loads(key), top_level=True) for key, name in repeated.items()}
+        deduped = replace(parameters, top_level=True)
+        deduped["$defs"] = {**parameters.get("$defs", {}), **definitions}
+        return deduped if json_size(deduped) < json_size(parameters) else parameters
@@ -4,7 +4,12 @@ import sys
 from pathlib import Path
 from typing import Dict, Union, List, Optional
 
-WIN_NPX_PATH: str = os.getenv("WIN_NODEJS_NPX_PATH", "npx")
+# Environment variable with the npx path to use on Windows, read on use so a later loaded .env applies
+WIN_NPX_PATH_VARIABLE = "WIN_NODEJS_NPX_PATH"
+
+
+def win_npx_path() -> str:
+    return os.getenv(WIN_NPX_PATH_VARIABLE, "npx")
 
 
 def adapt_config(config: Dict[str, Union[str, List[str], Dict[str, Union[str, List[str]]]]]) -> Dict[
@@ -13,7 +18,7 @@ def adapt_config(config: Dict[str, Union[str, List[str], Dict[str, Union[str, Li
         server_config = config["mcpServers"][server]
 
         if server_config["command"] == "npx" and sys.platform.lower().startswith('win'):
-            server_config["command"] = WIN_NPX_PATH
+            server_config["command"] = win_npx_path()
     return config
 
 
@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+
+import httpx
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+
+from .adapter import OllamaMCPOAdapter
+from .catalog_cache import ToolEntry
+from .dispatcher import DispatchInfo
+from .schema import SchemaNormalizer
+from .streaming import ToolResultStream, DEFAULT_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from ollama import Message
+
+# Pseudo base url of the tools of a DirectMCPAdapter, tool urls are "{DIRECT_BASE_URL}/{server}/{MCP tool name}"
+DIRECT_BASE_URL = "mcp://direct"
+# Error class recorded for results the MCP server marked as error
+TOOL_ERROR = "ToolError"
+
+
+def tool_result(result: types.CallToolResult) -> Any:
+    """ Convert a MCP tool result the way MCPO does: text is decoded as JSON if possible,
+        images become data urls and a single content is unwrapped from the list
+    """
+    contents = []
+    for content in result.content:
+        if isinstance(content, types.TextContent):
+            try:
+                contents.append(json.loads(content.text))
+            except json.JSONDecodeError:
+                contents.append(content.text)
+        elif isinstance(content, types.ImageContent):
+            contents.append(f"data:{content.mimeType};base64,{content.data}")
+        elif isinstance(content, types.EmbeddedResource):
+            contents.append("Embedded resource not supported yet.")
+    return contents[0] if len(contents) == 1 else contents
+
+
+def _result_bytes(result: types.CallToolResult) -> int:
+    return sum(len(content.text) for content in result.content if isinstance(content, types.TextContent))
+
+
+class MCPSessionManager:
+    """ Persistent MCP client sessions to the stdio servers of a MCP config.
+
+        The sessions live on a private event loop thread, so they can be used from any thread. A session
+        is started on first use and restarted on the next call after its server process died.
+    """
+
+    def __init__(self, config: Dict[str, Any], startup_timeout: float = 30.0) -> None:
+        self.servers: Dict[str, Dict[str, Any]] = config.get("mcpServers", {})
+        self.startup_timeout = startup_timeout
+
+        self._sessions: Dict[str, asyncio.Future] = {}
+        self._stop_events: Dict[str, asyncio.Event] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-direct-sessions", daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine, timeout: Optional[float] = None) -> Any:
+        """ Run a coroutine on the session loop and wait for its result """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def server_parameters(self, name: str) -> StdioServerParameters:
+        server = self.servers[name]
+        if "command" not in server:
+            raise ValueError(f"MCP server '{name}' is not a stdio server, only stdio servers are supported")
+        return StdioServerParameters(command=server["command"], args=server.get("args", []),
+                                     env={**os.environ, **server.get("env", {})}, cwd=server.get("cwd"))
+
+    async def session(self, name: str) -> ClientSession:
+        """ The initialized session of server `name`, started if necessary """
+        future = self._sessions.get(name)
+        if future is None or (future.done() and (future.cancelled() or future.exception() is not None)):
+            future = self._sessions[name] = self._loop.create_future()
+            self._stop_events[name] = asyncio.Event()
+            self._tasks[name] = self._loop.create_task(self._serve(name, future, self._stop_events[name]))
+        return await asyncio.wait_for(asyncio.shield(future), self.startup_timeout)
+
+    async def _serve(self, name: str, future: asyncio.Future, stop: asyncio.Event) -> None:
+        # The stdio client has to be entered and exited by the same task, so every session gets its own
+        try:
+            async with stdio_client(self.server_parameters(name)) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    if not future.done():
+                        future.set_result(session)
+                    await stop.wait()
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            elif not stop.is_set():
+                logging.warning(f"MCP session of {name} ended: {e}")
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            if self._sessions.get(name) is future:
+                self._sessions.pop(name)
+
+    async def restart(self, name: str) -> None:
+        """ Close the session of server `name`, the next call starts a new one """
+        future = self._sessions.pop(name, None)
+        stop = self._stop_events.pop(name, None)
+        if stop is not None:
+            stop.set()
+        if future is not None and not future.done():
+            future.cancel()
+
+    async def list_tools(self, name: str) -> List[types.Tool]:
+        session = await self.session(name)
+        tools, cursor = [], None
+        while True:
+            if cursor is None:
+                result = await session.list_tools()
+            else:
+                result = await session.list_tools(params=types.PaginatedRequestParams(cursor=cursor))
+            tools.extend(result.tools)
+            cursor = result.nextCursor
+            if not cursor:
+                return tools
+
+    async def call_tool(self, name: str, tool: str, arguments: Dict[str, Any], timeout: Optional[float] = None,
+                        info: Optional[DispatchInfo] = None) -> Any:
+        """ Call a tool, failures are returned as `{"error": ...}` like `dispatch_tool_call` does """
+        if info is not None:
+            info.request_bytes = len(json.dumps(arguments))
+        try:
+            session = await self.session(name)
+            result = await asyncio.wait_for(session.call_tool(tool, arguments), timeout)
+        except McpError as e:
+            # The server answered with an error, eg. unknown tool or invalid arguments
+            return self._error(info, e, e.error.message, status_code=500)
+        except (asyncio.TimeoutError, TimeoutError) as e:
+            return self._error(info, e, f"MCP server {name} did not answer within {timeout}s")
+        except Exception as e:
+            await self.restart(name)
+            return self._error(info, e, str(e) or type(e).__name__)
+
+        if info is not None:
+            info.response_bytes = _result_bytes(result)
+        if result.isError:
+            message = "Unknown tool execution error"
+            if result.content and isinstance(result.content[0], types.TextContent):
+                message = result.content[0].text
+            if info is not None:
+                info.error, info.status_code = TOOL_ERROR, 500
+            return {"error": message}
+        if info is not None:
+            info.status_code = 200
+        return tool_result(result)
+
+    @staticmethod
+    def _error(info: Optional[DispatchInfo], error: BaseException, message: str,
+               status_code: Optional[int] = None) -> Dict[str, Any]:
+        if info is not None:
+            info.error, info.status_code = type(error).__name__, status_code
+        return {"error": message}
+
+    async def _close(self) -> None:
+        for stop in self._stop_events.values():
+            stop.set()
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.wait(tasks, timeout=5.0)
+        for task in tasks:
+            task.cancel()
+
+    def close(self) -> None:
+        """ Stop every session and the event loop thread """
+        if not self._thread.is_alive():
+            return
+        try:
+            self.run(self._close(), timeout=10.0)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+class DirectMCPAdapter(OllamaMCPOAdapter):
+    def __init__(self, config: Optional[Dict] = None, config_path: Optional[Union[str, Path]] = None,
+                 startup_timeout: float = 30.0, **kwargs) -> None:
+        """ Adapter calling the stdio MCP servers of a MCP config directly, without a MCPO instance in between.
+
+            Reads the same `mcpServers` config as MCPOService, keeps one persistent MCP client session per
+            server and builds the same Ollama tool definitions from `list_tools`. Tool calls skip the HTTP
+            hop and the MCPO process. Result cache, metrics and resilience options work as with MCPO, tools
+            the servers annotate with `readOnlyHint` are cacheable without being listed in the cache `allow`.
+            Streamed results are served from the whole result, endpoint pools and the catalog cache do not apply.
+
+            :param startup_timeout: seconds to wait for a MCP server to start and initialize its session
+        """
+        super().__init__(config=config, config_path=config_path, **kwargs)
+        if self.mcp_config is None:
+            raise ValueError("Either config or config_path must be provided.")
+        self.sessions = MCPSessionManager(self.mcp_config, startup_timeout)
+
+        timeout = self.timeout.read if isinstance(self.timeout, httpx.Timeout) else self.timeout
+        self.call_timeout: Optional[float] = timeout
+
+    @property
+    def server_base_url(self) -> str:
+        return DIRECT_BASE_URL
+
+    @property
+    def discovery_base_url(self) -> str:
+        return DIRECT_BASE_URL
+
+    def close(self) -> None:
+        """ Close the MCP sessions, stopping their server processes """
+        super().close()
+        self.sessions.close()
+
+    def start(self) -> None:
+        """ Start the sessions of every MCP server now instead of on first use """
+        for name in self.sessions.servers:
+            self.sessions.run(self.sessions.session(name))
+
+    def _fetch_server_tools(self, name: str, server_base_url: str, refresh: bool) -> List[ToolEntry]:
+        return self._parse_mcp_tools(name, self.sessions.run(self.sessions.list_tools(name)))
+
+    def _parse_mcp_tools(self, name: str, tools: List[types.Tool]) -> List[ToolEntry]:
+        """ Convert the MCP tools of server `name` into (tool name, tool url, Ollama tool definition) """
+        entries, read_only = [], set()
+        for tool in tools:
+            parameters = SchemaNormalizer(tool.inputSchema).parameters(tool.inputSchema)
+            tool_def = {"type": "function", "function": {"name": f"{name}_{tool.name}",
+                                                         "description": tool.description or "",
+                                                         "parameters": parameters}}
+            if self.schema_compactor is not None:
+                tool_def = self.schema_compactor.compact_tool(tool_def)
+            if tool.annotations is not None and tool.annotations.readOnlyHint:
+                read_only.add(f"{name}_{tool.name}")
+            entries.append((f"{name}_{tool.name}", f"{DIRECT_BASE_URL}/{name}/{tool.name}", tool_def))
+        # Applied to `read_only_tools` when the tools are swapped into the registry
+        self._read_only_hints[name] = read_only
+        return entries
+
+    def _dispatch(self, tool_url: str, params: Dict[str, Any], info: Optional[DispatchInfo] = None,
+                  timeout: Optional[float] = None, raw: bool = False) -> Any:
+        # MCP sessions return decoded results, `raw` results are serialized from them by call_tool_raw
+        server, tool = tool_url[len(DIRECT_BASE_URL) + 1:].split("/", 1)
+        timeout = timeout if timeout is not None else self.call_timeout
+        return self.sessions.run(self.sessions.call_tool(server, tool, params, timeout, info))
+
+    def call_tool_stream(self, tool_call: 'Message.ToolCall', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         max_bytes: Optional[int] = None) -> ToolResultStream:
+        """ Call a tool and iterate its result like a streamed MCPO response.
+
+            MCP sessions return whole results, the stream is served from the serialized result. It offers the
+            same chunks, `iter_json()` and `max_bytes` as with MCPO but does not bound the memory use.
+            Unlike with MCPO the call goes through the result cache, metrics and resilience options.
+
+            :raises httpx.HTTPStatusError: if the tool call failed
+        """
+        tool_name = tool_call.get("function", {}).get("name")
+        raw = self.call_tool_raw(tool_call)
+        request = httpx.Request("POST", f"{DIRECT_BASE_URL}/{self.tool_servers.get(tool_name)}/{tool_name}")
+        response = httpx.Response(500 if raw.is_error else 200, stream=httpx.ByteStream(raw.content), request=request)
+        response.raise_for_status()
+        return ToolResultStream(response, chunk_size, max_bytes)
+
+    def check_endpoints(self) -> list:
+        return []
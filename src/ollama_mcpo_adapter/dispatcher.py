@@ -1,19 +1,151 @@
 import httpx
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional, Union
 
-def dispatch_tool_call(url: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+from .passthrough import RawToolResult
+from .streaming import ToolResultStream, AsyncToolResultStream, DEFAULT_CHUNK_SIZE
+
+# Errors raised before the request reached the server, a call failing with these can safely go to another instance
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+class DispatchInfo:
+    """ Filled in by the dispatchers: payload sizes, the response status code and the class of the error
+        returned as message, if any
+    """
+
+    def __init__(self) -> None:
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status_code: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def record(self, response: Optional[httpx.Response] = None, error: Optional[Exception] = None) -> None:
+        if response is not None:
+            self.request_bytes = len(response.request.content)
+            self.response_bytes = len(response.content)
+            self.status_code = response.status_code
+        if error is not None:
+            self.error = type(error).__name__
+
+
+def _error_result(message: str, raw: bool) -> Any:
+    return RawToolResult.from_error(message) if raw else {"error": message}
+
+
+def _timeout_kwargs(timeout: Union[float, httpx.Timeout, None]) -> Dict[str, Any]:
+    return {} if timeout is None else {"timeout": timeout}
+
+
+def dispatch_tool_call(url: str, parameters: Dict[str, Any], client: Optional[httpx.Client] = None,
+                       raise_connect_errors: bool = False, info: Optional[DispatchInfo] = None,
+                       timeout: Union[float, httpx.Timeout, None] = None, raw: bool = False) -> Any:
     """
     Dispatches a tool call to the specified URL with the given parameters.
 
     :param url: The URL to send the tool call to.
     :param parameters: The parameters to include in the tool call.
+    :param client: Optional pooled httpx.Client to re-use connections. Opens a new connection per call if omitted.
+    :param raise_connect_errors: Raise CONNECT_ERRORS instead of returning them as error message.
+    :param info: Optional DispatchInfo to record payload sizes and the error class in.
+    :param timeout: Timeout of this request, the timeout of the client if omitted.
+    :param raw: Return the undecoded response body as RawToolResult instead of decoding it.
     :return: The JSON response from the tool call or an error message.
     """
+    post = client.post if client is not None else httpx.post
+
     try:
-        response = httpx.post(url, json=parameters)
+        response = post(url, json=parameters, **_timeout_kwargs(timeout))
+        if info is not None:
+            info.record(response)
         response.raise_for_status()
-        return response.json()
+        return RawToolResult(response.content) if raw else response.json()
     except httpx.HTTPStatusError as e:
-        return {"error": str(e)}
+        if info is not None:
+            info.record(error=e)
+        return _error_result(str(e), raw)
     except httpx.RequestError as e:
-        return {"error": str(e)}
\ No newline at end of file
+        if raise_connect_errors and isinstance(e, CONNECT_ERRORS):
+            raise
+        if info is not None:
+            info.record(error=e)
+        return _error_result(str(e), raw)
+
+
+async def async_dispatch_tool_call(url: str, parameters: Dict[str, Any], client: httpx.AsyncClient,
+                                   raise_connect_errors: bool = False,
+                                   info: Optional[DispatchInfo] = None,
+                                   timeout: Union[float, httpx.Timeout, None] = None, raw: bool = False) -> Any:
+    """
+    Asynchronously dispatches a tool call to the specified URL with the given parameters.
+
+    :param url: The URL to send the tool call to.
+    :param parameters: The parameters to include in the tool call.
+    :param client: The httpx.AsyncClient used to send the request.
+    :param raise_connect_errors: Raise CONNECT_ERRORS instead of returning them as error message.
+    :param info: Optional DispatchInfo to record payload sizes and the error class in.
+    :param timeout: Timeout of this request, the timeout of the client if omitted.
+    :param raw: Return the undecoded response body as RawToolResult instead of decoding it.
+    :return: The JSON response from the tool call or an error message.
+    """
+    try:
+        response = await client.post(url, json=parameters, **_timeout_kwargs(timeout))
+        if info is not None:
+            info.record(response)
+        response.raise_for_status()
+        return RawToolResult(response.content) if raw else response.json()
+    except httpx.HTTPStatusError as e:
+        if info is not None:
+            info.record(error=e)
+        return _error_result(str(e), raw)
+    except httpx.RequestError as e:
+        if raise_connect_errors and isinstance(e, CONNECT_ERRORS):
+            raise
+        if info is not None:
+            info.record(error=e)
+        return _error_result(str(e), raw)
+
+
+def stream_tool_call(url: str, parameters: Dict[str, Any], client: httpx.Client, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     max_bytes: Optional[int] = None, on_close: Optional[Callable[[], None]] = None
+                     ) -> ToolResultStream:
+    """
+    Dispatches a tool call and streams the response body instead of decoding it in one go.
+
+    :param url: The URL to send the tool call to.
+    :param parameters: The parameters to include in the tool call.
+    :param client: The httpx.Client used to send the request.
+    :param chunk_size: Size of the chunks yielded by the stream.
+    :param max_bytes: Stop reading the response after this many bytes.
+    :param on_close: Called once the stream is closed.
+    :return: A ToolResultStream over the response body.
+    :raises httpx.HTTPStatusError: if the tool call failed.
+    :raises httpx.RequestError: if the request could not be sent.
+    """
+    response = client.send(client.build_request("POST", url, json=parameters), stream=True)
+    if response.is_error:
+        response.close()
+        response.raise_for_status()
+    return ToolResultStream(response, chunk_size, max_bytes, on_close)
+
+
+async def async_stream_tool_call(url: str, parameters: Dict[str, Any], client: httpx.AsyncClient,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_bytes: Optional[int] = None,
+                                 on_close: Optional[Callable[[], None]] = None) -> AsyncToolResultStream:
+    """
+    Asynchronously dispatches a tool call and streams the response body instead of decoding it in one go.
+
+    :param url: The URL to send the tool call to.
+    :param parameters: The parameters to include in the tool call.
+    :param client: The httpx.AsyncClient used to send the request.
+    :param chunk_size: Size of the chunks yielded by the stream.
+    :param max_bytes: Stop reading the response after this many bytes.
+    :param on_close: Called once the stream is closed.
+    :return: An AsyncToolResultStream over the response body.
+    :raises httpx.HTTPStatusError: if the tool call failed.
+    :raises httpx.RequestError: if the request could not be sent.
+    """
+    response = await client.send(client.build_request("POST", url, json=parameters), stream=True)
+    if response.is_error:
+        await response.aclose()
+        response.raise_for_status()
+    return AsyncToolResultStream(response, chunk_size, max_bytes, on_close)
@@ -0,0 +1,224 @@
+import bisect
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds and bytes bucket upper bounds, an implicit +Inf bucket follows the last one
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Names of the recorded measurements, as passed to callbacks
+TOOL_CALL_SECONDS = "tool_call_seconds"
+TOOL_REQUEST_BYTES = "tool_request_bytes"
+TOOL_RESPONSE_BYTES = "tool_response_bytes"
+TOOL_ERRORS = "tool_errors"
+CACHE_HITS = "cache_hits"
+CACHE_MISSES = "cache_misses"
+COALESCED_CALLS = "coalesced_calls"
+DISCOVERY_SECONDS = "discovery_seconds"
+DISCOVERY_ERRORS = "discovery_errors"
+
+COUNTERS = (TOOL_ERRORS, CACHE_HITS, CACHE_MISSES, COALESCED_CALLS, DISCOVERY_ERRORS)
+
+MetricsCallback = Callable[[str, float, Dict[str, str]], None]
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """ Bucketed distribution of observed values """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """ Upper bound of the bucket holding the q-quantile, the maximum for the +Inf bucket """
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"count": self.count, "sum": self.sum, "mean": self.sum / self.count if self.count else 0.0,
+                "max": self.max, "p50": self.quantile(0.5), "p90": self.quantile(0.9), "p99": self.quantile(0.99)}
+
+
+class Metrics:
+    """ In-process instrumentation of the adapters.
+
+        Records per tool latency and payload size histograms, error counts by error class, result cache
+        hits and misses, calls answered by an identical in-flight call and the discovery duration per
+        MCP server. Query a snapshot with `stats()`, export the Prometheus text format with `prometheus()`
+        or forward every measurement to callbacks, eg. an `OpenTelemetryCallback`.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+                 size_buckets: Sequence[float] = SIZE_BUCKETS, callbacks: Sequence[MetricsCallback] = ()) -> None:
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.callbacks: List[MetricsCallback] = list(callbacks)
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], int] = {}
+
+    def add_callback(self, callback: MetricsCallback) -> None:
+        """ Call `callback(name, value, labels)` for every measurement """
+        self.callbacks.append(callback)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """ Add a value to a histogram or, for the names in COUNTERS, to a counter """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if name in COUNTERS:
+                self._counters[key] = self._counters.get(key, 0) + int(value)
+            else:
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    buckets = self.latency_buckets if name.endswith("_seconds") else self.size_buckets
+                    histogram = self._histograms[key] = Histogram(buckets)
+                histogram.observe(value)
+
+        for callback in self.callbacks:
+            try:
+                callback(name, value, labels)
+            except Exception:
+                pass  # instrumentation must never break a tool call
+
+    def tool_call(self, tool: str, server: str, seconds: float, request_bytes: int = 0, response_bytes: int = 0,
+                  error: Optional[str] = None) -> None:
+        self.observe(TOOL_CALL_SECONDS, seconds, tool=tool, server=server)
+        self.observe(TOOL_REQUEST_BYTES, request_bytes, tool=tool, server=server)
+        self.observe(TOOL_RESPONSE_BYTES, response_bytes, tool=tool, server=server)
+        if error is not None:
+            self.observe(TOOL_ERRORS, 1, tool=tool, server=server, error=error)
+
+    def rejected(self, tool: str, server: str, error: str) -> None:
+        """ A tool call answered with an error without being dispatched """
+        self.observe(TOOL_ERRORS, 1, tool=tool, server=server, error=error)
+
+    def cache(self, tool: str, hit: bool) -> None:
+        self.observe(CACHE_HITS if hit else CACHE_MISSES, 1, tool=tool)
+
+    def coalesced(self, tool: str) -> None:
+        self.observe(COALESCED_CALLS, 1, tool=tool)
+
+    def discovery(self, server: str, seconds: float, error: Optional[str] = None) -> None:
+        self.observe(DISCOVERY_SECONDS, seconds, server=server)
+        if error is not None:
+            self.observe(DISCOVERY_ERRORS, 1, server=server, error=error)
+
+    def stats(self) -> Dict[str, Any]:
+        """ Snapshot of all measurements grouped by tool and by server """
+        tools: Dict[str, Dict[str, Any]] = {}
+        servers: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, int] = {}
+
+        def entry(labels: Dict[str, str]) -> Dict[str, Any]:
+            if "tool" in labels:
+                return tools.setdefault(labels["tool"], {"calls": 0, "errors": {}, "cache_hits": 0,
+                                                         "cache_misses": 0, "coalesced_calls": 0})
+            return servers.setdefault(labels["server"], {"discovery_errors": {}})
+
+        with self._lock:
+            for (name, label_key), histogram in self._histograms.items():
+                labels = dict(label_key)
+                stats = entry(labels)
+                stats[name] = histogram.snapshot()
+                if name == TOOL_CALL_SECONDS:
+                    stats["calls"] += histogram.count
+                    stats["server"] = labels.get("server")
+            for (name, label_key), count in self._counters.items():
+                labels = dict(label_key)
+                stats = entry(labels)
+                if name in (CACHE_HITS, CACHE_MISSES, COALESCED_CALLS):
+                    stats[name] += count
+                else:
+                    error_counts = stats["errors" if name == TOOL_ERRORS else name]
+                    error_counts[labels["error"]] = error_counts.get(labels["error"], 0) + count
+                    errors[labels["error"]] = errors.get(labels["error"], 0) + count
+
+        return {"tools": tools, "servers": servers, "errors": errors}
+
+    def prometheus(self, prefix: str = "ollama_mcpo") -> str:
+        """ All measurements in the Prometheus text exposition format """
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        declared = set()
+        for (name, label_key), histogram in histograms:
+            metric = f"{prefix}_{name}"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(label_key + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{metric}_sum{_labels(label_key)} {histogram.sum}")
+            lines.append(f"{metric}_count{_labels(label_key)} {histogram.count}")
+
+        for (name, label_key), count in counters:
+            metric = f"{prefix}_{name}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_labels(label_key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+def _labels(label_key: LabelKey) -> str:
+    if not label_key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in label_key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(label_key, escaped)) + "}"
+
+
+class OpenTelemetryCallback:
+    """ Metrics callback recording into OpenTelemetry instruments (requires opentelemetry-api) """
+
+    def __init__(self, meter=None, prefix: str = "ollama_mcpo") -> None:
+        try:
+            from opentelemetry import metrics as otel_metrics
+        except ImportError as e:
+            raise ImportError("OpenTelemetry export requires: pip install opentelemetry-api") from e
+
+        self.meter = meter or otel_metrics.get_meter("ollama_mcpo_adapter")
+        self.prefix = prefix
+        self._instruments: Dict[str, Any] = {}
+
+    def _instrument(self, name: str):
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            if name in COUNTERS:
+                instrument = self.meter.create_counter(f"{self.prefix}_{name}")
+            else:
+                unit = "s" if name.endswith("_seconds") else "By"
+                instrument = self.meter.create_histogram(f"{self.prefix}_{name}", unit=unit)
+            self._instruments[name] = instrument
+        return instrument
+
+    def __call__(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        instrument = self._instrument(name)
+        if name in COUNTERS:
+            instrument.add(value, attributes=labels)
+        else:
+            instrument.record(value, attributes=labels)
@@ -0,0 +1,72 @@
+import json
+from typing import Any, Dict, Optional
+
+# Appended to tool message contents cut to a maximum size
+TRUNCATED_MARKER = " [truncated]"
+
+_NOT_DECODED = object()
+
+
+def truncate_content(content: str, max_bytes: Optional[int] = None) -> str:
+    """ Cut `content` to `max_bytes` UTF-8 bytes without splitting a character and mark it as truncated """
+    if max_bytes is None or len(content) * 4 <= max_bytes:
+        return content
+    data = content.encode()
+    if len(data) <= max_bytes:
+        return content
+    return data[:max_bytes].decode(errors="ignore") + TRUNCATED_MARKER
+
+
+class RawToolResult:
+    """ Undecoded JSON result of a tool call.
+
+        `content` holds the response body as sent by MCPO. It is only decoded when `json()` is called,
+        `text()` and `tool_message()` pass it on as it is, except for JSON strings which are unquoted.
+        Errors are JSON objects `{"error": ...}` like the decoded results, with the message in `error`.
+    """
+    __slots__ = ("content", "error", "_decoded")
+
+    def __init__(self, content: bytes, error: Optional[str] = None) -> None:
+        self.content = content
+        self.error = error
+        self._decoded: Any = _NOT_DECODED
+
+    @classmethod
+    def from_result(cls, result: Any) -> 'RawToolResult':
+        """ Wrap an already decoded result, eg. from the result cache """
+        if isinstance(result, RawToolResult):
+            return result
+        error = result.get("error") if isinstance(result, dict) else None
+        raw = cls(json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode(),
+                  str(error) if error is not None else None)
+        raw._decoded = result
+        return raw
+
+    @classmethod
+    def from_error(cls, message: str) -> 'RawToolResult':
+        return cls.from_result({"error": message})
+
+    @property
+    def is_error(self) -> bool:
+        return self.error is not None
+
+    def json(self) -> Any:
+        """ The decoded result, decoded on first access """
+        if self._decoded is _NOT_DECODED:
+            self._decoded = json.loads(self.content)
+        return self._decoded
+
+    def text(self, max_bytes: Optional[int] = None) -> str:
+        """ Tool message content, cut to `max_bytes` if given. Only JSON strings are decoded. """
+        if self.content[:1] == b'"':
+            return truncate_content(self.json(), max_bytes)
+        if max_bytes is not None and len(self.content) > max_bytes:
+            return self.content[:max_bytes].decode(errors="ignore") + TRUNCATED_MARKER
+        return self.content.decode(errors="replace")
+
+    def tool_message(self, tool_name: str, max_bytes: Optional[int] = None) -> Dict[str, str]:
+        """ Ollama `tool` role message with this result as content """
+        return {"role": "tool", "content": self.text(max_bytes), "tool_name": tool_name}
+
+    def __repr__(self) -> str:
+        return f"RawToolResult({len(self.content)} bytes{', error' if self.is_error else ''})"
@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Collection, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+EndpointLike = Union[str, Tuple[str, Union[int, str]], 'MCPOEndpoint']
+
+LEAST_IN_FLIGHT = "least_in_flight"
+ROUND_ROBIN = "round_robin"
+
+
+class MCPOEndpoint:
+    """ One MCPO instance of a pool """
+
+    def __init__(self, host: str, port: Union[int, str]) -> None:
+        self.host = host
+        self.port = int(port)
+        self.base_url = f"http://{host}:{self.port}"
+        self.in_flight = 0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.failures = 0
+
+    @classmethod
+    def parse(cls, endpoint: EndpointLike) -> 'MCPOEndpoint':
+        if isinstance(endpoint, MCPOEndpoint):
+            return endpoint
+        if isinstance(endpoint, str):
+            url = httpx.URL(endpoint if "://" in endpoint else f"http://{endpoint}")
+            return cls(url.host, url.port or 80)
+        host, port = endpoint
+        return cls(host, port)
+
+    def available(self, now: float) -> bool:
+        return self.healthy or now >= self.ejected_until
+
+    def __repr__(self) -> str:
+        return f"MCPOEndpoint({self.base_url}, in_flight={self.in_flight}, healthy={self.healthy})"
+
+
+class EndpointPool:
+    """ A set of MCPO instances serving the same MCP config.
+
+        `acquire` picks an endpoint by `strategy` (least_in_flight or round_robin) among the healthy ones.
+        Endpoints that refuse connections or fail a health check are ejected for `eject_seconds`, after
+        which they get traffic again and are re-admitted by the next successful call or health check.
+    """
+
+    def __init__(self, endpoints: Sequence[EndpointLike], strategy: str = LEAST_IN_FLIGHT,
+                 eject_seconds: float = 10.0, health_path: str = "/openapi.json") -> None:
+        if strategy not in (LEAST_IN_FLIGHT, ROUND_ROBIN):
+            raise ValueError(f"Unknown load balancing strategy: {strategy}")
+
+        self.strategy = strategy
+        self.eject_seconds = eject_seconds
+        self.health_path = health_path
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._endpoints: List[MCPOEndpoint] = []
+        self.set_endpoints(endpoints)
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+    @property
+    def endpoints(self) -> List[MCPOEndpoint]:
+        return list(self._endpoints)
+
+    def set_endpoints(self, endpoints: Sequence[EndpointLike]) -> None:
+        """ Replace the pool members, endpoints already known keep their state """
+        if not endpoints:
+            raise ValueError("An endpoint pool needs at least one endpoint")
+
+        with self._lock:
+            known = {endpoint.base_url: endpoint for endpoint in self._endpoints}
+            parsed = [MCPOEndpoint.parse(endpoint) for endpoint in endpoints]
+            self._endpoints = [known.get(endpoint.base_url, endpoint) for endpoint in parsed]
+
+    def acquire(self, exclude: Collection[MCPOEndpoint] = ()) -> MCPOEndpoint:
+        """ Pick an endpoint for one call and count it as in flight until `release` """
+        with self._lock:
+            endpoint = self._pick(exclude)
+            endpoint.in_flight += 1
+            return endpoint
+
+    def pick(self, exclude: Collection[MCPOEndpoint] = ()) -> MCPOEndpoint:
+        """ Pick an endpoint without counting a call, eg. for discovery """
+        with self._lock:
+            return self._pick(exclude)
+
+    def _pick(self, exclude: Collection[MCPOEndpoint]) -> MCPOEndpoint:
+        now = time.monotonic()
+        candidates = [e for e in self._endpoints if e not in exclude and e.available(now)]
+        if not candidates:
+            # Everything is ejected: try the endpoint that will be re-admitted first
+            remaining = [e for e in self._endpoints if e not in exclude] or self._endpoints
+            candidates = [min(remaining, key=lambda e: e.ejected_until)]
+
+        start = next(self._round_robin) % len(candidates)
+        if self.strategy == ROUND_ROBIN:
+            return candidates[start]
+        # Rotate the candidates so ties between equally busy instances are spread evenly
+        return min(candidates[start:] + candidates[:start], key=lambda e: e.in_flight)
+
+    def release(self, endpoint: MCPOEndpoint) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+
+    def mark_failed(self, endpoint: MCPOEndpoint) -> None:
+        with self._lock:
+            if endpoint.healthy:
+                logging.warning(f"Ejecting MCPO endpoint {endpoint.base_url} for {self.eject_seconds}s")
+            endpoint.healthy = False
+            endpoint.failures += 1
+            endpoint.ejected_until = time.monotonic() + self.eject_seconds
+
+    def mark_healthy(self, endpoint: MCPOEndpoint) -> None:
+        if endpoint.healthy:
+            return
+        with self._lock:
+            logging.info(f"MCPO endpoint {endpoint.base_url} is healthy again")
+            endpoint.healthy = True
+            endpoint.failures = 0
+
+    def _record_health(self, endpoint: MCPOEndpoint, response: Optional[httpx.Response]) -> bool:
+        healthy = response is not None and response.status_code < 400
+        if healthy:
+            self.mark_healthy(endpoint)
+        else:
+            self.mark_failed(endpoint)
+        return healthy
+
+    def check_health(self, client: httpx.Client) -> List[MCPOEndpoint]:
+        """ Probe every endpoint and return the healthy ones """
+        for endpoint in self.endpoints:
+            try:
+                response = client.get(f"{endpoint.base_url}{self.health_path}")
+            except httpx.HTTPError:
+                response = None
+            self._record_health(endpoint, response)
+        return [endpoint for endpoint in self.endpoints if endpoint.healthy]
+
+    async def async_check_health(self, client: httpx.AsyncClient) -> List[MCPOEndpoint]:
+        """ Probe every endpoint concurrently and return the healthy ones """
+        async def probe(endpoint: MCPOEndpoint) -> Optional[httpx.Response]:
+            try:
+                return await client.get(f"{endpoint.base_url}{self.health_path}")
+            except httpx.HTTPError:
+                return None
+
+        endpoints = self.endpoints
+        for endpoint, response in zip(endpoints, await asyncio.gather(*(probe(e) for e in endpoints))):
+            self._record_health(endpoint, response)
+        return [endpoint for endpoint in endpoints if endpoint.healthy]
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import sys
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .catalog_cache import ToolEntry
+
+
+class ServerRecord:
+    """ Registered tools of one MCP server """
+    __slots__ = ("name", "base_url", "tools")
+
+    def __init__(self, name: str, base_url: str, tools: Tuple['ToolRecord', ...] = ()) -> None:
+        self.name = name
+        self.base_url = base_url
+        self.tools = tools
+
+    @classmethod
+    def from_entries(cls, name: str, entries: List[ToolEntry]) -> 'ServerRecord':
+        server = cls(name, "")
+        records = []
+        for tool_name, tool_url, tool_def in entries:
+            # Tool urls are "{mcpo url}/{server name}{path}", the interned base url is shared by the tools
+            prefix_end = tool_url.find(f"/{name}/")
+            base_url = sys.intern(tool_url[:prefix_end + len(name) + 1] if prefix_end >= 0 else "")
+            server.base_url = server.base_url or base_url
+            records.append(ToolRecord(tool_name, server, base_url, tool_url[len(base_url):], tool_def))
+        server.tools = tuple(records)
+        return server
+
+    def entries(self) -> List[ToolEntry]:
+        return [record.entry() for record in self.tools]
+
+    def __repr__(self) -> str:
+        return f"ServerRecord({self.name}, {self.base_url}, {len(self.tools)} tools)"
+
+
+class ToolRecord:
+    """ One registered tool: name, server, url split into the shared server base url and the tool path,
+        and the Ollama tool definition
+    """
+    __slots__ = ("name", "server", "base_url", "path", "definition", "_schema_key")
+
+    def __init__(self, name: str, server: ServerRecord, base_url: str, path: str,
+                 definition: Dict[str, Any]) -> None:
+        self.name = name
+        self.server = server
+        self.base_url = base_url
+        self.path = path
+        self.definition = definition
+        self._schema_key: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}{self.path}"
+
+    @property
+    def server_name(self) -> str:
+        return self.server.name
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        """ JSON schema of the tool arguments """
+        return self.definition.get("function", {}).get("parameters", {})
+
+    @property
+    def schema_key(self) -> str:
+        """ Hash of the parameters schema, equal for tools taking the same arguments """
+        if self._schema_key is None:
+            canonical = json.dumps(self.parameters, sort_keys=True, separators=(",", ":"))
+            self._schema_key = hashlib.sha1(canonical.encode()).hexdigest()
+        return self._schema_key
+
+    def entry(self) -> ToolEntry:
+        return self.name, self.url, self.definition
+
+    def __repr__(self) -> str:
+        return f"ToolRecord({self.name}, {self.url})"
+
+
+class ToolRegistrySnapshot:
+    """ Immutable view of the registered tools of all MCP servers.
+
+        Updates never modify a snapshot, they return a new one (copy-on-write) which the adapter swaps in
+        with a single attribute assignment. Readers holding a snapshot therefore always see the complete
+        tools of every server, never a half rebuilt registry. Server records of unchanged servers are
+        shared between snapshots.
+
+        Tools are indexed by name and server. `tool_registry`, `tool_servers` and `ollama_tools` are
+        materialized on first access and cached with the snapshot.
+    """
+
+    def __init__(self, servers: Optional[Dict[str, List[ToolEntry]]] = None) -> None:
+        self._from_records({name: ServerRecord.from_entries(name, entries)
+                            for name, entries in (servers or {}).items()})
+
+    def _from_records(self, servers: Dict[str, ServerRecord]) -> None:
+        self._servers = servers
+        self._tools: Dict[str, ToolRecord] = {}
+        for server in servers.values():
+            for record in server.tools:
+                self._tools[record.name] = record
+
+    @classmethod
+    def from_records(cls, servers: Dict[str, ServerRecord]) -> 'ToolRegistrySnapshot':
+        snapshot = cls.__new__(cls)
+        snapshot._from_records(servers)
+        return snapshot
+
+    @property
+    def servers(self) -> Dict[str, ServerRecord]:
+        return self._servers
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def __contains__(self, tool_name: str) -> bool:
+        return tool_name in self._tools
+
+    def __iter__(self) -> Iterator[ToolRecord]:
+        return iter(self._tools.values())
+
+    def get(self, tool_name: str) -> Optional[ToolRecord]:
+        return self._tools.get(tool_name)
+
+    def server_of(self, tool_name: str) -> str:
+        """ Name of the MCP server of a tool, empty for unknown tools """
+        record = self._tools.get(tool_name)
+        return record.server.name if record is not None else ""
+
+    @cached_property
+    def tool_registry(self) -> Dict[str, str]:
+        return {name: record.url for name, record in self._tools.items()}
+
+    @cached_property
+    def tool_servers(self) -> Dict[str, str]:
+        return {name: record.server.name for name, record in self._tools.items()}
+
+    @cached_property
+    def ollama_tools(self) -> List[Dict[str, Any]]:
+        return [record.definition for record in self._tools.values()]
+
+    @cached_property
+    def _schema_index(self) -> Dict[str, Tuple[str, ...]]:
+        index: Dict[str, List[str]] = {}
+        for record in self._tools.values():
+            index.setdefault(record.schema_key, []).append(record.name)
+        return {key: tuple(names) for key, names in index.items()}
+
+    def tools_with_schema(self, schema_key: str) -> Tuple[str, ...]:
+        """ Names of the tools whose parameters schema has the given `ToolRecord.schema_key` """
+        return self._schema_index.get(schema_key, ())
+
+    def with_server(self, server_name: str, tools: List[ToolEntry]) -> 'ToolRegistrySnapshot':
+        """ Return a snapshot with the tools of `server_name` added or replaced in place """
+        servers = dict(self._servers)
+        servers[server_name] = ServerRecord.from_entries(server_name, tools)
+        return self.from_records(servers)
+
+    def without_server(self, server_name: str) -> 'ToolRegistrySnapshot':
+        servers = dict(self._servers)
+        servers.pop(server_name, None)
+        return self.from_records(servers)
+
+    def server_tools(self, server_name: str) -> List[Dict[str, Any]]:
+        server = self._servers.get(server_name)
+        return [record.definition for record in server.tools] if server is not None else []
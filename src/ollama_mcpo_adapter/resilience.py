@@ -0,0 +1,227 @@
+import random
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Collection, Dict, Optional
+
+from .dispatcher import DispatchInfo, CONNECT_ERRORS
+from .result_cache import DEFAULT_DENY, is_idempotent_tool
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Error class recorded for calls rejected by an open circuit breaker
+CIRCUIT_OPEN_ERROR = "CircuitOpenError"
+# Gateway errors of MCPO, other error status codes are answers of the tool itself, eg. a missing file
+FAILURE_STATUS_CODES = (502, 503, 504)
+# Errors of requests that never reached the server, they are retried for every tool
+UNSENT_ERRORS = tuple(error.__name__ for error in CONNECT_ERRORS)
+
+
+def is_server_failure(info: DispatchInfo) -> bool:
+    """ True if the attempt failed because the MCP server did not answer: transport errors and gateway errors """
+    if info.error is None:
+        return False
+    return info.status_code is None or info.status_code in FAILURE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """ Fast-fails calls to a MCP server after `failure_threshold` consecutive failures.
+
+        After `recovery_time` seconds one trial call is let through (half open), its success closes
+        the breaker again, its failure re-opens it for another `recovery_time`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._state = CLOSED
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self.retry_after() <= 0:
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """ Seconds until an open breaker lets a trial call through """
+        if self._state != OPEN:
+            return 0.0
+        return max(self.opened_at + self.recovery_time - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """ Whether a call may be sent now, every allowed call must be followed by a `record` """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self.retry_after() > 0:
+                return False
+            if self._trial:
+                return False
+            self._state, self._trial = HALF_OPEN, True
+            return True
+
+    def record(self, failed: bool) -> None:
+        with self._lock:
+            self._trial = False
+            if not failed:
+                self._state, self.failures, self.opened_at = CLOSED, 0, None
+                return
+
+            self.failures += 1
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state, self.opened_at = OPEN, time.monotonic()
+
+    def reset(self) -> None:
+        self.record(failed=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {"state": state, "failures": self.failures, "retry_after": self.retry_after()}
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker({self.state}, failures={self.failures})"
+
+
+class ResiliencePolicy:
+    """ Timeout budgets, retries and per MCP server circuit breakers for tool calls.
+
+        A tool call gets `timeout` seconds in total, overridden per server by `server_timeouts` and per
+        tool by `tool_timeouts` (tool name or pattern). Failed calls are retried with exponential backoff
+        and full jitter as long as the budget allows: every tool after connect errors, where the request
+        never reached the server, and only the tools listed in `idempotent_tools` after read timeouts and
+        gateway errors, as the server may have run the call already. Tool patterns in `idempotent_tools`
+        matching `side_effect_tools` are excluded, tool names listed explicitly are not.
+        Every server has its own CircuitBreaker, see `states()`.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, tool_timeouts: Optional[Dict[str, float]] = None,
+                 server_timeouts: Optional[Dict[str, float]] = None, retries: int = 2, backoff: float = 0.2,
+                 max_backoff: float = 5.0, idempotent_tools: Optional[Collection[str]] = None,
+                 side_effect_tools: Optional[Collection[str]] = DEFAULT_DENY, failure_threshold: int = 5,
+                 recovery_time: float = 30.0) -> None:
+        """
+        :param timeout: seconds a tool call may take including retries, None for the HTTP client timeout
+        :param tool_timeouts: timeout per tool name or pattern
+        :param server_timeouts: timeout per MCP server name
+        :param retries: maximum retries of a failed idempotent tool call
+        :param backoff: base delay of the first retry, doubled for every further retry
+        :param max_backoff: upper bound of the retry delay
+        :param idempotent_tools: tool names or patterns that may be retried after any server failure,
+                                 default: none, only calls that never reached the server are retried
+        :param side_effect_tools: tool patterns excluded from `idempotent_tools` patterns
+        :param failure_threshold: consecutive failures that open the circuit breaker of a server
+        :param recovery_time: seconds an open circuit breaker rejects calls before a trial call
+        """
+        self.timeout = timeout
+        self.tool_timeouts = tool_timeouts or {}
+        self.server_timeouts = server_timeouts or {}
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idempotent_tools = idempotent_tools
+        self.side_effect_tools = side_effect_tools or ()
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._idempotent: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def is_idempotent(self, tool_name: str) -> bool:
+        """ Only tools the caller listed in `idempotent_tools` are idempotent """
+        idempotent = self._idempotent.get(tool_name)
+        if idempotent is None:
+            idempotent = is_idempotent_tool(tool_name, self.idempotent_tools, self.side_effect_tools)
+            self._idempotent[tool_name] = idempotent
+        return idempotent
+
+    def timeout_for(self, tool_name: str, server: str) -> Optional[float]:
+        if tool_name in self.tool_timeouts:
+            return self.tool_timeouts[tool_name]
+        for pattern, timeout in self.tool_timeouts.items():
+            if fnmatchcase(tool_name, pattern):
+                return timeout
+        return self.server_timeouts.get(server, self.timeout)
+
+    def retry_delay(self, retry: int) -> float:
+        """ Full jitter: a random delay up to the exponential backoff of the `retry`-th retry """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** retry))
+
+    def breaker(self, server: str) -> CircuitBreaker:
+        breaker = self._breakers.get(server)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(server, CircuitBreaker(self.failure_threshold,
+                                                                           self.recovery_time))
+        return breaker
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """ Circuit breaker state, consecutive failures and seconds until the next trial call per server """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {server: breaker.snapshot() for server, breaker in breakers.items()}
+
+    def budget(self, tool_name: str, server: str) -> 'CallBudget':
+        return CallBudget(self, tool_name, server)
+
+
+class CallBudget:
+    """ Attempts of one tool call, used by the sync and async adapters alike:
+
+        while True:
+            rejected = budget.start(info)
+            if rejected is not None: return rejected
+            result = dispatch(..., timeout=budget.timeout())
+            delay = budget.finish(info)
+            if delay is None: return result
+            sleep(delay)
+    """
+
+    def __init__(self, policy: ResiliencePolicy, tool_name: str, server: str) -> None:
+        self.policy = policy
+        self.server = server
+        self.breaker = policy.breaker(server)
+        self.idempotent = policy.is_idempotent(tool_name)
+        self.attempts = 0
+
+        timeout = policy.timeout_for(tool_name, server)
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+
+    def timeout(self) -> Optional[float]:
+        """ Seconds left of the budget for the next attempt """
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.001)
+
+    def start(self, info: DispatchInfo) -> Optional[Dict[str, Any]]:
+        """ Error result if the circuit breaker rejects the call, otherwise prepare `info` for the attempt """
+        if not self.breaker.allow():
+            info.error = CIRCUIT_OPEN_ERROR
+            return {"error": f"Circuit breaker of MCP server '{self.server}' is open, "
+                             f"retry in {self.breaker.retry_after():.1f}s"}
+        info.error, info.status_code = None, None
+        self.attempts += 1
+        return None
+
+    def finish(self, info: DispatchInfo) -> Optional[float]:
+        """ Record the outcome of an attempt, returns the delay before the next attempt or None when done """
+        failed = is_server_failure(info)
+        self.breaker.record(failed)
+        if not failed or self.attempts > self.policy.retries or self.breaker.state == OPEN:
+            return None
+        if not self.idempotent and info.error not in UNSENT_ERRORS:
+            return None  # the server may have run the call, running it again could repeat its side effects
+
+        delay = self.policy.retry_delay(self.attempts - 1)
+        if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+            return None
+        return delay
@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Collection, Dict, Optional, Tuple
+
+from .passthrough import RawToolResult
+
+# Tools matching these patterns have side effects, a safety net excluding them from allow patterns and
+# from tools their server marks read-only. Tool names listed in allow explicitly are not affected.
+DEFAULT_DENY = ("*write*", "*edit*", "*create*", "*move*", "*delete*", "*remove*", "*update*", "*set_*", "*send*",
+                "*upload*", "*insert*", "*execute*", "*run_*")
+
+MISS = object()
+
+
+def is_idempotent_tool(tool_name: str, allow: Optional[Collection[str]] = None,
+                       deny: Collection[str] = DEFAULT_DENY, read_only: bool = False) -> bool:
+    """ A tool is idempotent if it is named in `allow`, or if it matches a pattern of `allow` or is marked
+        read-only by its MCP server and does not match `deny`. Without `allow` only read-only tools are.
+    """
+    if allow is not None and tool_name in allow:
+        return True
+    listed = read_only or (allow is not None and any(fnmatchcase(tool_name, pattern) for pattern in allow))
+    return listed and not any(fnmatchcase(tool_name, pattern) for pattern in deny)
+
+
+def canonical_arguments(params: Any) -> str:
+    """ Serialize tool arguments so that equal arguments always produce the same key """
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _is_error(result: Any) -> bool:
+    if isinstance(result, RawToolResult):
+        return result.is_error
+    return isinstance(result, dict) and "error" in result
+
+
+def _result_size(result: Any) -> int:
+    # Undecoded results are kept as they are, their size is known without serializing them
+    if isinstance(result, RawToolResult):
+        return len(result.content)
+    return len(canonical_arguments(result))
+
+
+class ToolResultCache:
+    """ LRU cache of tool call results keyed by tool name and canonicalized arguments.
+
+        Only idempotent tools are cached: the tools named in `allow`, the tools matching its patterns and the
+        tools their MCP server marks read-only, minus those matching `deny` (fnmatch patterns, defaults to
+        DEFAULT_DENY). Explicitly allowed tool names win over deny patterns. Without `allow` only read-only
+        tools are cached, MCPO does not pass the hint on, see DirectMCPAdapter.
+
+        Entries expire after `ttl` seconds or the per tool value in `tool_ttls` (tool name or pattern,
+        0 disables caching for that tool). The cache holds at most `maxsize` entries and, if given,
+        `max_bytes` of serialized results.
+
+        Cached results are shared between callers and must be treated as read-only. Undecoded RawToolResults
+        are cached as they are and decoded by the adapter when a caller needs the decoded result.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0, tool_ttls: Optional[Dict[str, float]] = None,
+                 allow: Optional[Collection[str]] = None, deny: Optional[Collection[str]] = DEFAULT_DENY,
+                 max_bytes: Optional[int] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tool_ttls = tool_ttls or {}
+        self.allow = allow
+        self.deny = deny or ()
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[Tuple[str, str], Tuple[Any, float, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._cacheable: Dict[Tuple[str, bool], bool] = {}
+
+    def is_cacheable(self, tool_name: str, read_only: bool = False) -> bool:
+        """ :param read_only: the MCP server marks the tool read-only """
+        cacheable = self._cacheable.get((tool_name, read_only))
+        if cacheable is None:
+            cacheable = (is_idempotent_tool(tool_name, self.allow, self.deny, read_only)
+                         and self._ttl_for(tool_name) > 0)
+            self._cacheable[(tool_name, read_only)] = cacheable
+        return cacheable
+
+    def _ttl_for(self, tool_name: str) -> float:
+        if tool_name in self.tool_ttls:
+            return self.tool_ttls[tool_name]
+        for pattern, ttl in self.tool_ttls.items():
+            if fnmatchcase(tool_name, pattern):
+                return ttl
+        return self.ttl
+
+    def get(self, tool_name: str, params: Any, read_only: bool = False) -> Any:
+        """ Return the cached result or MISS """
+        if not self.is_cacheable(tool_name, read_only):
+            return MISS
+
+        key = (tool_name, canonical_arguments(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    self._pop(key)
+                self.misses += 1
+                return MISS
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, tool_name: str, params: Any, result: Any, read_only: bool = False) -> None:
+        if not self.is_cacheable(tool_name, read_only) or _is_error(result):
+            return
+
+        size = _result_size(result) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        key = (tool_name, canonical_arguments(params))
+        expires = time.monotonic() + self._ttl_for(tool_name)
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (result, expires, size)
+            self._size_bytes += size
+
+            while len(self._entries) > self.maxsize or (
+                    self.max_bytes is not None and self._size_bytes > self.max_bytes):
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _pop(self, key: Tuple[str, str]) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size_bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._size_bytes}
@@ -0,0 +1,77 @@
+from collections import Counter
+from typing import Collection, Dict, List, Optional, Sequence, Union
+
+
+class ToolCallScheduler:
+    """ Decides which tool calls of a model response may run next.
+
+        Calls start in their original order as long as fewer than `max_workers` are running and
+        their MCP server has fewer than its `max_per_server` calls in flight. Calls of tools (or servers)
+        listed in `sequential_tools` form one ordered lane: each of them waits for its predecessor.
+        The scheduler only does bookkeeping, the adapters run the calls on threads or asyncio tasks.
+    """
+
+    def __init__(self, servers: Sequence[str], tool_names: Sequence[str], max_workers: int = 8,
+                 max_per_server: Union[int, Dict[str, int], None] = None,
+                 sequential_tools: Optional[Collection[str]] = None) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        limits = max_per_server.values() if isinstance(max_per_server, dict) else [max_per_server]
+        if any(limit is not None and limit < 1 for limit in limits):
+            raise ValueError("max_per_server must be at least 1")
+
+        self.servers = list(servers)
+        self.max_workers = max_workers
+        self.max_per_server = max_per_server
+
+        sequential_tools = sequential_tools or ()
+        self.depends_on: List[Optional[int]] = []
+        previous = None
+        for index, (server, tool_name) in enumerate(zip(self.servers, tool_names)):
+            if tool_name in sequential_tools or server in sequential_tools:
+                self.depends_on.append(previous)
+                previous = index
+            else:
+                self.depends_on.append(None)
+
+        self.pending: List[int] = list(range(len(self.servers)))
+        self.done: set = set()
+        self.running = 0
+        self.server_load: Counter = Counter()
+
+    def _server_limit(self, server: str) -> Optional[int]:
+        if isinstance(self.max_per_server, dict):
+            return self.max_per_server.get(server)
+        return self.max_per_server
+
+    def _is_ready(self, index: int) -> bool:
+        dependency = self.depends_on[index]
+        if dependency is not None and dependency not in self.done:
+            return False
+
+        limit = self._server_limit(self.servers[index])
+        return limit is None or self.server_load[self.servers[index]] < limit
+
+    def take_ready(self) -> List[int]:
+        """ Return the indices of the calls to start now and mark them as running """
+        started = []
+        for index in list(self.pending):
+            if self.running >= self.max_workers:
+                break
+            if not self._is_ready(index):
+                continue
+
+            self.pending.remove(index)
+            self.server_load[self.servers[index]] += 1
+            self.running += 1
+            started.append(index)
+        return started
+
+    def finish(self, index: int) -> None:
+        self.server_load[self.servers[index]] -= 1
+        self.running -= 1
+        self.done.add(index)
+
+    @property
+    def finished(self) -> bool:
+        return not self.pending and self.running == 0
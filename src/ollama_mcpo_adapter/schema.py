@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional
+
+# Keywords that only annotate a schema and carry no information for the model
+DROPPED_KEYWORDS = frozenset(("title", "$defs", "definitions", "$schema", "$id"))
+COMBINATOR_KEYWORDS = ("anyOf", "oneOf")
+NULL_SCHEMA = {"type": "null"}
+
+
+class SchemaNormalizer:
+    """ Turns the JSON schemas of one OpenAPI spec (or one MCP inputSchema) into compact, fully inlined schemas.
+
+        - `$ref`s are resolved against the root document (components/schemas, $defs or any JSON pointer)
+        - `allOf` is merged into one schema, `anyOf`/`oneOf` members are normalized and an Optional
+          `anyOf: [X, {"type": "null"}]` collapses to X marked `"nullable": true`. Optional parameters
+          may be null anyway and lose the marker.
+        - titles, empty descriptions and definition sections are dropped
+        - recursive references are cut with a plain `{"type": "object"}` at the point of recursion
+
+        The input is never modified. Resolved `$ref` targets are memoized per normalizer, so components
+        shared by many tools are resolved once and the resulting schemas share these read-only objects.
+    """
+
+    def __init__(self, document: Dict[str, Any]) -> None:
+        self.document = document
+        self._resolved: Dict[str, Dict[str, Any]] = {}
+        self._resolving: List[str] = []
+        self._cycles = 0
+
+    def _lookup(self, ref: str) -> Optional[Dict[str, Any]]:
+        if not ref.startswith("#"):
+            return None  # remote references are not supported
+
+        node: Any = self.document
+        for part in ref.lstrip("#").strip("/").split("/"):
+            if not part:
+                continue
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node if isinstance(node, dict) else None
+
+    def resolve_ref(self, ref: str) -> Dict[str, Any]:
+        """ Return the normalized target schema of `ref` """
+        if ref in self._resolved:
+            return self._resolved[ref]
+        if ref in self._resolving:
+            self._cycles += 1
+            return {"type": "object"}
+
+        target = self._lookup(ref)
+        if target is None:
+            return {}
+
+        cycles = self._cycles
+        self._resolving.append(ref)
+        try:
+            resolved = self.normalize(target)
+        finally:
+            self._resolving.pop()
+
+        # Schemas cut at a recursion depend on where the resolution started, only memoize the others
+        if self._cycles == cycles:
+            self._resolved[ref] = resolved
+        return resolved
+
+    def normalize(self, schema: Any) -> Any:
+        """ Return a normalized copy of `schema` """
+        if not isinstance(schema, dict):
+            return schema
+
+        if "$ref" in schema:
+            resolved = self.resolve_ref(schema["$ref"])
+            siblings = {key: value for key, value in schema.items() if key != "$ref"}
+            if not siblings:
+                return resolved
+            return self._merge([self._normalize_keywords(siblings), resolved])
+
+        if "allOf" in schema:
+            parts = [self.normalize(part) for part in schema["allOf"]]
+            rest = {key: value for key, value in schema.items() if key != "allOf"}
+            return self._merge(parts + [self._normalize_keywords(rest)])
+
+        return self._normalize_keywords(schema)
+
+    def _normalize_keywords(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        normalized = {}
+        for key, value in schema.items():
+            if key in DROPPED_KEYWORDS:
+                continue
+            if key == "description" and (not isinstance(value, str) or not value.strip()):
+                continue
+
+            if key == "properties" and isinstance(value, dict):
+                value = {name: self.normalize(definition) for name, definition in value.items()}
+            elif key in ("items", "additionalProperties", "not", "contains", "propertyNames"):
+                value = self.normalize(value)
+            elif key == "prefixItems" and isinstance(value, list):
+                value = [self.normalize(item) for item in value]
+            elif key in COMBINATOR_KEYWORDS and isinstance(value, list):
+                members = [self.normalize(member) for member in value]
+                non_null = [member for member in members if member != NULL_SCHEMA]
+                if len(non_null) == 1 and len(members) == 2 and isinstance(non_null[0], dict):
+                    normalized.update({k: v for k, v in non_null[0].items() if k not in normalized})
+                    normalized["nullable"] = True  # the argument validator accepts null for X
+                    continue
+                value = members
+            normalized[key] = value
+        return normalized
+
+    @staticmethod
+    def _merge(schemas: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """ Merge allOf members or a $ref with its siblings: properties and required are combined,
+            for every other keyword the first schema wins
+        """
+        merged: Dict[str, Any] = {}
+        for schema in schemas:
+            if not isinstance(schema, dict):
+                continue
+            for key, value in schema.items():
+                if key == "properties" and isinstance(value, dict):
+                    merged["properties"] = {**merged.get("properties", {}), **value}
+                elif key == "required" and isinstance(value, list):
+                    merged["required"] = merged.get("required", []) + [r for r in value
+                                                                      if r not in merged.get("required", [])]
+                else:
+                    merged.setdefault(key, value)
+        return merged
+
+    def parameters(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """ Ollama function parameters of a request body schema """
+        normalized = self.normalize(schema)
+        required = normalized.get("required", [])
+        # Optional parameters may be null anyway, only required ones keep the nullable marker
+        properties = {name: self._drop_nullable(definition) if name not in required else definition
+                      for name, definition in normalized.get("properties", {}).items()}
+        return {"type": "object", "properties": properties, "required": required}
+
+    @staticmethod
+    def _drop_nullable(schema: Any) -> Any:
+        if isinstance(schema, dict) and "nullable" in schema:
+            return {key: value for key, value in schema.items() if key != "nullable"}
+        return schema
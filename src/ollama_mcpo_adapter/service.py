@@ -1,7 +1,9 @@
 import logging
 import logging.handlers
 import socket
+import subprocess
 import sys
+import threading
 import time
 from multiprocessing import context
 from pathlib import Path
@@ -9,26 +11,61 @@ from typing import Dict, Optional, Union
 
 import httpx
 
-from .config_parser import parse_to_config
-from .service_runner import run_mcpo
+from .config_parser import parse_to_config, get_mcp_server_names
 
 MP_CONTEXT = context.SpawnContext()
 
+MCPO_LOGGER = logging.getLogger("mcpo")
+
+
+# Launch modes: mcpo supervised from a spawned Python process or from a thread of the calling process
+PROCESS = "process"
+THREAD = "thread"
+
+
+def _runner():
+    """ service_runner and its psutil import are only loaded once a service is started or stopped """
+    from . import service_runner
+    return service_runner
+
 
 class MCPOService:
     def __init__(self, host: str, port: Union[int, str], config: Optional[Dict] = None,
-                 config_path: Optional[Union[str, Path]] = None, timeout = 30.0) -> None:
+                 config_path: Optional[Union[str, Path]] = None, timeout = 30.0, probe_delay: float = 0.01,
+                 max_probe_delay: float = 0.25, launch_mode: str = PROCESS) -> None:
+        """
+        :param launch_mode: "process" runs mcpo from a spawned Python process, "thread" launches mcpo directly
+                            and supervises it from a thread of this process, which starts noticeably faster
+        """
+        if launch_mode not in (PROCESS, THREAD):
+            raise ValueError(f"Unknown launch mode: {launch_mode}")
+
         self.host = host
         self.port = port
         self.config = parse_to_config(config, config_path)
-        self.timeout = 30.0
+        self.timeout = timeout
+        self.probe_delay = probe_delay
+        self.max_probe_delay = max_probe_delay
+
+        # Seconds from the start of waiting until each MCP server answered
+        self.server_ready_times: Dict[str, float] = {}
+        self.time_to_ready: Optional[float] = None
+
+        self.launch_mode = launch_mode
+        self.process: Union[MP_CONTEXT.Process, subprocess.Popen, None] = None
+        self._supervisor: Optional[threading.Thread] = None
+
+        if launch_mode == THREAD:
+            self.started_event = threading.Event()
+            self.abort_event = threading.Event()
+            self.finished_event = threading.Event()
+            self.log_queue, self.log_listener = None, None
+            return
 
         self.started_event = MP_CONTEXT.Event()
         self.abort_event = MP_CONTEXT.Event()
         self.finished_event = MP_CONTEXT.Event()
 
-        self.process = None
-
         # Set up logging queue and listener in the main process.
         self.log_queue = MP_CONTEXT.Queue(-1)
 
@@ -45,6 +82,12 @@ class MCPOService:
         self.log_listener = logging.handlers.QueueListener(self.log_queue, console_handler)
 
     def start(self, wait: bool = True) -> None:
+        if self.launch_mode == THREAD:
+            self._start_thread()
+            if wait:
+                self.wait_for_mcpo_ready()
+            return
+
         self.log_listener.start()
 
         self.process = MP_CONTEXT.Process(target=self.run_with_logging, args=(
@@ -55,6 +98,26 @@ class MCPOService:
         if wait:
             self.wait_for_mcpo_ready()
 
+    def _start_thread(self) -> None:
+        self.process, temp_config_path = _runner().popen_mcpo(self.host, self.port, self.config,
+                                                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        self.started_event.set()
+        self._supervisor = threading.Thread(target=self._pipe_logs, args=(self.process, temp_config_path),
+                                            name=f"MCPOService-{self.port}", daemon=True)
+        self._supervisor.start()
+
+    def _pipe_logs(self, process: subprocess.Popen, temp_config_path: Optional[str]) -> None:
+        """ Forward the mcpo output to the mcpo logger until the process exits """
+        try:
+            for line in process.stdout:
+                MCPO_LOGGER.info(line.decode(errors="replace").rstrip())
+            process.wait()
+            logging.info("Process was terminated.")
+        finally:
+            process.stdout.close()
+            _runner()._remove_config_file(temp_config_path)
+            self.finished_event.set()
+
     @staticmethod
     def run_with_logging(host: str, port: Union[int, str], config: Dict, started_event: MP_CONTEXT.Event,
                          abort_event: MP_CONTEXT.Event, finished_event: MP_CONTEXT.Event,
@@ -66,46 +129,95 @@ class MCPOService:
         root_logger.addHandler(handler)
         root_logger.setLevel(logging.DEBUG)
 
-        run_mcpo(host, port, config, started_event, abort_event, finished_event)
+        _runner().run_mcpo(host, port, config, started_event, abort_event, finished_event)
 
     def _get_host(self) -> str:
         if self.host == "0.0.0.0":
             return socket.gethostbyname(socket.gethostname())
         return self.host
 
-    def wait_for_mcpo_ready(self) -> None:
-        start_time = time.time()
+    def wait_for_mcpo_ready(self) -> bool:
+        """ Wait until the openapi.json of every configured MCP server answers.
+
+            Servers are probed with exponential backoff, the wait ends early if the mcpo process exits.
+            Per server time to ready is recorded in `server_ready_times`. Returns False on timeout or exit.
+        """
+        start_time = time.monotonic()
+        deadline = start_time + self.timeout
         logging.debug(f"Waiting for mcpo process to be ready. Timeout: {self.timeout}")
 
-        while not self.is_ready():
-            self.finished_event.wait(0.5)
+        if not self.started_event.wait(self.timeout) or self._exited():
+            logging.info("mcpo process did not start.")
+            return False
+
+        base_url = f"http://{self._get_host()}:{self.port}"
+        names = get_mcp_server_names(self.config)
+        urls = {name: f"{base_url}/{name}/openapi.json" for name in names} or {"": f"{base_url}/openapi.json"}
+        pending = [name for name in urls if name not in self.server_ready_times]
+        delay = self.probe_delay
+        logging.debug(f"Probing mcpo service at {base_url} for servers: {pending}")
+
+        with httpx.Client(timeout=httpx.Timeout(2.0, connect=1.0)) as client:
+            while pending:
+                for name in list(pending):
+                    if self._probe(client, urls[name]):
+                        self.server_ready_times[name] = time.monotonic() - start_time
+                        pending.remove(name)
+                        logging.debug(f"MCP server {name} ready after {self.server_ready_times[name]:.3f}s")
+                if not pending:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.info(f"Waiting for mcpo to be ready timed out. Servers not ready: {pending}")
+                    return False
+                # finished_event wakes us up immediately if the mcpo process exits early
+                if self.finished_event.wait(min(delay, remaining)) or self._exited():
+                    logging.info(f"mcpo process exited before servers were ready: {pending}")
+                    return False
+                delay = min(delay * 2, self.max_probe_delay)
+
+        self.time_to_ready = time.monotonic() - start_time
+        logging.info(f"Connection to mcpo service confirmed at {base_url} after {self.time_to_ready:.3f}s")
+        return True
 
-            if time.time() - start_time > self.timeout:
-                logging.info("Waiting for mcpo to be ready timed out.")
-                break
+    @staticmethod
+    def _probe(client: httpx.Client, url: str) -> bool:
+        try:
+            return client.get(url).status_code < 400
+        except httpx.HTTPError:
+            return False
 
-        host = self._get_host()
-        logging.debug(f"Checking for connection to mcpo service at http://{host}:{self.port}/docs")
-        while time.time() - start_time < self.timeout and not self.finished_event.is_set():
-            try:
-                _ = httpx.get(f"http://{host}:{self.port}/docs", timeout=5.0)
-                logging.info(f"Connection to mcpo service confirmed at {host}:{self.port}")
-                break
-            except (httpx.TimeoutException, httpx.ConnectError):
-                self.finished_event.wait(0.5)
+    def _exited(self) -> bool:
+        return self.finished_event.is_set() or (self.process is not None and not self._process_alive())
+
+    def _process_alive(self) -> bool:
+        if isinstance(self.process, subprocess.Popen):
+            return self.process.poll() is None
+        return self.process.is_alive()
+
+    def is_running(self) -> bool:
+        """ True from `start` until the mcpo process exits """
+        return self.process is not None and not self._exited()
 
     def is_ready(self) -> bool:
-        return self.started_event.is_set()
+        """ True once every configured MCP server answered """
+        return self.time_to_ready is not None
 
     def cleanup(self):
         """ Try to eliminate leftover processes """
-        from .service_runner import _kill_process_group
-
-        if isinstance(self.process, MP_CONTEXT.Process):
-            _kill_process_group(process_id=self.process.pid)
+        if isinstance(self.process, (MP_CONTEXT.Process, subprocess.Popen)):
+            _runner()._kill_process_group(process_id=self.process.pid)
 
     def stop(self) -> None:
         self.abort_event.set()
+        if self.launch_mode == THREAD:
+            if self.process is not None:
+                _runner()._kill_process_group(self.process)
+            if self._supervisor is not None:
+                self._supervisor.join(timeout=self.timeout)
+            return
+
         if self.process:
             self.process.join()
 
@@ -6,7 +6,8 @@ import os
 import subprocess
 import sys
 import tempfile
-from typing import Dict, List, Union
+import threading
+from typing import Dict, List, Optional, Tuple, Union
 
 import psutil
 
@@ -30,30 +31,84 @@ def _kill_process_group(process: subprocess.Popen = None, process_id: int = None
         process.wait()
 
 
-def run_mcpo(host: str, port: Union[int, str],
-             config: Dict[str, Union[str, List[str], Dict[str, Union[str, List[str]]]]],
-             started_event: multiprocessing.Event = None, abort_event: multiprocessing.Event = None,
-             finished_event: multiprocessing.Event = None) -> None:
-    if not abort_event:
-        from multiprocessing import Event
-        abort_event = Event()
+def _pipe_config(config: Dict) -> Tuple[str, int]:
+    """ Hand the config to mcpo through an inherited pipe instead of a file, returns the path and child fd """
+    read_fd, write_fd = os.pipe()
+    data = json.dumps(config).encode()
+
+    def write() -> None:
+        # Written from a thread: configs larger than the pipe buffer block until mcpo reads them
+        with os.fdopen(write_fd, "wb") as f:
+            try:
+                f.write(data)
+            except BrokenPipeError:
+                pass
+
+    threading.Thread(target=write, name="MCPOConfigPipe", daemon=True).start()
+    return f"/dev/fd/{read_fd}", read_fd
 
+
+def _write_config_file(config: Dict) -> str:
     with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.json') as temp_file:
         json.dump(config, temp_file)
-        temp_config_path = temp_file.name
+        return temp_file.name
 
-    cmd = ["mcpo", "--host", host, "--port", str(port), "--config", temp_config_path]
-    process = None
 
+def _remove_config_file(path: Optional[str]) -> None:
+    if path is None:
+        return
     try:
-        logging.info(f"Launching MCPO: {' '.join(cmd)}")
+        logging.debug("Cleaning temp file.")
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def popen_mcpo(host: str, port: Union[int, str], config: Dict,
+               **popen_kwargs) -> Tuple[subprocess.Popen, Optional[str]]:
+    """ Launch mcpo in a new process group.
+
+        Where /dev/fd is available the config is passed through a pipe, otherwise through a temp file.
+        Returns the process and the path of the temp file to remove once mcpo exited, if one was written.
+    """
+    if sys.platform != "win32" and os.path.isdir("/dev/fd"):
+        config_path, read_fd = _pipe_config(config)
+        temp_config_path, pass_fds = None, (read_fd,)
+    else:
+        config_path = temp_config_path = _write_config_file(config)
+        read_fd, pass_fds = None, ()
+
+    cmd = ["mcpo", "--host", host, "--port", str(port), "--config", config_path]
+    logging.info(f"Launching MCPO: {' '.join(cmd)}")
 
+    try:
         # On POSIX: preexec_fn sets up a new process group
         if sys.platform != "win32":
-            process = subprocess.Popen(cmd, preexec_fn=os.setsid)
+            process = subprocess.Popen(cmd, preexec_fn=os.setsid, pass_fds=pass_fds, **popen_kwargs)
         else:
             # On Windows: create new process group
-            process = subprocess.Popen(cmd, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+            process = subprocess.Popen(cmd, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP, **popen_kwargs)
+    except Exception:
+        _remove_config_file(temp_config_path)
+        raise
+    finally:
+        if read_fd is not None:
+            os.close(read_fd)
+    return process, temp_config_path
+
+
+def run_mcpo(host: str, port: Union[int, str],
+             config: Dict[str, Union[str, List[str], Dict[str, Union[str, List[str]]]]],
+             started_event: multiprocessing.Event = None, abort_event: multiprocessing.Event = None,
+             finished_event: multiprocessing.Event = None) -> None:
+    if not abort_event:
+        from multiprocessing import Event
+        abort_event = Event()
+
+    process, temp_config_path = None, None
+
+    try:
+        process, temp_config_path = popen_mcpo(host, port, config)
 
         if started_event:
             started_event.set()
@@ -76,11 +131,7 @@ def run_mcpo(host: str, port: Union[int, str],
         except Exception as e:
             logging.error(f"Error terminating processes: {e}")
 
-        try:
-            logging.debug("Cleaning temp file.")
-            os.unlink(temp_config_path)
-        except FileNotFoundError:
-            pass
+        _remove_config_file(temp_config_path)
 
         if finished_event:
             finished_event.set()
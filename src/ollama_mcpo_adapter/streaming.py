@@ -0,0 +1,318 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONItemParser:
+    """ Incremental JSON parser for streamed tool results.
+
+        The items of a top level array are returned as soon as they are complete, so a large listing never
+        has to be held in memory as a whole. Any other JSON value is buffered and returned once it has been
+        received, use `JSONTextDecoder` for large strings such as file contents.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._is_array: Optional[bool] = None
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """ Add a chunk of the response body and return the items completed by it """
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self, truncated: bool = False) -> List[Any]:
+        """ Return the remaining items. Incomplete trailing data raises unless the body was `truncated` """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        try:
+            return self._parse(final=True)
+        except json.JSONDecodeError:
+            if truncated:
+                return []
+            raise
+
+    def _skip(self, characters: str) -> None:
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in characters:
+            self._pos += 1
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        if self._finished:
+            return items
+
+        if self._is_array is None:
+            self._skip(_WHITESPACE)
+            if self._pos == len(self._buffer):
+                return items
+            self._is_array = self._buffer[self._pos] == "["
+            if self._is_array:
+                self._pos += 1
+
+        if not self._is_array:
+            if final:
+                items.append(self._decoder.decode(self._buffer[self._pos:]))
+                self._finished = True
+            return items
+
+        while True:
+            self._skip(_WHITESPACE + ",")
+            if self._pos == len(self._buffer):
+                if final:
+                    raise json.JSONDecodeError("Unterminated array", self._buffer, self._pos)
+                break
+            if self._buffer[self._pos] == "]":
+                self._finished = True
+                break
+
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # wait for more data
+            if end == len(self._buffer) and not final:
+                break  # a number or literal at the end of the buffer might continue in the next chunk
+
+            items.append(item)
+            self._pos = end
+
+        # Drop consumed text
+        if self._pos > DEFAULT_CHUNK_SIZE:
+            self._buffer, self._pos = self._buffer[self._pos:], 0
+        return items
+
+
+def _string_end(text: str) -> Tuple[int, bool]:
+    """ Length of the leading JSON string content of `text` that can be decoded without splitting an escape
+        sequence or a surrogate pair, and whether the closing quote follows it
+    """
+    length, position = len(text), 0
+    quote = text.find('"')
+    while True:
+        escape = text.find("\\", position)
+        if escape < 0 or 0 <= quote < escape:
+            return (quote, True) if quote >= 0 else (length, False)
+        if text[escape + 1:escape + 2] == "u":
+            end = escape + 6
+            if text[escape + 2:escape + 4].upper() in ("D8", "D9", "DA", "DB") and (
+                    escape + 8 > length or text[escape + 6:escape + 8] == "\\u"):
+                end = escape + 12  # keep a high surrogate together with its low surrogate
+        else:
+            end = escape + 2
+        if end > length:
+            return escape, False
+        position = end
+        if 0 <= quote < position:
+            quote = text.find('"', position)
+
+
+class JSONTextDecoder:
+    """ Incremental counterpart of `RawToolResult.text()` for streamed tool results.
+
+        A top level JSON string, eg. the content of a file, is unquoted piece by piece so it never has to be
+        held in memory as a whole. Any other body is passed on as text.
+    """
+
+    def __init__(self) -> None:
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._string_decoder = json.JSONDecoder(strict=False)
+        self._buffer = ""
+        self._is_string: Optional[bool] = None
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> str:
+        """ Add a chunk of the response body and return the text completed by it """
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._decode(final=False)
+
+    def close(self) -> str:
+        """ Return the remaining text, an incomplete escape sequence at the end of a cut off body is dropped """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        return self._decode(final=True)
+
+    def _decode(self, final: bool) -> str:
+        if self._is_string is None:
+            start = len(self._buffer) - len(self._buffer.lstrip(_WHITESPACE))
+            if start == len(self._buffer):
+                return ""
+            self._is_string = self._buffer[start] == '"'
+            if self._is_string:
+                self._buffer = self._buffer[start + 1:]
+
+        if not self._is_string or self._finished:
+            text, self._buffer = ("" if self._finished else self._buffer), ""
+            return text
+
+        end, self._finished = _string_end(self._buffer)
+        content, self._buffer = self._buffer[:end], self._buffer[end:]
+        if self._finished or final:
+            self._buffer = ""
+        return self._string_decoder.decode(f'"{content}"') if content else ""
+
+
+class _StreamState:
+    def __init__(self, response: httpx.Response, max_bytes: Optional[int],
+                 on_close: Optional[Callable[[], None]]) -> None:
+        self.response = response
+        self.max_bytes = max_bytes
+        self.bytes_received = 0
+        self.truncated = False
+        self._on_close = on_close
+
+    def _closed(self) -> None:
+        """ Run the `on_close` callback once """
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close()
+
+    def limit(self, chunk: bytes) -> bytes:
+        """ Count the chunk and cut it at `max_bytes` """
+        if self.max_bytes is not None and self.bytes_received + len(chunk) >= self.max_bytes:
+            remaining = self.max_bytes - self.bytes_received
+            self.truncated = len(chunk) > remaining
+            chunk = chunk[:remaining]
+        self.bytes_received += len(chunk)
+        return chunk
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_bytes is not None and self.bytes_received >= self.max_bytes
+
+
+class ToolResultStream(_StreamState):
+    """ Iterator over the raw body chunks of a streamed tool call response.
+
+        At most `max_bytes` are read, `truncated` tells if the response was cut off. Use it as context
+        manager or iterate to the end to release the connection, `on_close` is called once it is closed.
+    """
+
+    def __init__(self, response: httpx.Response, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_bytes: Optional[int] = None, on_close: Optional[Callable[[], None]] = None) -> None:
+        super().__init__(response, max_bytes, on_close)
+        self._chunks = response.iter_bytes(chunk_size)
+
+    def __enter__(self) -> 'ToolResultStream':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        if self.exhausted and not self.truncated and not self.response.is_closed:
+            # The limit ended on a chunk boundary, peek at the next chunk to tell if the body goes on
+            self.truncated = any(self._chunks)
+        if self.exhausted or self.response.is_closed:
+            self.close()
+            raise StopIteration
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.close()
+            raise
+        return self.limit(chunk)
+
+    def iter_json(self) -> Iterator[Any]:
+        """ Incrementally parse the body, yielding the items of a top level array one by one """
+        parser = JSONItemParser()
+        for chunk in self:
+            yield from parser.feed(chunk)
+        yield from parser.close(truncated=self.truncated)
+
+    def iter_text(self) -> Iterator[str]:
+        """ Incrementally decode the body as tool message text, a top level JSON string is unquoted """
+        decoder = JSONTextDecoder()
+        for chunk in self:
+            text = decoder.feed(chunk)
+            if text:
+                yield text
+        text = decoder.close()
+        if text:
+            yield text
+
+    def read(self) -> bytes:
+        return b"".join(self)
+
+    def close(self) -> None:
+        self.response.close()
+        self._closed()
+
+
+class AsyncToolResultStream(_StreamState):
+    """ Async iterator over the raw body chunks of a streamed tool call response.
+
+        At most `max_bytes` are read, `truncated` tells if the response was cut off. Use it as async
+        context manager or iterate to the end to release the connection, `on_close` is called once it is closed.
+    """
+
+    def __init__(self, response: httpx.Response, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_bytes: Optional[int] = None, on_close: Optional[Callable[[], None]] = None) -> None:
+        super().__init__(response, max_bytes, on_close)
+        self._chunks = response.aiter_bytes(chunk_size)
+
+    async def __aenter__(self) -> 'AsyncToolResultStream':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self.exhausted and not self.truncated and not self.response.is_closed:
+            # The limit ended on a chunk boundary, peek at the next chunk to tell if the body goes on
+            self.truncated = await self._has_more()
+        if self.exhausted or self.response.is_closed:
+            await self.aclose()
+            raise StopAsyncIteration
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            await self.aclose()
+            raise
+        return self.limit(chunk)
+
+    async def _has_more(self) -> bool:
+        async for chunk in self._chunks:
+            if chunk:
+                return True
+        return False
+
+    async def aiter_json(self) -> AsyncIterator[Any]:
+        """ Incrementally parse the body, yielding the items of a top level array one by one """
+        parser = JSONItemParser()
+        async for chunk in self:
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close(truncated=self.truncated):
+            yield item
+
+    async def aiter_text(self) -> AsyncIterator[str]:
+        """ Incrementally decode the body as tool message text, a top level JSON string is unquoted """
+        decoder = JSONTextDecoder()
+        async for chunk in self:
+            text = decoder.feed(chunk)
+            if text:
+                yield text
+        text = decoder.close()
+        if text:
+            yield text
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self])
+
+    async def aclose(self) -> None:
+        await self.response.aclose()
+        self._closed()
@@ -0,0 +1,108 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, Tuple
+
+Embedder = Callable[[Sequence[str]], Sequence[Sequence[float]]]
+
+_WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+_STOP_WORDS = frozenset("a an and are as at be by for from in into is it of on or the this to with".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """ Lower case words of a text, snake_case, kebab-case and camelCase identifiers are split into words """
+    return [word for word in (w.lower() for w in _WORD_PATTERN.findall(text)) if word not in _STOP_WORDS]
+
+
+def tool_text(tool: Dict[str, Any]) -> Tuple[str, str]:
+    """ Name and descriptive text (description, parameter names and descriptions) of an Ollama tool """
+    function = tool.get("function", {})
+    parts = [function.get("description") or ""]
+    for name, prop in function.get("parameters", {}).get("properties", {}).items():
+        parts.append(name)
+        if isinstance(prop, dict):
+            parts.append(prop.get("description") or "")
+    return function.get("name", ""), " ".join(parts)
+
+
+class ToolSelector:
+    """ Picks the tools relevant for a user message from a large tool catalog.
+
+        Tools are ranked by BM25 over their name, description and parameters. The index stores the
+        precomputed BM25 weight of every term/tool pair, so a query only sums the postings of its terms.
+        An optional `embedder` adds cosine similarity of embeddings, weighted by `alpha`.
+    """
+
+    def __init__(self, tools: Sequence[Dict[str, Any]], k1: float = 1.2, b: float = 0.75, name_weight: int = 3,
+                 embedder: Optional[Embedder] = None, alpha: float = 0.5) -> None:
+        """
+        :param tools: Ollama tool definitions, eg. `adapter.ollama_tools`
+        :param k1: BM25 term frequency saturation
+        :param b: BM25 document length normalization
+        :param name_weight: how many times the words of the tool name are counted
+        :param embedder: maps a list of texts to embedding vectors, eg. an Ollama embedding model
+        :param alpha: share of the embedding similarity in the score, 0 to 1
+        """
+        self.tools = list(tools)
+        self.names = [tool.get("function", {}).get("name", "") for tool in self.tools]
+        self._by_name = dict(zip(self.names, self.tools))
+        self.embedder = embedder
+        self.alpha = alpha
+
+        documents = []
+        for tool in self.tools:
+            name, text = tool_text(tool)
+            documents.append(Counter(tokenize(name) * name_weight + tokenize(text)))
+
+        lengths = [sum(document.values()) for document in documents]
+        average_length = sum(lengths) / len(lengths) if lengths else 0.0
+        document_frequency = Counter(term for document in documents for term in document)
+
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for index, document in enumerate(documents):
+            norm = k1 * (1 - b + b * lengths[index] / average_length) if average_length else k1
+            for term, frequency in document.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+                weight = idf * frequency * (k1 + 1) / (frequency + norm)
+                self._postings.setdefault(term, []).append((index, weight))
+
+        self._vectors: List[List[float]] = []
+        if embedder is not None and self.tools:
+            texts = [" ".join(tool_text(tool)) for tool in self.tools]
+            self._vectors = [self._normalize(vector) for vector in embedder(texts)]
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """ Score of every tool index that matches the query """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for index, weight in self._postings.get(term, ()):
+                scores[index] = scores.get(index, 0.0) + weight
+
+        if self._vectors:
+            top = max(scores.values(), default=0.0) or 1.0
+            query_vector = self._normalize(self.embedder([query])[0])
+            for index, vector in enumerate(self._vectors):
+                similarity = sum(q * v for q, v in zip(query_vector, vector))
+                scores[index] = (1 - self.alpha) * scores.get(index, 0.0) / top + self.alpha * similarity
+        return scores
+
+    def rank(self, query: str, k: int = 8) -> List[Tuple[str, float]]:
+        """ Names and scores of the `k` best matching tools """
+        best = heapq.nlargest(k, self.scores(query).items(), key=lambda item: item[1])
+        return [(self.names[index], score) for index, score in best if score > 0]
+
+    def select(self, query: str, k: int = 8, always: Collection[str] = ()) -> List[Dict[str, Any]]:
+        """ Tool definitions of the `k` best matching tools, plus the tools named in `always` """
+        selected = [name for name, _ in self.rank(query, k)]
+        selected += [name for name in self.names if name in always and name not in selected]
+        return [self._by_name[name] for name in selected]
@@ -0,0 +1,403 @@
+import json
+import logging
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .registry import ToolRecord
+from .schema import SchemaNormalizer
+
+# Error class recorded for tool calls rejected before dispatch
+VALIDATION_ERROR = "ValidationError"
+
+# check(value, path, errors) -> value, coerced if necessary. Problems are appended to errors.
+Check = Callable[[Any, str, List[Dict[str, str]]], Any]
+
+_INVALID = object()
+
+
+def _accept(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+    return value
+
+
+def _error(errors: List[Dict[str, str]], path: str, message: str) -> None:
+    errors.append({"argument": path, "message": message})
+
+
+def _child(path: str, name: str) -> str:
+    return f"{path}.{name}" if path else name
+
+
+def _describe(value: Any) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+
+def _to_integer(value: Any) -> Any:
+    if isinstance(value, str):
+        value = _to_number(value)
+        if isinstance(value, int):
+            return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return _INVALID
+
+
+def _to_number(value: Any) -> Any:
+    if isinstance(value, str):
+        for convert in (int, float):
+            try:
+                number = convert(value.strip())
+            except ValueError:
+                continue
+            return number if math.isfinite(number) else _INVALID
+    return _INVALID
+
+
+def _to_boolean(value: Any) -> Any:
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    if isinstance(value, int) and not isinstance(value, bool) and value in (0, 1):
+        return bool(value)
+    return _INVALID
+
+
+def _json_decoder(expected: type) -> Callable[[Any], Any]:
+    """ Models regularly send nested objects and arrays as JSON encoded strings """
+    def decode(value: Any) -> Any:
+        if isinstance(value, tuple) and expected is list:
+            return list(value)
+        if isinstance(value, str) and value.lstrip()[:1] in ("{", "["):
+            try:
+                decoded = json.loads(value)
+            except json.JSONDecodeError:
+                return _INVALID
+            return decoded if isinstance(decoded, expected) else _INVALID
+        return _INVALID
+    return decode
+
+
+# JSON schema type: (instance check, coercion of other values or None)
+TYPES: Dict[str, Tuple[Callable[[Any], bool], Optional[Callable[[Any], Any]]]] = {
+    "string": (lambda v: isinstance(v, str), None),
+    "integer": (lambda v: isinstance(v, int) and not isinstance(v, bool), _to_integer),
+    "number": (lambda v: isinstance(v, (int, float)) and not isinstance(v, bool), _to_number),
+    "boolean": (lambda v: isinstance(v, bool), _to_boolean),
+    "array": (lambda v: isinstance(v, list), _json_decoder(list)),
+    "object": (lambda v: isinstance(v, dict), _json_decoder(dict)),
+    "null": (lambda v: v is None, None),
+}
+
+
+def _type_check(types: List[str], coerce: bool) -> Optional[Check]:
+    known = [TYPES[name] for name in types if name in TYPES]
+    if len(known) < len(types) or not known:
+        return None  # unknown type names are not checked
+    expected = " or ".join(types)
+
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        for is_instance, _ in known:
+            if is_instance(value):
+                return value
+        if coerce:
+            for _, convert in known:
+                converted = convert(value) if convert is not None else _INVALID
+                if converted is not _INVALID:
+                    return converted
+        _error(errors, path, f"expected {expected}, got {_describe(value)}")
+        return value
+    return check
+
+
+def _enum_check(allowed: List[Any]) -> Check:
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        if value not in allowed or (isinstance(value, bool) and not any(v is value for v in allowed)):
+            _error(errors, path, f"must be one of {_describe(allowed)}, got {_describe(value)}")
+        return value
+    return check
+
+
+def _compile_pattern(pattern: str) -> Optional[re.Pattern]:
+    """ JSON schema patterns are ECMA 262 regular expressions, patterns Python can not compile are not checked """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        logging.warning(f"Not checking the unsupported schema pattern {pattern!r}: {e}")
+        return None
+
+
+def _string_check(schema: Dict[str, Any]) -> Optional[Check]:
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    pattern = _compile_pattern(schema["pattern"]) if isinstance(schema.get("pattern"), str) else None
+    if min_length is None and max_length is None and pattern is None:
+        return None
+
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        if not isinstance(value, str):
+            return value
+        if min_length is not None and len(value) < min_length:
+            _error(errors, path, f"must have at least {min_length} characters")
+        elif max_length is not None and len(value) > max_length:
+            _error(errors, path, f"must have at most {max_length} characters")
+        elif pattern is not None and pattern.search(value) is None:
+            _error(errors, path, f"must match the pattern {pattern.pattern}")
+        return value
+    return check
+
+
+def _number_check(schema: Dict[str, Any]) -> Optional[Check]:
+    bounds = [(schema[key], key) for key in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum")
+              if isinstance(schema.get(key), (int, float)) and not isinstance(schema[key], bool)]
+    if not bounds:
+        return None
+    violated = {"minimum": lambda v, limit: v < limit, "maximum": lambda v, limit: v > limit,
+                "exclusiveMinimum": lambda v, limit: v <= limit, "exclusiveMaximum": lambda v, limit: v >= limit}
+    words = {"minimum": "at least", "maximum": "at most", "exclusiveMinimum": "greater than",
+             "exclusiveMaximum": "less than"}
+
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return value
+        for limit, key in bounds:
+            if violated[key](value, limit):
+                _error(errors, path, f"must be {words[key]} {limit}")
+                break
+        return value
+    return check
+
+
+def _array_check(schema: Dict[str, Any], coerce: bool) -> Optional[Check]:
+    items: Optional[Check] = _compile(schema.get("items"), coerce)
+    items = None if items is _accept else items
+    min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+    if items is None and min_items is None and max_items is None:
+        return None
+
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        if not isinstance(value, list):
+            return value
+        if min_items is not None and len(value) < min_items:
+            _error(errors, path, f"must have at least {min_items} items")
+        if max_items is not None and len(value) > max_items:
+            _error(errors, path, f"must have at most {max_items} items")
+        if items is None:
+            return value
+
+        result = value
+        for index, item in enumerate(value):
+            checked = items(item, f"{path}[{index}]", errors)
+            if checked is not item:
+                if result is value:
+                    result = list(value)
+                result[index] = checked
+        return result
+    return check
+
+
+def _object_check(schema: Dict[str, Any], coerce: bool) -> Optional[Check]:
+    properties = {name: _compile(definition, coerce)
+                  for name, definition in (schema.get("properties") or {}).items()}
+    required = tuple(schema.get("required") or ())
+    additional = schema.get("additionalProperties")
+    additional_check = _compile(additional, coerce) if isinstance(additional, dict) else None
+    if not properties and not required and additional is None:
+        return None
+
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        if not isinstance(value, dict):
+            return value
+        for name in required:
+            if name not in value:
+                _error(errors, _child(path, name), "is required")
+
+        result = value
+        for name, item in value.items():
+            item_check = properties.get(name)
+            if item_check is None:
+                if additional is False:
+                    _error(errors, _child(path, name), f"is not an argument, expected {', '.join(properties)}")
+                    continue
+                item_check = additional_check
+                if item_check is None:
+                    continue
+            elif item is None and name not in required:
+                # Optional arguments are nullable, the normalized schema dropped the null alternative
+                continue
+
+            checked = item_check(item, _child(path, name), errors)
+            if checked is not item:
+                if result is value:
+                    result = dict(value)
+                result[name] = checked
+        return result
+    return check
+
+
+def _any_of_check(members: List[Any], coerce: bool) -> Check:
+    # Exact matches win over matches after coercion, eg. "5" stays a string for integer or string
+    exact = [_compile(member, False) for member in members]
+    coercing = [_compile(member, True) for member in members] if coerce else []
+
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        for member in exact + coercing:
+            scratch: List[Dict[str, str]] = []
+            checked = member(value, path, scratch)
+            if not scratch:
+                return checked
+        _error(errors, path, f"does not match any allowed schema, got {_describe(value)}")
+        return value
+    return check
+
+
+def _compile(schema: Any, coerce: bool) -> Check:
+    """ Compile a normalized JSON schema into one check function, keywords without effect cost nothing """
+    if not isinstance(schema, dict) or not schema:
+        return _accept
+
+    checks: List[Optional[Check]] = []
+    types = schema.get("type")
+    if types is not None:
+        checks.append(_type_check(types if isinstance(types, list) else [types], coerce))
+    if isinstance(schema.get("enum"), list):
+        checks.append(_enum_check(schema["enum"]))
+    if "const" in schema:
+        checks.append(_enum_check([schema["const"]]))
+    checks.append(_string_check(schema))
+    checks.append(_number_check(schema))
+    checks.append(_array_check(schema, coerce))
+    checks.append(_object_check(schema, coerce))
+    for keyword in ("anyOf", "oneOf"):
+        if isinstance(schema.get(keyword), list) and schema[keyword]:
+            checks.append(_any_of_check(schema[keyword], coerce))
+
+    compiled = [c for c in checks if c is not None]
+    if not compiled:
+        return _accept
+    if len(compiled) == 1:
+        check = compiled[0]
+    else:
+        def check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+            count = len(errors)
+            for keyword_check in compiled:
+                value = keyword_check(value, path, errors)
+                if len(errors) > count:
+                    break  # later keywords would only report follow-up errors
+            return value
+    return _nullable(check) if schema.get("nullable") is True else check
+
+
+def _nullable(check: Check) -> Check:
+    """ Accept null for a schema collapsed from `anyOf: [X, {"type": "null"}]` by the normalizer """
+    def nullable_check(value: Any, path: str, errors: List[Dict[str, str]]) -> Any:
+        return value if value is None else check(value, path, errors)
+    return nullable_check
+
+
+def _inline_refs(schema: Any) -> Any:
+    """ Resolve the local `$ref`s of a schema, eg. the `$defs` added by `SchemaCompactor(dedupe=True)` """
+    if isinstance(schema, dict) and ("$defs" in schema or "definitions" in schema):
+        return SchemaNormalizer(schema).normalize(schema)
+    return schema
+
+
+class ArgumentError(ValueError):
+    """ The arguments of a tool call do not match the parameters schema of the tool """
+
+    def __init__(self, tool_name: str, errors: List[Dict[str, str]]) -> None:
+        self.tool_name = tool_name
+        self.errors = errors
+        problems = "; ".join(f"{e['argument']} {e['message']}" if e["argument"] else e["message"] for e in errors)
+        super().__init__(f"Invalid arguments for tool '{tool_name}': {problems}")
+
+    def result(self) -> Dict[str, Any]:
+        """ Tool result telling the model which arguments to fix """
+        return {"error": str(self), "invalid_arguments": self.errors}
+
+
+class SchemaValidator:
+    """ Validator compiled from one tool parameters schema """
+    __slots__ = ("schema", "_check")
+
+    def __init__(self, schema: Dict[str, Any], coerce: bool = True) -> None:
+        self.schema = schema
+        self._check = _compile(_inline_refs(schema), coerce)
+
+    def validate(self, arguments: Any) -> Tuple[Any, List[Dict[str, str]]]:
+        """ The arguments, coerced where necessary, and the problems found. The input is never modified. """
+        errors: List[Dict[str, str]] = []
+        if not isinstance(arguments, dict):
+            _error(errors, "", f"arguments must be an object, got {_describe(arguments)}")
+            return arguments, errors
+        return self._check(arguments, "", errors), errors
+
+
+class ArgumentValidator:
+    """ Checks tool call arguments against the parameters schema of the tool before they are dispatched.
+
+        Validators are compiled when the adapter registers tools and shared by tools with the same schema
+        (`ToolRecord.schema_key`). With `coerce` values the model sent as the wrong type are converted where
+        the intent is unambiguous: numeric and boolean strings, whole floats for integers and JSON encoded
+        objects or arrays. Invalid calls are answered with `ArgumentError.result()` without a request.
+
+        Optional arguments may be null, as the normalized schemas drop the null alternative of Optional
+        parameters. Required arguments may be null if their schema is marked `nullable`. `anyOf`/`oneOf`
+        accept the first matching member. References to `$defs` of compacted schemas are resolved when the
+        validator is compiled.
+    """
+
+    def __init__(self, coerce: bool = True) -> None:
+        """
+        :param coerce: convert arguments of the wrong type where possible instead of rejecting them
+        """
+        self.coerce = coerce
+
+        self.validated = 0
+        self.coerced = 0
+        self.rejected = 0
+
+        self._validators: Dict[str, SchemaValidator] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, tools: Iterable[ToolRecord]) -> None:
+        """ Compile the validators of `tools`, validators of schemas no longer in use are dropped """
+        with self._lock:
+            current = self._validators
+        validators: Dict[str, SchemaValidator] = {}
+        for record in tools:
+            key = record.schema_key
+            if key not in validators:
+                validators[key] = current.get(key) or SchemaValidator(record.parameters, self.coerce)
+        with self._lock:
+            self._validators = validators
+
+    def validator(self, record: ToolRecord) -> SchemaValidator:
+        validator = self._validators.get(record.schema_key)
+        if validator is None:
+            # A tool registered without compile(), eg. by a subclass of the adapter
+            validator = SchemaValidator(record.parameters, self.coerce)
+            with self._lock:
+                validator = self._validators.setdefault(record.schema_key, validator)
+        return validator
+
+    def validate(self, record: ToolRecord, arguments: Any) -> Any:
+        """ The arguments of a call of `record`, coerced where necessary
+
+            :raises ArgumentError: if the arguments do not match the parameters schema
+        """
+        checked, errors = self.validator(record).validate(arguments)
+        with self._lock:
+            self.validated += 1
+            if errors:
+                self.rejected += 1
+            elif checked is not arguments:
+                self.coerced += 1
+        if errors:
+            raise ArgumentError(record.name, errors)
+        return checked
+
+    def stats(self) -> Dict[str, int]:
+        """ Compiled validators and validated, coerced and rejected calls """
+        with self._lock:
+            return {"validators": len(self._validators), "validated": self.validated, "coerced": self.coerced,
+                    "rejected": self.rejected}
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import psutil
+
+from .config_parser import parse_to_config
+from .service import MCPOService, THREAD
+
+
+def config_key(config: Optional[Dict] = None, config_path: Optional[Union[str, Path]] = None) -> str:
+    """ Stable hash of the parsed MCP config, equal configs share warm instances """
+    parsed = parse_to_config(config, config_path)
+    return hashlib.sha256(json.dumps(parsed, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def process_tree_rss(pid: int) -> int:
+    """ Resident memory of a process and all of its children in bytes """
+    try:
+        parent = psutil.Process(pid)
+        processes = [parent] + parent.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return 0
+
+    rss = 0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return rss
+
+
+class WarmInstance:
+    """ One MCPO instance of the warm pool """
+
+    def __init__(self, key: str, service: MCPOService) -> None:
+        self.key = key
+        self.service = service
+        self.in_use = False
+        self.last_used = time.monotonic()
+        self.ready = threading.Event()
+
+    @property
+    def port(self) -> int:
+        return int(self.service.port)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.service.host}:{self.service.port}"
+
+    def memory(self) -> int:
+        return process_tree_rss(self.service.process.pid) if self.service.process is not None else 0
+
+    def __repr__(self) -> str:
+        return f"WarmInstance({self.base_url}, in_use={self.in_use}, ready={self.ready.is_set()})"
+
+
+class MCPOWarmPool:
+    """ Keeps pre-started MCPO instances warm for known configs so a config switch does not pay a cold start.
+
+        Instances are keyed by `config_key`. `acquire` hands out an idle instance of the config, or cold
+        starts one, `release` returns it. Idle instances are stopped after `ttl` seconds and, least
+        recently used first, while the memory of all instances exceeds `memory_budget` bytes.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", ports: Iterable[int] = range(5100, 5200), ttl: float = 600.0,
+                 memory_budget: Optional[int] = None, reap_interval: Optional[float] = 5.0,
+                 timeout: float = 30.0, launch_mode: str = THREAD) -> None:
+        """
+        :param host: host the instances bind to
+        :param ports: ports available to the instances, this limits the number of instances
+        :param ttl: seconds an idle instance is kept
+        :param memory_budget: bytes of resident memory all instances may use, None for no limit
+        :param reap_interval: seconds between reaper runs, None to only reap on `reap()` calls
+        :param timeout: seconds to wait for an instance to become ready
+        :param launch_mode: how instances launch mcpo, see MCPOService
+        """
+        self.host = host
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self.timeout = timeout
+        self.launch_mode = launch_mode
+
+        self._free_ports = list(ports)
+        self._instances: List[WarmInstance] = []
+        self._standby: Dict[str, int] = {}
+        self._configs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        if reap_interval is not None:
+            self._reaper = threading.Thread(target=self._reap_loop, args=(reap_interval,),
+                                            name="MCPOWarmPoolReaper", daemon=True)
+            self._reaper.start()
+
+    @property
+    def instances(self) -> List[WarmInstance]:
+        with self._lock:
+            return list(self._instances)
+
+    def prewarm(self, config: Optional[Dict] = None, config_path: Optional[Union[str, Path]] = None,
+                count: int = 1, wait: bool = False) -> str:
+        """ Keep `count` idle instances of the config warm, also after some of them were handed out.
+            Returns the config key.
+        """
+        key = self._register(config, config_path)
+        with self._lock:
+            self._standby[key] = count
+        started = self._replenish(key)
+        if wait:
+            for instance in started:
+                instance.ready.wait(self.timeout)
+        return key
+
+    def acquire(self, config: Optional[Dict] = None, config_path: Optional[Union[str, Path]] = None) -> MCPOService:
+        """ Hand out a ready MCPO service for the config, warm if possible """
+        key = self._register(config, config_path)
+
+        with self._lock:
+            idle = [i for i in self._instances if i.key == key and not i.in_use]
+            # Prefer ready instances over ones that are still starting
+            idle.sort(key=lambda i: not i.ready.is_set())
+            instance = idle[0] if idle else None
+            if instance is not None:
+                instance.in_use = True
+
+        if instance is None:
+            logging.info(f"No warm MCPO instance for config {key[:12]}, cold starting")
+            instance = self._launch(key, in_use=True)
+
+        instance.ready.wait(self.timeout)
+        if not instance.service.is_ready():
+            self._discard(instance)
+            raise RuntimeError(f"MCPO instance at {instance.base_url} did not become ready")
+
+        self._replenish(key)
+        return instance.service
+
+    def release(self, service: MCPOService) -> None:
+        """ Return a service handed out by `acquire` to the pool """
+        with self._lock:
+            for instance in self._instances:
+                if instance.service is service:
+                    instance.in_use = False
+                    instance.last_used = time.monotonic()
+                    return
+        raise ValueError(f"MCPO service at {service.host}:{service.port} does not belong to this pool")
+
+    def reap(self) -> List[WarmInstance]:
+        """ Stop idle instances that exceeded the ttl or the memory budget, returns the stopped instances """
+        now = time.monotonic()
+        with self._lock:
+            # Expired instances leave the pool before the lock is released so `acquire` can not hand them out
+            idle = [i for i in self._instances if not i.in_use and i.ready.is_set()]
+            expired = [i for i in idle if now - i.last_used > self.ttl or not i.service.is_running()]
+            self._remove(expired)
+
+        if self.memory_budget is not None:
+            remaining = sorted((i for i in idle if i not in expired), key=lambda i: i.last_used)
+            used = sum(instance.memory() for instance in self.instances)
+            over_budget = []
+            while used > self.memory_budget and remaining:
+                instance = remaining.pop(0)
+                used -= instance.memory()
+                over_budget.append(instance)
+            with self._lock:
+                # Skip instances acquired while the memory was measured
+                over_budget = [i for i in over_budget if not i.in_use and i in self._instances]
+                self._remove(over_budget)
+            expired.extend(over_budget)
+
+        for instance in expired:
+            logging.info(f"Reaping idle MCPO instance at {instance.base_url}")
+            self._stop(instance)
+        return expired
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """ Number of idle and used instances per config key """
+        stats: Dict[str, Dict[str, int]] = {}
+        for instance in self.instances:
+            standby = self._standby.get(instance.key, 0)
+            entry = stats.setdefault(instance.key, {"idle": 0, "in_use": 0, "standby": standby})
+            entry["in_use" if instance.in_use else "idle"] += 1
+        return stats
+
+    def _register(self, config: Optional[Dict], config_path: Optional[Union[str, Path]]) -> str:
+        key = config_key(config, config_path)
+        with self._lock:
+            if key not in self._configs:
+                self._configs[key] = parse_to_config(config, config_path)
+        return key
+
+    def _replenish(self, key: str) -> List[WarmInstance]:
+        """ Start instances up to the standby count of the config, as many as there are free ports """
+        with self._lock:
+            idle = sum(1 for i in self._instances if i.key == key and not i.in_use)
+            missing = max(self._standby.get(key, 0) - idle, 0)
+
+        started = []
+        for _ in range(missing):
+            try:
+                started.append(self._launch(key))
+            except RuntimeError as e:
+                logging.warning(f"Could not replenish the standby of config {key[:12]}: {e}")
+                break
+        return started
+
+    def _launch(self, key: str, in_use: bool = False) -> WarmInstance:
+        with self._lock:
+            if not self._free_ports:
+                raise RuntimeError("No free port left for another MCPO instance")
+            port = self._free_ports.pop(0)
+            service = MCPOService(self.host, port, config=self._configs[key], timeout=self.timeout,
+                                  launch_mode=self.launch_mode)
+            instance = WarmInstance(key, service)
+            instance.in_use = in_use
+            self._instances.append(instance)
+
+        def start() -> None:
+            try:
+                service.start(wait=True)
+            except Exception as e:
+                logging.error(f"Could not start MCPO instance on port {port}: {e}")
+            finally:
+                instance.ready.set()
+
+        threading.Thread(target=start, name=f"MCPOWarmPool-{port}", daemon=True).start()
+        return instance
+
+    def _discard(self, instance: WarmInstance) -> None:
+        with self._lock:
+            if instance not in self._instances:
+                return
+            self._instances.remove(instance)
+        self._stop(instance)
+
+    def _remove(self, instances: List[WarmInstance]) -> None:
+        """ Take instances out of the pool, the caller holds the lock and stops them afterwards """
+        for instance in instances:
+            self._instances.remove(instance)
+
+    def _stop(self, instance: WarmInstance) -> None:
+        try:
+            instance.service.stop()
+            instance.service.cleanup()
+        except Exception as e:
+            logging.error(f"Error stopping MCPO instance at {instance.base_url}: {e}")
+        with self._lock:
+            self._free_ports.append(instance.port)
+
+    def _reap_loop(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logging.error(f"MCPO warm pool reaper error: {e}")
+
+    def close(self) -> None:
+        """ Stop the reaper and every instance, including the ones in use """
+        self._stop_event.set()
+        if self._reaper is not None:
+            self._reaper.join()
+        for instance in self.instances:
+            instance.ready.wait(self.timeout)
+            self._discard(instance)
+
+    def __enter__(self) -> 'MCPOWarmPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
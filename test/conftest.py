@@ -1,4 +1,5 @@
 import logging
+import shutil
 import sys
 from pathlib import Path
 
@@ -53,3 +54,16 @@ def ollama_running():
             pytest.skip("ollama is not reachable at http://localhost:11434")
     except httpx.ConnectError:
         pytest.skip("ollama is not running or reachable")
+
+
+@pytest.fixture
+def stub_config() -> dict:
+    """ MCP config of a dependency free stub MCP server with `echo` and `add` tools """
+    server = test_data_path.joinpath('stub', 'stub_mcp_server.py')
+    return {"mcpServers": {"stub": {"command": sys.executable, "args": [server.as_posix()]}}}
+
+
+@pytest.fixture
+def mcpo_available():
+    if shutil.which("mcpo") is None:
+        pytest.skip("mcpo is not installed")
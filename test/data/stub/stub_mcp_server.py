@@ -0,0 +1,77 @@
+""" Minimal MCP server speaking JSON-RPC over stdio, without any dependencies.
+
+    Serves `echo` and `add` tools. Used to test MCPO services locally without npx/uvx downloads.
+    python stub_mcp_server.py [--tools N] [--delay SECONDS]
+"""
+import argparse
+import json
+import sys
+import time
+
+
+def _tools(count: int) -> list:
+    tools = [
+        {"name": "echo", "description": "Echo the given text",
+         "inputSchema": {"type": "object", "properties": {"text": {"type": "string", "description": "Text to echo"}},
+                         "required": ["text"]},
+         "annotations": {"readOnlyHint": True}},
+        {"name": "add", "description": "Add two numbers",
+         "inputSchema": {"type": "object", "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
+                         "required": ["a", "b"]}},
+    ]
+    for i in range(count):
+        tools.append({"name": f"tool_{i}", "description": f"Synthetic tool number {i}",
+                      "inputSchema": {"type": "object",
+                                      "properties": {"value": {"type": "string", "description": "Any value"},
+                                                     "count": {"type": "integer"}},
+                                      "required": ["value"]}})
+    return tools
+
+
+def _call(name: str, arguments: dict) -> str:
+    if name == "add":
+        return str(arguments["a"] + arguments["b"])
+    if name == "echo":
+        return arguments["text"]
+    return json.dumps({"tool": name, "arguments": arguments})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tools", type=int, default=0, help="Number of additional synthetic tools")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds each tool call takes")
+    args = parser.parse_args()
+    tools = _tools(args.tools)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        method, message_id = message.get("method"), message.get("id")
+        if message_id is None:
+            continue  # notification
+
+        if method == "initialize":
+            result = {"protocolVersion": message["params"].get("protocolVersion", "2025-03-26"),
+                      "capabilities": {"tools": {"listChanged": False}},
+                      "serverInfo": {"name": "stub", "version": "1.0.0"}}
+        elif method == "tools/list":
+            result = {"tools": tools}
+        elif method == "tools/call":
+            time.sleep(args.delay)
+            text = _call(message["params"]["name"], message["params"].get("arguments") or {})
+            result = {"content": [{"type": "text", "text": text}], "isError": False}
+        elif method == "ping":
+            result = {}
+        else:
+            response = {"jsonrpc": "2.0", "id": message_id, "error": {"code": -32601, "message": "Method not found"}}
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+            continue
+
+        sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": message_id, "result": result}) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 import json
 import logging
+import threading
+import time
 import unittest.mock
+from collections import Counter
 
+import httpx
+import pytest
 from ollama import Client
 
 from ollama_mcpo_adapter import OllamaMCPOAdapter, MCPOService
 from ollama_mcpo_adapter.config_parser import parse_to_config
+from ollama_mcpo_adapter.scheduler import ToolCallScheduler
 
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
@@ -39,7 +45,7 @@ def test_ollama_adapter_with_openapi_spec(input_path, ):
     mock_response.status_code = 200
     mock_response.json.return_value = openapi_spec
 
-    with unittest.mock.patch('ollama_mcpo_adapter.adapter.httpx.get', return_value=mock_response):
+    with unittest.mock.patch('ollama_mcpo_adapter.adapter.httpx.Client.get', return_value=mock_response):
         # Create adapter instance pointing to non-existent server (we're mocking the response)
         adapter = OllamaMCPOAdapter("localhost", 5090, config=mock_mcp_config)
 
@@ -68,12 +74,151 @@ def test_ollama_adapter_with_openapi_spec(input_path, ):
                 openapi_schema = adapter._resolve_ref(
                     openapi_path['requestBody']['content']['application/json']['schema']['$ref'], openapi_schemas)
                 ollama_tool_params = ollama_tool_function.get("parameters", {})
-                assert ollama_tool_params['properties'] == openapi_schema['properties']
+                # Titles and empty descriptions are dropped without modifying the spec
+                assert ollama_tool_params['properties'] == {
+                    name: {k: v for k, v in definition.items() if k != "title" and (k != "description" or v)}
+                    for name, definition in openapi_schema['properties'].items()}
+                assert all("title" in definition for definition in openapi_schema['properties'].values())
                 assert ollama_tool_params['required'] == openapi_schema['required']
 
     print("Successfully parsed OpenAPI spec and verified Ollama tool structure")
 
 
+def test_ollama_adapter_shared_client(input_path):
+    """ Discovery and dispatch must go through the same pooled client """
+    seen_paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_paths.append(request.url.path)
+        if request.url.path == "/filesystem/openapi.json":
+            return httpx.Response(200, content=input_path.joinpath('filesystem_openapi.json').read_bytes())
+        return httpx.Response(200, json={"path": json.loads(request.content)["path"]})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    config = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+
+    with OllamaMCPOAdapter("localhost", 5090, config=config, client=client) as adapter:
+        adapter.list_tools_ollama()
+        result = adapter.call_tool({"function": {"name": "filesystem_read_file", "arguments": {"path": "a.txt"}}})
+
+    assert result == {"path": "a.txt"}
+    assert seen_paths == ["/filesystem/openapi.json", "/filesystem/read_file"]
+    # An externally provided client is left open for its owner
+    assert not client.is_closed
+    client.close()
+
+
+def test_ollama_adapter_client_lifecycle():
+    adapter = OllamaMCPOAdapter("localhost", 5090, limits=httpx.Limits(max_connections=4), timeout=2.0)
+    client = adapter.client
+    assert adapter.client is client
+
+    adapter.close()
+    assert client.is_closed
+
+    # A fresh client is created on demand after closing
+    assert adapter.client is not client
+    adapter.close()
+
+
+def test_ollama_adapter_parallel_tool_calls(input_path):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+    config = {"mcpServers": {"fast": {"command": "npx", "args": []}, "slow": {"command": "npx", "args": []}}}
+    lock, in_flight, max_in_flight, order = threading.Lock(), Counter(), Counter(), []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        server = request.url.path.split("/")[1]
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        with lock:
+            in_flight[server] += 1
+            max_in_flight[server] = max(max_in_flight[server], in_flight[server])
+        time.sleep(0.2 if server == "slow" else 0.05)
+        with lock:
+            in_flight[server] -= 1
+            order.append(json.loads(request.content)["path"])
+        return httpx.Response(200, json={"path": json.loads(request.content)["path"]})
+
+    def call(server: str, tool: str, path: str) -> dict:
+        return {"function": {"name": f"{server}_{tool}", "arguments": {"path": path}}}
+
+    with OllamaMCPOAdapter(config=config, client=httpx.Client(transport=httpx.MockTransport(handler))) as adapter:
+        adapter.list_tools_ollama()
+        calls = [call("slow", "read_file", "s1"), call("slow", "read_file", "s2"), call("slow", "read_file", "s3"),
+                 call("fast", "create_directory", "d1"), call("fast", "read_file", "f1"),
+                 call("fast", "create_directory", "d2")]
+
+        start = time.perf_counter()
+        results = adapter.call_tools_from_response(calls, parallel=True, max_workers=4, max_per_server={"slow": 2},
+                                                   sequential_tools={"fast_create_directory"})
+        duration = time.perf_counter() - start
+
+    # Results keep the original order
+    assert [r["path"] for r in results] == ["s1", "s2", "s3", "d1", "f1", "d2"]
+    # The slow server may not occupy more than two workers, the fast server is not starved by it
+    assert max_in_flight["slow"] == 2
+    assert order.index("f1") < order.index("s1")
+    # Sequential tools keep their order
+    assert order.index("d1") < order.index("d2")
+    # Sequential execution would take 3 * 0.2 + 3 * 0.05
+    assert duration < 0.6
+
+
+def test_scheduler_rejects_invalid_limits():
+    # A limit of 0 would never let a call start
+    for max_per_server in (0, {"slow": 0}, {"fast": 2, "slow": -1}):
+        with pytest.raises(ValueError):
+            ToolCallScheduler(["slow"], ["slow_read_file"], max_per_server=max_per_server)
+    with pytest.raises(ValueError):
+        ToolCallScheduler(["slow"], ["slow_read_file"], max_workers=0)
+    assert ToolCallScheduler(["slow"], ["slow_read_file"], max_per_server={"slow": 1}).take_ready() == [0]
+
+
+def test_ollama_adapter_incremental_server_refresh(input_path):
+    spec = json.loads(input_path.joinpath('filesystem_openapi.json').read_text())
+    specs = {"fs-a": spec, "fs-b": spec}
+    block_fs_b, refresh_started, release_refresh = threading.Event(), threading.Event(), threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        server = request.url.path.split("/")[1]
+        if server == "fs-b" and block_fs_b.is_set():
+            refresh_started.set()
+            release_refresh.wait(2.0)
+        return httpx.Response(200, json=specs[server])
+
+    config = {"mcpServers": {"fs-a": {"command": "npx", "args": []}, "fs-b": {"command": "npx", "args": []}}}
+    adapter = OllamaMCPOAdapter(config=config, client=httpx.Client(transport=httpx.MockTransport(handler)))
+    adapter.list_tools_ollama()
+    old_registry, old_fs_a_tools = adapter.tool_registry, adapter._tools.server_tools("fs-a")
+    tool_count = len(old_registry)
+
+    # fs-b drops all tools but read_file
+    specs["fs-b"] = {**spec, "paths": {"/read_file": spec["paths"]["/read_file"]}}
+    block_fs_b.set()
+    refresh = threading.Thread(target=adapter.refresh_server, args=("fs-b",))
+    refresh.start()
+    assert refresh_started.wait(2.0)
+
+    # While the refresh is running the registry stays complete
+    assert len(adapter.tool_registry) == tool_count
+    release_refresh.set()
+    refresh.join()
+
+    assert [t["function"]["name"] for t in adapter._tools.server_tools("fs-b")] == ["fs-b_read_file"]
+    assert all(new is old for new, old in zip(adapter._tools.server_tools("fs-a"), old_fs_a_tools))
+    assert len(adapter.tool_registry) == tool_count // 2 + 1
+    # Readers of the old snapshot are not affected by the swap
+    assert len(old_registry) == tool_count
+
+    adapter.remove_server("fs-a")
+    assert adapter.servers == ["fs-b"]
+    assert list(adapter.tool_registry) == ["fs-b_read_file"]
+
+    adapter.add_server("fs-a")
+    assert adapter.servers == ["fs-b", "fs-a"]
+    assert len(adapter.ollama_tools) == tool_count // 2 + 1
+
+
 def test_ollama_adapter_with_ollama(input_path, output_path, test_txt_file, ollama_running):
     mcp_config = parse_to_config(mcp_config_path=input_path.joinpath('mcp_config.json'))
 
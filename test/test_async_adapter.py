@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+import unittest.mock
+
+import httpx
+import pytest
+
+from ollama_mcpo_adapter import AsyncOllamaMCPOAdapter, OllamaMCPOAdapter
+
+
+def _servers_config(*names: str) -> dict:
+    return {"mcpServers": {name: {"command": "npx", "args": []} for name in names}}
+
+
+@pytest.mark.asyncio
+async def test_async_adapter_concurrent_discovery(input_path):
+    """ All server specs are fetched concurrently and produce the same tools as the sync adapter """
+    spec = json.loads(input_path.joinpath('filesystem_openapi.json').read_text())
+    config = _servers_config("fs-a", "fs-b", "fs-c")
+    in_flight, max_in_flight = 0, 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, json=spec)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with AsyncOllamaMCPOAdapter("localhost", 5090, config=config, client=client) as adapter:
+        async_tools = await adapter.list_tools_ollama()
+    await client.aclose()
+
+    assert max_in_flight == 3
+
+    mock_response = unittest.mock.Mock()
+    mock_response.json.side_effect = lambda: json.loads(json.dumps(spec))
+    with unittest.mock.patch('ollama_mcpo_adapter.adapter.httpx.Client.get', return_value=mock_response):
+        sync_tools = OllamaMCPOAdapter("localhost", 5090, config=config).list_tools_ollama()
+
+    assert async_tools == sync_tools
+    assert [t["function"]["name"] for t in async_tools][:2] == ["fs-a_read_file", "fs-a_read_multiple_files"]
+
+
+@pytest.mark.asyncio
+async def test_async_adapter_call_tools(input_path):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        if request.url.path.endswith("/write_file"):
+            return httpx.Response(500)
+        return httpx.Response(200, json={"path": json.loads(request.content)["path"]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    adapter = AsyncOllamaMCPOAdapter("localhost", 5090, config=_servers_config("filesystem"), client=client)
+    await adapter.list_tools_ollama()
+
+    results = await adapter.call_tools_from_response([
+        {"function": {"name": "filesystem_read_file", "arguments": '{"path": "a.txt"}'}},
+        {"function": {"name": "filesystem_write_file", "arguments": {"path": "b.txt", "content": ""}}},
+    ])
+    assert results[0] == {"path": "a.txt"}
+    assert "error" in results[1]
+
+    with pytest.raises(ValueError):
+        await adapter.call_tool({"function": {"name": "unknown_tool", "arguments": {}}})
+
+    await adapter.aclose()
+    assert not client.is_closed
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_adapter_parallel_tool_calls(input_path):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+    order = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        path = json.loads(request.content)["path"]
+        await asyncio.sleep(0.1)
+        order.append(path)
+        return httpx.Response(200, json={"path": path})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    adapter = AsyncOllamaMCPOAdapter("localhost", 5090, config=_servers_config("filesystem"), client=client)
+    await adapter.list_tools_ollama()
+
+    calls = [{"function": {"name": "filesystem_write_file", "arguments": {"path": "w1", "content": ""}}},
+             {"function": {"name": "filesystem_read_file", "arguments": {"path": "r1"}}},
+             {"function": {"name": "filesystem_write_file", "arguments": {"path": "w2", "content": ""}}},
+             {"function": {"name": "filesystem_read_file", "arguments": {"path": "r2"}}}]
+
+    start = time.perf_counter()
+    results = await adapter.call_tools_from_response(calls, parallel=True,
+                                                     sequential_tools={"filesystem_write_file"})
+    duration = time.perf_counter() - start
+
+    assert [r["path"] for r in results] == ["w1", "r1", "w2", "r2"]
+    assert order.index("w1") < order.index("w2")
+    # Reads run next to the first write, the second write waits for the first one
+    assert duration < 0.3
+    await client.aclose()
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, Path(__file__).parent.parent.joinpath("benchmarks").as_posix())
+
+from bench_adapter import run, regressions  # noqa: E402
+
+
+def test_benchmark_suite():
+    results = run(servers=2, tools=5, calls=20, startup=False)
+    assert results["list_tools_ms"] > 0 and results["bytes_per_tool"] > 0
+    assert results["call_p50_ms"] <= results["call_p99_ms"]
+    assert results["calls_per_second"] > 0 and results["parallel_calls_per_second"] > 0
+
+
+def test_regressions():
+    baseline = {"list_tools_ms": 10.0, "calls_per_second": 1000.0, "call_p99_ms": 2.0}
+    results = {"list_tools_ms": 11.0, "calls_per_second": 700.0, "call_p99_ms": 3.0, "bytes_per_tool": 100.0}
+    found = regressions(results, baseline, tolerance=0.25)
+    assert [line.split(":")[0] for line in found] == ["calls_per_second", "call_p99_ms"]
@@ -0,0 +1,102 @@
+import unittest.mock
+from collections import Counter
+
+import httpx
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter
+from ollama_mcpo_adapter.catalog_cache import ToolCatalogCache
+from ollama_mcpo_adapter.compaction import SchemaCompactor
+
+CONFIG = {"mcpServers": {"fs-a": {"command": "npx", "args": []}, "fs-b": {"command": "npx", "args": []}}}
+
+
+def _spec_client(input_path, requests: Counter, etag: str = None) -> httpx.Client:
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        server = request.url.path.split("/")[1]
+        requests[server] += 1
+        if etag is not None and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=spec_bytes, headers={"ETag": etag} if etag else {})
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def _list_tools_counting_parses(adapter: OllamaMCPOAdapter, **kwargs):
+    with unittest.mock.patch.object(adapter, "_parse_openapi_tools",
+                                    wraps=adapter._parse_openapi_tools) as parse:
+        tools = adapter.list_tools_ollama(**kwargs)
+    return tools, parse.call_count
+
+
+def test_catalog_cache_memory_and_revalidation(input_path):
+    requests = Counter()
+    cache = ToolCatalogCache(ttl=60.0)
+    adapter = OllamaMCPOAdapter(config=CONFIG, client=_spec_client(input_path, requests), catalog_cache=cache)
+
+    tools, parses = _list_tools_counting_parses(adapter)
+    assert parses == 2 and requests == Counter({"fs-a": 1, "fs-b": 1})
+
+    # Fresh entries are served without contacting MCPO
+    cached_tools, parses = _list_tools_counting_parses(adapter)
+    assert cached_tools == tools
+    assert parses == 0 and requests == Counter({"fs-a": 1, "fs-b": 1})
+
+    # Expired entries are revalidated by spec hash and not parsed again
+    cache.ttl = 0.0
+    revalidated_tools, parses = _list_tools_counting_parses(adapter)
+    assert revalidated_tools == tools
+    assert parses == 0 and requests == Counter({"fs-a": 2, "fs-b": 2})
+
+    # A forced refresh of a single server leaves the other cache entries alone
+    cache.ttl = 60.0
+    _, parses = _list_tools_counting_parses(adapter, refresh=["fs-b"])
+    assert parses == 1 and requests == Counter({"fs-a": 2, "fs-b": 3})
+
+
+def test_catalog_cache_etag_and_disk(input_path, tmp_path):
+    requests = Counter()
+    client = _spec_client(input_path, requests, etag='"v1"')
+    adapter = OllamaMCPOAdapter(config=CONFIG, client=client, catalog_cache=ToolCatalogCache(tmp_path, ttl=60.0))
+    tools = adapter.list_tools_ollama()
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+    # A new process with an empty memory tier loads the catalog from disk
+    disk_adapter = OllamaMCPOAdapter(config=CONFIG, client=client, catalog_cache=ToolCatalogCache(tmp_path, ttl=60.0))
+    disk_tools, parses = _list_tools_counting_parses(disk_adapter)
+    assert disk_tools == tools
+    assert parses == 0 and requests == Counter({"fs-a": 1, "fs-b": 1})
+    assert disk_adapter.tool_registry == adapter.tool_registry
+
+    # Stale entries are revalidated with If-None-Match
+    disk_adapter.catalog_cache.ttl = 0.0
+    _, parses = _list_tools_counting_parses(disk_adapter)
+    assert parses == 0 and requests == Counter({"fs-a": 2, "fs-b": 2})
+
+    disk_adapter.catalog_cache.invalidate(disk_adapter.host, disk_adapter.port, "fs-a")
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    disk_adapter.catalog_cache.invalidate()
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_catalog_cache_parse_options(input_path, tmp_path):
+    requests = Counter()
+    client = _spec_client(input_path, requests, etag='"v1"')
+    tools = OllamaMCPOAdapter(config=CONFIG, client=client,
+                              catalog_cache=ToolCatalogCache(tmp_path, ttl=60.0)).list_tools_ollama()
+
+    # Tools cached without compaction are parsed again for an adapter that compacts them
+    compactor = SchemaCompactor(max_tool_description=20)
+    adapter = OllamaMCPOAdapter(config=CONFIG, client=client, catalog_cache=ToolCatalogCache(tmp_path, ttl=60.0),
+                                schema_compactor=compactor)
+    compacted_tools, parses = _list_tools_counting_parses(adapter)
+    assert parses == 2 and requests == Counter({"fs-a": 2, "fs-b": 2})
+    assert compacted_tools == compactor.compact_tools(tools) != tools
+
+    # Their entries are then reused with the same settings
+    _, parses = _list_tools_counting_parses(adapter)
+    assert parses == 0 and requests == Counter({"fs-a": 2, "fs-b": 2})
+    compactor.max_tool_description = 40
+    _, parses = _list_tools_counting_parses(adapter)
+    assert parses == 2
@@ -0,0 +1,126 @@
+import json
+import time
+
+import httpx
+from ollama import Client
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter
+from ollama_mcpo_adapter.chat_loop import OllamaToolLoop, DONE, MAX_ROUNDS, BYTE_BUDGET
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+STREAM_DELAY = 0.2
+
+
+def _mcpo_handler(input_path, dispatched: list):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        dispatched.append(time.perf_counter())
+        return httpx.Response(200, json={"path": json.loads(request.content)["path"], "content": "x" * 100})
+
+    return handler
+
+
+def _ollama_handler(requests: list, stream_end: list, always_call_tools: bool = False,
+                    tool: str = "filesystem_read_file"):
+    """ Fake Ollama /api/chat: answers with two tool calls until it sees tool results """
+
+    def chunk(content: str = "", tool_calls=None, done: bool = False) -> bytes:
+        message = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        data = {"model": "fake", "created_at": "2025-01-01T00:00:00Z", "message": message, "done": done}
+        if done:
+            data.update(prompt_eval_count=100, eval_count=20)
+        return json.dumps(data).encode() + b"\n"
+
+    def call(path: str) -> dict:
+        return {"function": {"name": tool, "arguments": {"path": path}}}
+
+    def stream(messages):
+        if always_call_tools or messages[-1]["role"] != "tool":
+            yield chunk(tool_calls=[call("a.txt")])
+            yield chunk(tool_calls=[call("b.txt")])
+            time.sleep(STREAM_DELAY)  # the model keeps generating while the tools already run
+            stream_end.append(time.perf_counter())
+            yield chunk(done=True)
+        else:
+            yield chunk("Both ")
+            yield chunk("files read.")
+            yield chunk(done=True)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        return httpx.Response(200, content=stream(body["messages"]))
+
+    return handler
+
+
+def test_tool_loop(input_path):
+    dispatched, requests, stream_end = [], [], []
+    mcpo_client = httpx.Client(transport=httpx.MockTransport(_mcpo_handler(input_path, dispatched)))
+    ollama = Client(transport=httpx.MockTransport(_ollama_handler(requests, stream_end)))
+
+    with OllamaMCPOAdapter(config=CONFIG, client=mcpo_client) as adapter:
+        loop = OllamaToolLoop(adapter, "fake", client=ollama)
+        result = loop.run([{"role": "user", "content": "Read a.txt and b.txt"}])
+
+    assert result.stop_reason == DONE
+    assert result.content == "Both files read."
+    assert len(result.rounds) == 2 and len(requests) == 2
+    assert result.tokens == 240
+
+    # Tool calls were dispatched before the response stream ended
+    assert len(dispatched) == 2 and max(dispatched) < stream_end[0]
+    assert result.rounds[0].first_tool_call_seconds < STREAM_DELAY <= result.rounds[0].chat_seconds
+
+    # Results are appended as tool messages in the order of the tool calls
+    roles = [m["role"] for m in result.messages]
+    assert roles == ["user", "assistant", "tool", "tool", "assistant"]
+    assert [json.loads(m["content"])["path"] for m in result.messages[2:4]] == ["a.txt", "b.txt"]
+    assert requests[1]["messages"][2]["tool_name"] == "filesystem_read_file"
+
+
+def test_tool_loop_limits(input_path):
+    dispatched, requests, stream_end = [], [], []
+    mcpo_client = httpx.Client(transport=httpx.MockTransport(_mcpo_handler(input_path, dispatched)))
+    ollama = Client(transport=httpx.MockTransport(_ollama_handler(requests, stream_end, always_call_tools=True)))
+
+    with OllamaMCPOAdapter(config=CONFIG, client=mcpo_client) as adapter:
+        result = OllamaToolLoop(adapter, "fake", client=ollama, max_rounds=3).run([{"role": "user", "content": "?"}])
+        assert result.stop_reason == MAX_ROUNDS and len(requests) == 3
+
+        loop = OllamaToolLoop(adapter, "fake", client=ollama, max_bytes=150, max_result_bytes=50)
+        result = loop.run([{"role": "user", "content": "?"}])
+        assert result.stop_reason == BYTE_BUDGET and len(result.rounds) == 2
+        assert all(m["content"].endswith("[truncated]") for m in result.messages if m["role"] == "tool")
+
+
+def test_tool_loop_selects_tools(input_path):
+    dispatched, requests, stream_end = [], [], []
+    mcpo_client = httpx.Client(transport=httpx.MockTransport(_mcpo_handler(input_path, dispatched)))
+    ollama = Client(transport=httpx.MockTransport(_ollama_handler(requests, stream_end)))
+
+    with OllamaMCPOAdapter(config=CONFIG, client=mcpo_client) as adapter:
+        OllamaToolLoop(adapter, "fake", client=ollama, select_k=2).run([{"role": "user", "content": "Read a.txt"}])
+
+    assert len(requests[0]["tools"]) == 2
+    assert requests[0]["tools"][0]["function"]["name"] == "filesystem_read_file"
+
+
+def test_tool_loop_reports_failed_calls(input_path):
+    dispatched, requests, stream_end = [], [], []
+    mcpo_client = httpx.Client(transport=httpx.MockTransport(_mcpo_handler(input_path, dispatched)))
+    ollama = Client(transport=httpx.MockTransport(_ollama_handler(requests, stream_end, tool="filesystem_unknown")))
+
+    with OllamaMCPOAdapter(config=CONFIG, client=mcpo_client) as adapter:
+        result = OllamaToolLoop(adapter, "fake", client=ollama).run([{"role": "user", "content": "?"}])
+
+    # The unknown tool is reported to the model as error result and the loop goes on
+    assert result.stop_reason == DONE and not dispatched
+    tool_messages = [m for m in result.messages if m["role"] == "tool"]
+    assert len(tool_messages) == 2 and all(m["tool_name"] == "filesystem_unknown" for m in tool_messages)
+    assert "not found" in json.loads(tool_messages[0]["content"])["error"]
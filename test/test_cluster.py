@@ -0,0 +1,66 @@
+import time
+import unittest.mock
+
+import psutil
+
+from ollama_mcpo_adapter.cluster import MCPOCluster, CRASHED, STARTING, READY
+
+
+def _kill_mcpo(worker) -> None:
+    """ Simulate a crash of the mcpo process of a worker """
+    for child in psutil.Process(worker.service.process.pid).children(recursive=True):
+        child.kill()
+
+
+def test_cluster(stub_config, mcpo_available):
+    add = {"function": {"name": "stub_add", "arguments": {"a": 1, "b": 2}}}
+
+    with MCPOCluster("127.0.0.1", 4190, workers=2, config=stub_config, backoff=0.1) as cluster:
+        assert cluster.endpoints == ["127.0.0.1:4190", "127.0.0.1:4191"]
+        assert all(stats["time_to_ready"] > 0 for stats in cluster.stats())
+
+        with cluster.adapter() as adapter:
+            adapter.list_tools_ollama()
+            assert set(adapter.tool_registry) == {"stub_echo", "stub_add"}
+            assert [adapter.call_tool(add) for _ in range(4)] == [3.0] * 4
+
+            # A crashed worker leaves the pool and is restarted
+            crashed = cluster.workers[0]
+            _kill_mcpo(crashed)
+            deadline = time.monotonic() + 10.0
+            while cluster.endpoints != ["127.0.0.1:4191"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert [e.port for e in cluster.pool.endpoints] == [4191]
+            assert adapter.call_tool(add) == 3.0
+
+            assert cluster.wait_until_ready(timeout=30.0)
+            assert crashed.state == READY and crashed.restarts == 1
+            assert len(cluster.pool) == 2
+
+    assert cluster.endpoints == []
+
+
+def test_cluster_backs_off_failed_restarts(stub_config):
+    cluster = MCPOCluster(port=4320, workers=2, config=stub_config, backoff=5.0)
+    for worker in cluster.workers:
+        worker.state, worker.next_start = CRASHED, 0.0
+
+    def start_worker(worker) -> None:
+        if worker.index == 0:
+            raise OSError("launch failed")
+        worker.state = STARTING
+
+    with unittest.mock.patch.object(cluster, "_start_worker", side_effect=start_worker) as start:
+        # A failed restart does not stop the pass, the worker is retried after a backoff
+        cluster.check_workers()
+        failed, started = cluster.workers
+        assert started.state == STARTING and failed.state == CRASHED
+        assert failed.consecutive_failures == 1 and failed.next_start > time.monotonic() + 4.0
+
+        cluster.check_workers()
+        assert start.call_count == 2
+
+        failed.next_start = 0.0
+        cluster.check_workers()
+        assert failed.consecutive_failures == 2 and failed.next_start > time.monotonic() + 9.0
+    cluster.close()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.coalescing import SingleFlight
+from ollama_mcpo_adapter.metrics import Metrics
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+
+
+def _call(tool: str, **arguments) -> dict:
+    return {"function": {"name": f"filesystem_{tool}", "arguments": arguments}}
+
+
+def test_coalesce_sync(input_path):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+    calls, lock = [], threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        with lock:
+            calls.append(request.url.path)
+        time.sleep(0.2)
+        return httpx.Response(200, json={"args": json.loads(request.content)})
+
+    coalescer, metrics = SingleFlight(idempotent_tools=["filesystem_list_*", "filesystem_read_*"]), Metrics()
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with OllamaMCPOAdapter(config=CONFIG, client=client, coalescer=coalescer, metrics=metrics) as adapter:
+        adapter.list_tools_ollama()
+        tool_calls = [_call("list_directory", path=".")] * 6 + [_call("list_directory", path="sub")] * 2
+        results = adapter.call_tools_from_response(tool_calls, parallel=True, max_workers=8)
+        assert results[0] == {"args": {"path": "."}} and results[7] == {"args": {"path": "sub"}}
+        assert len(calls) == 2
+
+        # Tools not listed as idempotent are never coalesced
+        adapter.call_tools_from_response([_call("write_file", path="a", content="x")] * 3, parallel=True)
+        assert len(calls) == 5
+
+    assert coalescer.stats() == {"calls": 8, "coalesced": 6, "in_flight": 0, "coalesce_rate": 0.75}
+    assert metrics.stats()["tools"]["filesystem_list_directory"]["coalesced_calls"] == 6
+    assert metrics.stats()["tools"]["filesystem_list_directory"]["calls"] == 2
+
+
+def test_coalesce_listed_tools_only():
+    assert not SingleFlight().is_idempotent("filesystem_read_file")
+
+    coalescer = SingleFlight(idempotent_tools=["read"])
+    started, runs = threading.Barrier(2), []
+
+    def post():
+        runs.append(1)
+        started.wait(timeout=2)  # both calls are in flight at once
+        return "posted"
+
+    threads = [threading.Thread(target=coalescer.call, args=("post", {"text": "hi"}, post)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(runs) == 2 and coalescer.stats()["calls"] == 0
+
+
+def test_coalesce_errors_are_shared():
+    coalescer = SingleFlight(idempotent_tools=["read"])
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("broken")
+
+    errors = []
+
+    def follower():
+        started.wait()
+        try:
+            coalescer.call("read", {}, lambda: "not called")
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=follower)
+    thread.start()
+    with pytest.raises(RuntimeError):
+        coalescer.call("read", {}, failing)
+    thread.join()
+    assert len(errors) == 1 and coalescer.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesce_async(input_path):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        calls.append(request.url.path)
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={"args": json.loads(await request.aread())})
+
+    coalescer = SingleFlight(idempotent_tools=["filesystem_read_file"])
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with AsyncOllamaMCPOAdapter(config=CONFIG, client=client, coalescer=coalescer) as adapter:
+        await adapter.list_tools_ollama()
+        results = await asyncio.gather(*(adapter.call_tool(_call("read_file", path="a.txt")) for _ in range(5)))
+
+    assert results == [{"args": {"path": "a.txt"}}] * 5
+    assert len(calls) == 1 and coalescer.coalesced == 4
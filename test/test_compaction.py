@@ -0,0 +1,91 @@
+import httpx
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter
+from ollama_mcpo_adapter.compaction import SchemaCompactor, truncate_description, json_size
+from ollama_mcpo_adapter.validation import SchemaValidator
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+LONG = "Ship the order to the given address. " + "The carrier is chosen automatically based on weight. " * 10
+ADDRESS = {"type": "object", "description": "Postal address",
+           "properties": {"street": {"type": "string", "description": "Street and house number"},
+                          "city": {"type": "string", "description": "City name"},
+                          "country": {"type": "string", "default": "DE", "examples": ["DE", "FR"]}},
+           "required": ["street", "city"]}
+TOOL = {"type": "function", "function": {"name": "shop_ship_order", "description": LONG, "parameters": {
+    "type": "object",
+    "properties": {
+        "order_id": {"type": "integer", "description": LONG, "example": 42},
+        "shipping": {"type": "object", "properties": {"address": ADDRESS, "express": {"type": "boolean",
+                                                                                       "default": False}}},
+        "billing": {"type": "object", "properties": {"address": ADDRESS}},
+        "deep": {"type": "object", "properties": {"a": {"type": "object", "properties": {"b": {
+            "type": "object", "properties": {"c": {"type": "object", "description": "too deep",
+                                                    "properties": {"d": {"type": "string"}}}}}}}}},
+    },
+    "required": ["order_id"]}}}
+
+
+def test_truncate_description():
+    assert truncate_description("Short.", 50) == "Short."
+    assert truncate_description(LONG, 100) == ("Ship the order to the given address. "
+                                               "The carrier is chosen automatically based on weight.")
+    assert truncate_description("word " * 40, 30).endswith("…")
+    assert len(truncate_description("word " * 40, 30)) <= 30
+
+
+def test_compact_tool():
+    compactor = SchemaCompactor(max_description=60, max_tool_description=100, max_depth=3)
+    compacted = compactor.compact_tool(TOOL)
+    function, parameters = compacted["function"], compacted["function"]["parameters"]
+
+    assert function["description"].endswith("weight.") and len(function["description"]) <= 100
+    assert parameters["properties"]["order_id"] == {"type": "integer",
+                                                    "description": "Ship the order to the given address."}
+    assert "default" not in parameters["properties"]["shipping"]["properties"]["express"]
+
+    # The repeated address schema is defined once, parameters themselves stay inline
+    assert parameters["properties"]["shipping"]["properties"]["address"] == {"$ref": "#/$defs/s0"}
+    assert parameters["properties"]["billing"]["properties"]["address"] == {"$ref": "#/$defs/s0"}
+    assert "default" not in parameters["$defs"]["s0"]["properties"]["country"]
+    assert parameters["properties"]["shipping"]["type"] == "object"
+
+    # Schemas below max_depth keep only their type
+    assert parameters["properties"]["deep"]["properties"]["a"]["properties"]["b"]["properties"]["c"] == {
+        "type": "object"}
+
+    # The input is not modified
+    assert TOOL["function"]["parameters"]["properties"]["order_id"]["example"] == 42
+
+    report = compactor.report()
+    assert report["tools"][0]["name"] == "shop_ship_order"
+    assert report["bytes_before"] == json_size(TOOL) > report["bytes_after"] == json_size(compacted)
+    assert report["tokens_before"] > report["tokens_after"]
+
+
+def test_validate_compacted_schema():
+    parameters = SchemaCompactor().compact_tool(TOOL)["function"]["parameters"]
+    assert "$defs" in parameters
+    validator = SchemaValidator(parameters)
+
+    # Arguments below a deduplicated schema are checked against its definition
+    address = {"street": "Main St 1", "city": "Berlin"}
+    arguments, errors = validator.validate({"order_id": "7", "billing": {"address": address}})
+    assert arguments == {"order_id": 7, "billing": {"address": address}} and not errors
+
+    _, errors = validator.validate({"order_id": 7, "shipping": {"address": {"street": "Main St 1", "city": 5}}})
+    assert errors == [{"argument": "shipping.address.city", "message": "expected string, got 5"}]
+    _, errors = validator.validate({"order_id": 7, "billing": {"address": {"city": "Berlin"}}})
+    assert errors == [{"argument": "billing.address.street", "message": "is required"}]
+
+
+def test_adapter_schema_compactor(input_path):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=spec_bytes)))
+    compactor = SchemaCompactor(max_tool_description=80)
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, schema_compactor=compactor) as adapter:
+        tools = adapter.list_tools_ollama()
+
+    assert all(len(tool["function"]["description"]) <= 80 for tool in tools)
+    assert set(compactor.reports) == set(adapter.tool_registry)
+    assert compactor.report()["bytes_after"] < compactor.report()["bytes_before"]
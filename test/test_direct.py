@@ -0,0 +1,79 @@
+import httpx
+import psutil
+import pytest
+
+from ollama_mcpo_adapter.direct import DirectMCPAdapter
+from ollama_mcpo_adapter.metrics import Metrics
+from ollama_mcpo_adapter.result_cache import ToolResultCache
+from ollama_mcpo_adapter.validation import ArgumentValidator
+
+
+def _call(tool: str, **arguments) -> dict:
+    return {"function": {"name": f"stub_{tool}", "arguments": arguments}}
+
+
+def test_direct_adapter(stub_config):
+    metrics = Metrics()
+    with DirectMCPAdapter(config=stub_config, metrics=metrics) as adapter:
+        tools = adapter.list_tools_ollama()
+        assert [tool["function"]["name"] for tool in tools] == ["stub_echo", "stub_add"]
+        assert tools[0]["function"]["parameters"] == {
+            "type": "object", "properties": {"text": {"type": "string", "description": "Text to echo"}},
+            "required": ["text"]}
+        assert adapter.tool_servers == {"stub_echo": "stub", "stub_add": "stub"}
+
+        assert adapter.call_tool(_call("add", a=1, b=2)) == 3
+        results = adapter.call_tools_from_response([_call("echo", text=f"t{i}") for i in range(8)], parallel=True)
+        assert results == [f"t{i}" for i in range(8)]
+
+    stats = metrics.stats()
+    assert stats["tools"]["stub_echo"]["calls"] == 8
+    assert stats["servers"]["stub"]["discovery_seconds"]["count"] == 1
+
+
+def test_direct_adapter_caches_read_only_tools(stub_config):
+    cache = ToolResultCache()
+    with DirectMCPAdapter(config=stub_config, result_cache=cache) as adapter:
+        adapter.list_tools_ollama()
+        assert adapter.read_only_tools == {"stub_echo"}
+        for _ in range(3):
+            adapter.call_tool(_call("echo", text="cached"))
+            adapter.call_tool(_call("add", a=1, b=2))
+
+        # Removed tools are no longer read-only
+        adapter.remove_server("stub")
+        assert adapter.read_only_tools == set()
+        adapter.add_server("stub")
+        assert adapter.read_only_tools == {"stub_echo"}
+
+    # Only the tool annotated read-only is cached, `add` is not listed in the allow list
+    assert cache.stats()["hits"] == 2 and cache.stats()["entries"] == 1
+
+
+def test_direct_adapter_stream(stub_config):
+    with DirectMCPAdapter(config=stub_config, validator=ArgumentValidator()) as adapter:
+        adapter.list_tools_ollama()
+        with adapter.call_tool_stream(_call("echo", text="streamed"), chunk_size=4) as stream:
+            assert list(stream.iter_json()) == ["streamed"]
+            assert stream.response.url == "mcp://direct/stub/stub_echo"
+
+        stream = adapter.call_tool_stream(_call("echo", text="streamed"), chunk_size=4, max_bytes=4)
+        assert stream.read() == b'"str' and stream.truncated
+
+        # Failed calls raise like a failed MCPO request
+        with pytest.raises(httpx.HTTPStatusError):
+            adapter.call_tool_stream(_call("add", a=1))
+
+
+def test_direct_adapter_restarts_session(stub_config):
+    with DirectMCPAdapter(config=stub_config, timeout=5.0) as adapter:
+        adapter.list_tools_ollama()
+        assert adapter.call_tool(_call("add", a=1, b=2)) == 3
+
+        for child in psutil.Process().children(recursive=True):
+            if "stub_mcp_server.py" in " ".join(child.cmdline()):
+                child.kill()
+                child.wait(5)
+
+        adapter.call_tool(_call("add", a=1, b=2))  # fails on the dead session and restarts it
+        assert adapter.call_tool(_call("add", a=2, b=2)) == 4
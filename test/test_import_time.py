@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from typing import Set
+
+import ollama_mcpo_adapter
+from ollama_mcpo_adapter import config_parser
+
+# Modules the adapter must not pull in on import, they are only needed by the service or for type hints
+HEAVY_MODULES = ("ollama", "dotenv", "psutil", "multiprocessing", "ollama_mcpo_adapter.service",
+                 "ollama_mcpo_adapter.service_runner")
+
+
+def _imported_modules(statement: str) -> Set[str]:
+    """ Top level and sub modules imported by `statement` in a fresh interpreter, read from -X importtime """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True,
+                             text=True, check=True)
+    return {line.rsplit("|", 1)[-1].strip() for line in process.stderr.splitlines()
+            if line.startswith("import time:")}
+
+
+def test_adapter_import_is_lazy():
+    modules = _imported_modules("from ollama_mcpo_adapter import OllamaMCPOAdapter")
+    # The lazily imported module itself is loaded by importlib, which -X importtime does not report
+    assert "ollama_mcpo_adapter.dispatcher" in modules
+    assert [module for module in HEAVY_MODULES if module in modules] == []
+
+
+def test_package_import_loads_no_submodules():
+    modules = _imported_modules("import ollama_mcpo_adapter")
+    assert [module for module in modules if module.startswith("ollama_mcpo_adapter.")] == []
+    assert "dotenv" not in modules
+
+
+def test_lazy_attributes():
+    from ollama_mcpo_adapter.service import MCPOService
+    assert ollama_mcpo_adapter.MCPOService is MCPOService
+    assert set(ollama_mcpo_adapter.__all__) <= set(dir(ollama_mcpo_adapter))
+    try:
+        ollama_mcpo_adapter.NotAName
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Unknown attributes must raise AttributeError")
+
+
+def test_load_dotenv_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv(config_parser.WIN_NPX_PATH_VARIABLE, "")
+    monkeypatch.delenv(config_parser.WIN_NPX_PATH_VARIABLE)
+    assert config_parser.win_npx_path() == "npx"
+
+    env_file = tmp_path / ".env"
+    env_file.write_text(f"{config_parser.WIN_NPX_PATH_VARIABLE}=C:/nodejs/npx.cmd\n")
+    assert ollama_mcpo_adapter.load_dotenv(env_file)
+    assert config_parser.win_npx_path() == "C:/nodejs/npx.cmd"
@@ -0,0 +1,124 @@
+import json
+
+import httpx
+import pytest
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.metrics import Metrics, Histogram, OpenTelemetryCallback
+from ollama_mcpo_adapter.result_cache import ToolResultCache
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}, "time": {"command": "uvx", "args": []}}}
+
+
+def _handler(input_path):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/time/openapi.json":
+            return httpx.Response(503)
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        if request.url.path.endswith("/write_file"):
+            return httpx.Response(500)
+        if request.url.path.endswith("/move_file"):
+            raise httpx.ReadTimeout("Timed out", request=request)
+        return httpx.Response(200, json={"args": json.loads(request.content)})
+
+    return handler
+
+
+def _call(tool: str, **arguments) -> dict:
+    return {"function": {"name": f"filesystem_{tool}", "arguments": arguments}}
+
+
+def test_histogram():
+    histogram = Histogram((1, 2, 5))
+    for value in (0.5, 1.5, 1.5, 4, 10):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 1]
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5 and snapshot["max"] == 10
+    assert snapshot["p50"] == 2 and snapshot["p99"] == 10
+
+
+def test_adapter_metrics(input_path):
+    events = []
+    metrics = Metrics(callbacks=[lambda name, value, labels: events.append((name, labels))])
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path)))
+
+    cache = ToolResultCache(allow=["filesystem_*"])
+    with OllamaMCPOAdapter(config=CONFIG, client=client, metrics=metrics, result_cache=cache) as adapter:
+        adapter.list_tools_ollama()
+        for _ in range(3):
+            adapter.call_tool(_call("read_file", path="a.txt"))
+        adapter.call_tool(_call("write_file", path="a.txt", content="x"))
+        adapter.call_tool(_call("move_file", source="a", destination="b"))
+
+    stats = metrics.stats()
+    read_file = stats["tools"]["filesystem_read_file"]
+    assert read_file["calls"] == 1 and read_file["server"] == "filesystem"
+    assert read_file["cache_hits"] == 2 and read_file["cache_misses"] == 1
+    assert read_file["tool_response_bytes"]["sum"] == len(b'{"args":{"path":"a.txt"}}')
+    assert read_file["tool_request_bytes"]["sum"] > 0
+
+    assert stats["tools"]["filesystem_write_file"]["errors"] == {"HTTPStatusError": 1}
+    assert stats["tools"]["filesystem_move_file"]["errors"] == {"ReadTimeout": 1}
+    assert stats["errors"] == {"HTTPStatusError": 2, "ReadTimeout": 1}
+
+    # Discovery duration per server, the failing time server is counted as error
+    assert stats["servers"]["filesystem"]["discovery_seconds"]["count"] == 1
+    assert stats["servers"]["time"]["discovery_errors"] == {"HTTPStatusError": 1}
+
+    assert ("tool_call_seconds", {"tool": "filesystem_read_file", "server": "filesystem"}) in events
+
+    text = metrics.prometheus()
+    assert '# TYPE ollama_mcpo_tool_call_seconds histogram' in text
+    labels = 'server="filesystem",tool="filesystem_read_file"'
+    assert f'ollama_mcpo_tool_call_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f'ollama_mcpo_tool_call_seconds_count{{{labels}}} 1' in text
+    labels = 'error="ReadTimeout",server="filesystem",tool="filesystem_move_file"'
+    assert f'ollama_mcpo_tool_errors_total{{{labels}}} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_async_adapter_metrics(input_path):
+    metrics = Metrics()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(input_path)))
+
+    async with AsyncOllamaMCPOAdapter(config=CONFIG, client=client, metrics=metrics) as adapter:
+        await adapter.list_tools_ollama()
+        await adapter.call_tools_from_response([_call("read_file", path="a.txt")] * 2, parallel=True)
+
+    stats = metrics.stats()
+    assert stats["tools"]["filesystem_read_file"]["calls"] == 2
+    assert set(stats["servers"]) == {"filesystem", "time"}
+
+
+def test_open_telemetry_callback():
+    try:
+        import opentelemetry  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            OpenTelemetryCallback()
+        return
+
+    recorded = []
+
+    class Instrument:
+        def add(self, value, attributes):
+            recorded.append(("add", value, attributes))
+
+        def record(self, value, attributes):
+            recorded.append(("record", value, attributes))
+
+    class Meter:
+        def create_counter(self, name, **kwargs):
+            return Instrument()
+
+        def create_histogram(self, name, **kwargs):
+            return Instrument()
+
+    metrics = Metrics(callbacks=[OpenTelemetryCallback(Meter())])
+    metrics.cache("tool", hit=True)
+    metrics.discovery("server", 0.5)
+    assert recorded == [("add", 1, {"tool": "tool"}), ("record", 0.5, {"server": "server"})]
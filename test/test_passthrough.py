@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import httpx
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.passthrough import RawToolResult, truncate_content, TRUNCATED_MARKER
+from ollama_mcpo_adapter.result_cache import ToolResultCache
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+LISTING = [{"name": f"file_{i}.txt", "size": i * 1024} for i in range(50)] + ["é"]
+
+
+def _handler(input_path, calls: list):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        calls.append(request.url.path)
+        if request.url.path.endswith("/read_file"):
+            return httpx.Response(200, json="file content")
+        if request.url.path.endswith("/move_file"):
+            return httpx.Response(404, json={"detail": "Not found"})
+        return httpx.Response(200, content=json.dumps(LISTING, ensure_ascii=False, separators=(",", ":")).encode())
+
+    return handler
+
+
+def _call(tool: str, arguments) -> dict:
+    return {"function": {"name": f"filesystem_{tool}", "arguments": arguments}}
+
+
+def test_raw_tool_result():
+    raw = RawToolResult(b'[1,{"a":"\xc3\xa9"}]')
+    assert raw.text() == '[1,{"a":"é"}]' and not raw.is_error
+    assert raw.text(max_bytes=10) == '[1,{"a":"' + TRUNCATED_MARKER
+    assert raw.json() == [1, {"a": "é"}] and raw.json() is raw.json()
+
+    # JSON strings become the plain text, like the decoded result
+    assert RawToolResult(b'"line\\nbreak"').text() == "line\nbreak"
+    assert RawToolResult.from_result({"x": 1}).content == b'{"x":1}'
+    assert RawToolResult.from_error("boom").is_error
+    assert RawToolResult(b'{"error":"boom"}').tool_message("t") == {"role": "tool", "content": '{"error":"boom"}',
+                                                                     "tool_name": "t"}
+    # Cut at a character boundary
+    assert truncate_content("ééé", 3) == "é" + TRUNCATED_MARKER
+    assert truncate_content("ééé", 6) == "ééé"
+
+
+def test_adapter_call_tool_raw(input_path):
+    calls = []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls)))
+    with OllamaMCPOAdapter(config=CONFIG, client=client) as adapter:
+        adapter.list_tools_ollama()
+
+        raw = adapter.call_tool_raw(_call("list_directory", {"path": "/"}))
+        assert raw.content == json.dumps(LISTING, ensure_ascii=False, separators=(",", ":")).encode()
+        assert raw.json() == LISTING == adapter.call_tool(_call("list_directory", {"path": "/"}))
+
+        message = adapter.call_tool_message(_call("read_file", '{"path": "a.txt"}'), max_bytes=4)
+        assert message == {"role": "tool", "content": "file" + TRUNCATED_MARKER, "tool_name": "filesystem_read_file"}
+
+        error = adapter.call_tool_raw(_call("move_file", {"source": "a", "destination": "b"}))
+        assert error.is_error and "404" in error.json()["error"]
+
+
+def test_raw_results_are_cached(input_path):
+    calls = []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls)))
+    cache = ToolResultCache(allow=["filesystem_*"], max_bytes=100_000)
+    with OllamaMCPOAdapter(config=CONFIG, client=client, result_cache=cache) as adapter:
+        adapter.list_tools_ollama()
+
+        raw = adapter.call_tool_raw(_call("list_directory", {"path": "/"}))
+        assert adapter.call_tool_raw(_call("list_directory", {"path": "/"})) is raw
+        assert adapter.call_tool(_call("list_directory", {"path": "/"})) == LISTING
+        assert len(calls) == 1 and cache.stats()["bytes"] == len(raw.content)
+
+        # Decoded results in the cache are served raw as well
+        assert adapter.call_tool(_call("read_file", {"path": "a.txt"})) == "file content"
+        assert adapter.call_tool_raw(_call("read_file", {"path": "a.txt"})).text() == "file content"
+        assert len(calls) == 2
+
+
+def test_async_adapter_call_tool_raw(input_path):
+    calls = []
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(input_path, calls)))
+        async with AsyncOllamaMCPOAdapter(config=CONFIG, client=client) as adapter:
+            await adapter.list_tools_ollama()
+            raw = await adapter.call_tool_raw(_call("list_directory", {"path": "/"}))
+            message = await adapter.call_tool_message(_call("read_file", {"path": "a.txt"}))
+            return raw, message
+
+    raw, message = asyncio.run(main())
+    assert raw.json() == LISTING
+    assert message["content"] == "file content"
@@ -0,0 +1,122 @@
+import json
+from collections import Counter
+
+import httpx
+import pytest
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.pool import EndpointPool, ROUND_ROBIN
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+ENDPOINTS = ["127.0.0.1:4091", "127.0.0.1:4092", ("127.0.0.1", 4093)]
+
+
+def _handler(input_path, calls: Counter, dead: set):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        port = request.url.port
+        if port in dead:
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path.endswith("openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        calls[port] += 1
+        return httpx.Response(200, json={"port": port, "args": json.loads(request.content)})
+
+    return handler
+
+
+def _call(path: str) -> dict:
+    return {"function": {"name": "filesystem_read_file", "arguments": {"path": path}}}
+
+
+def test_pool_round_robin_and_failover(input_path):
+    calls, dead = Counter(), set()
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls, dead)))
+    pool = EndpointPool(ENDPOINTS, strategy=ROUND_ROBIN, eject_seconds=60.0)
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, endpoints=pool) as adapter:
+        assert adapter.server_base_url == "http://127.0.0.1:4091"
+        adapter.list_tools_ollama()
+        assert adapter.tool_registry["filesystem_read_file"] == "http://127.0.0.1:4091/filesystem/read_file"
+
+        for i in range(6):
+            adapter.call_tool(_call(f"{i}.txt"))
+        assert calls == Counter({4091: 2, 4092: 2, 4093: 2})
+
+        # A dead instance is ejected on its first connection error and the call fails over
+        dead.add(4092)
+        calls.clear()
+        results = [adapter.call_tool(_call(f"{i}.txt")) for i in range(6)]
+        assert all("error" not in result for result in results)
+        assert calls == Counter({4091: 3, 4093: 3})
+        assert [e.healthy for e in pool.endpoints] == [True, False, True]
+
+        # Active health checks re-admit recovered instances
+        dead.clear()
+        assert len(adapter.check_endpoints()) == 3
+        assert all(pool.endpoints[i].in_flight == 0 for i in range(3))
+
+        # Every instance down: the error is returned like any other dispatch error
+        dead.update({4091, 4092, 4093})
+        assert "error" in adapter.call_tool(_call("a.txt"))
+
+
+def test_pool_stream_failover(input_path):
+    calls, dead = Counter(), set()
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls, dead)))
+    pool = EndpointPool(ENDPOINTS[:2], strategy=ROUND_ROBIN, eject_seconds=60.0)
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, endpoints=pool) as adapter:
+        adapter.list_tools_ollama()
+
+        # Streams fail over and keep their instance busy until they are closed
+        dead.add(4091)
+        streams = [adapter.call_tool_stream(_call(f"{i}.txt")) for i in range(2)]
+        assert [stream.response.url.port for stream in streams] == [4092, 4092]
+        assert [e.in_flight for e in pool.endpoints] == [0, 2]
+        for stream in streams:
+            stream.close()
+            stream.close()
+        assert [e.in_flight for e in pool.endpoints] == [0, 0]
+        assert [e.healthy for e in pool.endpoints] == [False, True]
+
+        dead.add(4092)
+        with pytest.raises(httpx.ConnectError):
+            adapter.call_tool_stream(_call("a.txt"))
+        assert all(e.in_flight == 0 for e in pool.endpoints)
+
+
+def test_pool_least_in_flight():
+    pool = EndpointPool(ENDPOINTS)
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+    assert {first.port, second.port, third.port} == {4091, 4092, 4093}
+
+    pool.release(second)
+    assert pool.acquire() is second
+
+    pool.mark_failed(first)
+    pool.release(third)
+    assert pool.acquire() is third
+
+    with pytest.raises(ValueError):
+        EndpointPool([])
+
+
+@pytest.mark.asyncio
+async def test_async_pool_failover(input_path):
+    calls, dead = Counter(), {4091}
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(input_path, calls, dead)))
+
+    async with AsyncOllamaMCPOAdapter(config=CONFIG, client=client, endpoints=ENDPOINTS) as adapter:
+        # Discovery uses a healthy instance once the dead one is known
+        assert [e.port for e in await adapter.check_endpoints()] == [4092, 4093]
+        await adapter.list_tools_ollama()
+
+        results = await adapter.call_tools_from_response([_call(f"{i}.txt") for i in range(4)], parallel=True)
+        assert {result["port"] for result in results} == {4092, 4093}
+        assert 4091 not in calls
+
+        async with await adapter.call_tool_stream(_call("a.txt")) as stream:
+            assert stream.response.url.port in (4092, 4093) and sum(e.in_flight for e in adapter.pool.endpoints) == 1
+        assert all(e.in_flight == 0 for e in adapter.pool.endpoints)
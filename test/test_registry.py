@@ -0,0 +1,43 @@
+import sys
+
+from ollama_mcpo_adapter.registry import ToolRegistrySnapshot
+
+
+def _entries(server: str, count: int, base_url: str = "http://localhost:5090") -> list:
+    params = {"type": "object", "properties": {"path": {"type": "string"}}, "required": ["path"]}
+    return [(f"{server}_tool_{i}", f"{base_url}/{server}/tool_{i}",
+             {"type": "function", "function": {"name": f"{server}_tool_{i}", "parameters": params}})
+            for i in range(count)]
+
+
+def test_registry_indexes():
+    snapshot = ToolRegistrySnapshot({"fs": _entries("fs", 3), "time": _entries("time", 2)})
+    assert len(snapshot) == 5 and "fs_tool_1" in snapshot
+    assert snapshot.tool_registry["time_tool_1"] == "http://localhost:5090/time/tool_1"
+    assert snapshot.tool_servers["fs_tool_2"] == "fs"
+    assert snapshot.server_of("time_tool_0") == "time" and snapshot.server_of("missing") == ""
+    assert [tool["function"]["name"] for tool in snapshot.ollama_tools][:2] == ["fs_tool_0", "fs_tool_1"]
+    assert snapshot.ollama_tools is snapshot.ollama_tools  # materialized once
+
+    record = snapshot.get("fs_tool_0")
+    assert record.server_name == "fs" and record.path == "/tool_0"
+    assert record.parameters["required"] == ["path"]
+    assert len(snapshot.tools_with_schema(record.schema_key)) == 5
+
+    # Tools of one server share one base url string
+    base_urls = {id(r.base_url) for r in snapshot.servers["fs"].tools}
+    assert len(base_urls) == 1 and sys.intern("http://localhost:5090/fs") is snapshot.get("fs_tool_1").base_url
+    assert snapshot.servers["fs"].entries() == _entries("fs", 3)
+
+
+def test_registry_copy_on_write():
+    snapshot = ToolRegistrySnapshot({"fs": _entries("fs", 3), "time": _entries("time", 2)})
+    updated = snapshot.with_server("time", _entries("time", 1, "http://other:5091"))
+
+    assert updated.servers["fs"] is snapshot.servers["fs"]  # unchanged servers are shared
+    assert len(updated) == 4 and len(snapshot) == 5
+    assert updated.tool_registry["time_tool_0"] == "http://other:5091/time/tool_0"
+    assert list(updated.servers) == ["fs", "time"]
+
+    removed = updated.without_server("fs")
+    assert removed.server_tools("fs") == [] and len(removed.server_tools("time")) == 1
@@ -0,0 +1,155 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.metrics import Metrics
+from ollama_mcpo_adapter.resilience import (CircuitBreaker, ResiliencePolicy, CLOSED, OPEN, HALF_OPEN,
+                                            CIRCUIT_OPEN_ERROR)
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+
+
+def _handler(input_path, calls, fail, error=httpx.ConnectError):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        calls.append(request.url.path)
+        if fail(request):
+            raise error("Connection failed", request=request)
+        if request.url.path.endswith("/read_file"):
+            return httpx.Response(200, json={"args": json.loads(request.content)})
+        return httpx.Response(404)
+
+    return handler
+
+
+def _call(tool: str, **arguments) -> dict:
+    return {"function": {"name": f"filesystem_{tool}", "arguments": arguments}}
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+    assert breaker.allow()
+    breaker.record(failed=True)
+    assert breaker.state == CLOSED
+    breaker.record(failed=True)
+    assert breaker.state == OPEN and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial call
+    breaker.record(failed=True)
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(failed=False)
+    assert breaker.snapshot() == {"state": CLOSED, "failures": 0, "retry_after": 0.0}
+
+
+def test_policy_timeouts_and_idempotency():
+    policy = ResiliencePolicy(timeout=10, server_timeouts={"time": 2}, tool_timeouts={"*_search": 20},
+                              idempotent_tools=["filesystem_write_file", "filesystem_*"])
+    assert not ResiliencePolicy().is_idempotent("filesystem_read_file")
+    assert policy.timeout_for("ddg_search", "ddg") == 20
+    assert policy.timeout_for("time_now", "time") == 2
+    assert policy.timeout_for("filesystem_read_file", "filesystem") == 10
+    assert policy.is_idempotent("filesystem_read_file")
+    assert policy.is_idempotent("filesystem_write_file")
+    assert not policy.is_idempotent("filesystem_move_file")
+    assert not policy.is_idempotent("time_now")
+    assert 0 <= policy.retry_delay(10) <= policy.max_backoff
+
+
+def test_retries_unsent_calls_of_every_tool(input_path):
+    calls, failures = [], iter([True, True, False, True, False])
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls, lambda r: next(failures))))
+    policy = ResiliencePolicy(retries=2, backoff=0.001, failure_threshold=10)
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, resilience=policy) as adapter:
+        adapter.list_tools_ollama()
+        assert adapter.call_tool(_call("read_file", path="a.txt")) == {"args": {"path": "a.txt"}}
+        assert len(calls) == 3
+
+        # The connect error proves the request was never sent, even a side effect tool is safe to retry
+        adapter.call_tool(_call("write_file", path="a.txt", content="x"))
+        assert len(calls) == 5
+
+
+def test_read_timeouts_retry_listed_tools_only(input_path):
+    calls = []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls, lambda r: True,
+                                                                 error=httpx.ReadTimeout)))
+    policy = ResiliencePolicy(retries=2, backoff=0.001, failure_threshold=10,
+                              idempotent_tools=["filesystem_list_directory"])
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, resilience=policy) as adapter:
+        adapter.list_tools_ollama()
+        # The server may have run the call before the timeout, a tool not listed as idempotent is not re-sent
+        assert "error" in adapter.call_tool(_call("read_file", path="a.txt"))
+        assert len(calls) == 1
+
+        assert "error" in adapter.call_tool(_call("list_directory", path="."))
+        assert len(calls) == 4
+        assert adapter.circuit_breakers["filesystem"]["failures"] == 4
+
+
+def test_timeout_budget(input_path):
+    calls = []
+
+    def slow(request):
+        time.sleep(0.05)
+        return True
+
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls, slow)))
+    policy = ResiliencePolicy(tool_timeouts={"filesystem_read_file": 0.12}, retries=10, backoff=0.01,
+                              max_backoff=0.01, failure_threshold=100)
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, resilience=policy) as adapter:
+        adapter.list_tools_ollama()
+        start = time.perf_counter()
+        assert "error" in adapter.call_tool(_call("read_file", path="a.txt"))
+        assert time.perf_counter() - start < 0.25
+        assert 1 < len(calls) < 5
+
+
+def test_circuit_breaker_fast_fails(input_path):
+    calls, broken = [], [True]
+    metrics = Metrics()
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls, lambda r: broken[0])))
+    policy = ResiliencePolicy(retries=0, failure_threshold=2, recovery_time=0.05)
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, resilience=policy, metrics=metrics) as adapter:
+        adapter.list_tools_ollama()
+        for _ in range(5):
+            assert "error" in adapter.call_tool(_call("read_file", path="a.txt"))
+        assert len(calls) == 2
+        assert adapter.circuit_breakers["filesystem"]["state"] == OPEN
+        assert metrics.stats()["errors"] == {"ConnectError": 2, CIRCUIT_OPEN_ERROR: 3}
+
+        # Tool errors of a healthy server do not count as failures
+        broken[0] = False
+        time.sleep(0.06)
+        assert "error" in adapter.call_tool(_call("list_directory", path="."))
+        assert adapter.circuit_breakers["filesystem"]["state"] == CLOSED
+        assert adapter.call_tool(_call("read_file", path="a.txt")) == {"args": {"path": "a.txt"}}
+
+
+@pytest.mark.asyncio
+async def test_async_retries(input_path):
+    calls, failures = [], iter([True, False])
+    transport = httpx.MockTransport(_handler(input_path, calls, lambda r: next(failures)))
+    policy = ResiliencePolicy(retries=1, backoff=0.001)
+
+    async with AsyncOllamaMCPOAdapter(config=CONFIG, client=httpx.AsyncClient(transport=transport),
+                                      resilience=policy) as adapter:
+        await adapter.list_tools_ollama()
+        assert await adapter.call_tool(_call("read_file", path="a.txt")) == {"args": {"path": "a.txt"}}
+        assert len(calls) == 2
+        assert adapter.circuit_breakers["filesystem"]["state"] == CLOSED
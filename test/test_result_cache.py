@@ -0,0 +1,122 @@
+import json
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.result_cache import ToolResultCache, MISS
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+
+
+def _handler(input_path, calls: Counter):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        calls[request.url.path] += 1
+        if request.url.path.endswith("/get_file_info"):
+            return httpx.Response(500)
+        return httpx.Response(200, json={"args": json.loads(request.content)})
+
+    return handler
+
+
+def _call(tool: str, **arguments) -> dict:
+    return {"function": {"name": f"filesystem_{tool}", "arguments": arguments}}
+
+
+def test_result_cache_lru_ttl_and_rules():
+    cache = ToolResultCache(maxsize=2, ttl=60.0, tool_ttls={"time_*": 0.05, "ddg-search_*": 0},
+                            allow=["fs_*", "time_*", "ddg-search_*"])
+
+    cache.put("fs_read_file", {"path": "a", "encoding": "utf8"}, "a")
+    # Argument order does not matter
+    assert cache.get("fs_read_file", {"encoding": "utf8", "path": "a"}) == "a"
+
+    # Side-effecting tools matching an allow pattern and disabled tools are not cached
+    cache.put("fs_write_file", {"path": "a"}, "ok")
+    cache.put("ddg-search_search", {"query": "q"}, "results")
+    assert cache.get("fs_write_file", {"path": "a"}) is MISS
+    assert cache.get("ddg-search_search", {"query": "q"}) is MISS
+
+    # Errors are not cached
+    cache.put("fs_read_file", {"path": "missing"}, {"error": "not found"})
+    assert cache.get("fs_read_file", {"path": "missing"}) is MISS
+
+    # Per tool TTL
+    cache.put("time_get_current_time", {}, "12:00")
+    assert cache.get("time_get_current_time", {}) == "12:00"
+    time.sleep(0.06)
+    assert cache.get("time_get_current_time", {}) is MISS
+
+    # LRU eviction, fs_read_file a was used most recently
+    cache.put("fs_read_file", {"path": "b"}, "b")
+    cache.get("fs_read_file", {"path": "a", "encoding": "utf8"})
+    cache.put("fs_read_file", {"path": "c"}, "c")
+    assert cache.get("fs_read_file", {"path": "b"}) is MISS
+    assert cache.get("fs_read_file", {"path": "a", "encoding": "utf8"}) == "a"
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 4 and stats["misses"] == 3
+
+
+def test_result_cache_allow_list_and_byte_bound():
+    cache = ToolResultCache(allow=["fs_read_*", "fs_write_file"], max_bytes=20)
+    assert cache.is_cacheable("fs_read_file")
+    assert cache.is_cacheable("fs_write_file")
+    assert not cache.is_cacheable("fs_list_directory")
+
+    cache.put("fs_read_file", {"path": "big"}, "x" * 50)
+    assert cache.get("fs_read_file", {"path": "big"}) is MISS
+    cache.put("fs_read_file", {"path": "a"}, "a" * 10)
+    cache.put("fs_read_file", {"path": "b"}, "b" * 10)
+    assert cache.get("fs_read_file", {"path": "a"}) is MISS
+    assert cache.stats()["bytes"] <= 20
+
+
+def test_result_cache_caches_listed_or_read_only_tools_only():
+    cache = ToolResultCache()
+    cache.put("puppeteer_click", {"selector": "#buy"}, "clicked")
+    assert cache.get("puppeteer_click", {"selector": "#buy"}) is MISS
+
+    # Tools marked read-only by their server are cacheable, the deny patterns still apply to them
+    assert cache.is_cacheable("fs_read_file", read_only=True)
+    assert not cache.is_cacheable("fs_send_file", read_only=True)
+    cache.put("fs_read_file", {"path": "a"}, "a", read_only=True)
+    assert cache.get("fs_read_file", {"path": "a"}, read_only=True) == "a"
+    assert ToolResultCache(allow=["fs_send_file"]).is_cacheable("fs_send_file")
+
+
+def test_adapter_result_cache(input_path):
+    calls = Counter()
+    cache = ToolResultCache(allow=["filesystem_*"])
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, calls)))
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, result_cache=cache) as adapter:
+        adapter.list_tools_ollama()
+        for _ in range(3):
+            assert adapter.call_tool(_call("read_file", path="a.txt")) == {"args": {"path": "a.txt"}}
+            adapter.call_tool(_call("write_file", path="a.txt", content=""))
+            assert "error" in adapter.call_tool(_call("get_file_info", path="a.txt"))
+
+    assert calls == Counter({"/filesystem/read_file": 1, "/filesystem/write_file": 3, "/filesystem/get_file_info": 3})
+    assert cache.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_async_adapter_result_cache(input_path):
+    calls = Counter()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(input_path, calls)))
+
+    cache = ToolResultCache(allow=["filesystem_list_directory"])
+    async with AsyncOllamaMCPOAdapter(config=CONFIG, client=client, result_cache=cache) as adapter:
+        await adapter.list_tools_ollama()
+        await adapter.call_tools_from_response([_call("list_directory", path="/")] * 3)
+
+    assert calls == Counter({"/filesystem/list_directory": 1})
+    assert adapter.result_cache.stats()["hits"] == 2
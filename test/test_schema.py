@@ -0,0 +1,52 @@
+import copy
+
+from ollama_mcpo_adapter.schema import SchemaNormalizer
+
+SPEC = {
+    "components": {"schemas": {
+        "Point": {"title": "Point", "type": "object", "description": "",
+                  "properties": {"x": {"type": "number", "title": "X"}, "y": {"type": "number", "title": "Y"}},
+                  "required": ["x", "y"]},
+        "Labeled": {"type": "object", "properties": {"label": {"type": "string"}}, "required": ["label"]},
+        "Shape": {"title": "Shape", "type": "object",
+                  "properties": {"origin": {"$ref": "#/components/schemas/Point"},
+                                 "points": {"type": "array", "items": {"$ref": "#/components/schemas/Point"}},
+                                 "name": {"anyOf": [{"type": "string"}, {"type": "null"}], "title": "Name"},
+                                 "size": {"anyOf": [{"type": "integer"}, {"type": "string"}]},
+                                 "style": {"$ref": "#/$defs/Style", "description": "Drawing style"}},
+                  "required": ["origin"]},
+        "LabeledShape": {"allOf": [{"$ref": "#/components/schemas/Shape"}, {"$ref": "#/components/schemas/Labeled"}]},
+        "Tree": {"type": "object", "properties": {"children": {"type": "array",
+                                                               "items": {"$ref": "#/components/schemas/Tree"}}}},
+    }},
+    "$defs": {"Style": {"type": "string", "enum": ["solid", "dashed"], "description": "Line style"}},
+}
+
+
+def test_schema_normalizer_inlines_references():
+    spec = copy.deepcopy(SPEC)
+    normalizer = SchemaNormalizer(spec)
+    params = normalizer.parameters({"$ref": "#/components/schemas/LabeledShape"})
+
+    assert params["required"] == ["origin", "label"]
+    properties = params["properties"]
+    assert properties["origin"] == {"type": "object", "properties": {"x": {"type": "number"}, "y": {"type": "number"}},
+                                    "required": ["x", "y"]}
+    assert properties["points"]["items"] == properties["origin"]
+    assert properties["name"] == {"type": "string"}
+    assert properties["size"] == {"anyOf": [{"type": "integer"}, {"type": "string"}]}
+    assert properties["style"] == {"description": "Drawing style", "type": "string", "enum": ["solid", "dashed"]}
+    assert properties["label"] == {"type": "string"}
+
+    # Shared components are resolved once and the spec is left untouched
+    assert properties["points"]["items"] is properties["origin"]
+    assert spec == SPEC
+
+
+def test_schema_normalizer_recursion():
+    normalizer = SchemaNormalizer(SPEC)
+    tree = normalizer.resolve_ref("#/components/schemas/Tree")
+
+    assert tree["properties"]["children"]["items"] == {"type": "object"}
+    assert normalizer.parameters({"$ref": "#/components/schemas/Missing"}) == {
+        "type": "object", "properties": {}, "required": []}
@@ -1,9 +1,12 @@
 import logging
+import sys
 import time
 
 import httpx
+import pytest
 
 from ollama_mcpo_adapter import MCPOService
+from ollama_mcpo_adapter.service import THREAD
 
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
@@ -41,3 +44,43 @@ def test_failing_service():
             not_reachable = True
     mcpo_service.cleanup()
     assert not_reachable is True
+
+
+def test_service_readiness(stub_config, mcpo_available):
+    """ Readiness means every configured MCP server answers """
+    host, port = "127.0.0.1", 4094
+
+    with MCPOService(host, port, config=stub_config) as mcpo_service:
+        assert mcpo_service.is_ready()
+        assert list(mcpo_service.server_ready_times) == ["stub"]
+        assert 0 < mcpo_service.server_ready_times["stub"] <= mcpo_service.time_to_ready
+        assert httpx.get(f"http://{host}:{port}/stub/openapi.json").status_code == 200
+
+
+def test_service_exits_early(mcpo_available):
+    """ Waiting ends as soon as mcpo exits instead of running into the timeout """
+    config = {"mcpServers": {"broken": {"command": sys.executable, "args": "not-a-list"}}}
+    mcpo_service = MCPOService("127.0.0.1", 4094, config=config, timeout=30.0)
+
+    start = time.monotonic()
+    mcpo_service.start(wait=False)
+    assert mcpo_service.wait_for_mcpo_ready() is False
+    assert time.monotonic() - start < 15.0
+    assert not mcpo_service.is_ready()
+    mcpo_service.stop()
+
+
+def test_service_thread_mode(stub_config, mcpo_available):
+    """ mcpo supervised from a thread, config passed without a temp file """
+    host, port = "127.0.0.1", 4095
+
+    with MCPOService(host, port, config=stub_config, launch_mode=THREAD) as mcpo_service:
+        assert mcpo_service.is_ready() and mcpo_service.is_running()
+        if sys.platform != "win32":
+            assert mcpo_service.process.args[-1].startswith("/dev/fd/")
+        response = httpx.post(f"http://{host}:{port}/stub/echo", json={"text": "hello"})
+        assert response.json() == "hello"
+
+    assert not mcpo_service.is_running()
+    with pytest.raises(httpx.ConnectError):
+        httpx.get(f"http://{host}:{port}/docs", timeout=0.5)
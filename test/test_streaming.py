@@ -0,0 +1,129 @@
+import json
+
+import httpx
+import pytest
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.streaming import JSONItemParser, JSONTextDecoder
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+LISTING = [{"name": f"file_{i}.txt", "size": i * 1024, "dir": i % 7 == 0} for i in range(200)] + [12345, None, "é"]
+
+
+def _handler(input_path, is_async: bool = False):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+    body = json.dumps(LISTING, ensure_ascii=False).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        if request.url.path.endswith("/read_file"):
+            return httpx.Response(404, json={"detail": "Not found"})
+        # Stream the body in small pieces
+        pieces = [body[i:i + 100] for i in range(0, len(body), 100)]
+        return httpx.Response(200, content=_aiter(pieces) if is_async else iter(pieces))
+
+    return handler
+
+
+async def _aiter(pieces):
+    for piece in pieces:
+        yield piece
+
+
+def test_json_text_decoder_any_chunking():
+    content = 'line 1\n"quoted" \\ tab\t é 😀 ' * 20
+    for body in (json.dumps(content).encode(), json.dumps(content, ensure_ascii=False).encode()):
+        for chunk_size in (1, 2, 5, 7, 4096):
+            decoder, pieces = JSONTextDecoder(), []
+            for i in range(0, len(body), chunk_size):
+                pieces.append(decoder.feed(body[i:i + chunk_size]))
+            pieces.append(decoder.close())
+            assert "".join(pieces) == content
+            assert chunk_size == 4096 or max(len(piece) for piece in pieces) <= chunk_size
+
+    # Other values are passed on as text, a cut off string keeps its complete part
+    decoder = JSONTextDecoder()
+    assert decoder.feed(b' [1, "a"]') + decoder.close() == ' [1, "a"]'
+    decoder = JSONTextDecoder()
+    assert decoder.feed(b'"ab\\u00') + decoder.close() == "ab"
+
+
+def test_json_item_parser_any_chunking():
+    body = json.dumps(LISTING, ensure_ascii=False).encode()
+    for chunk_size in (1, 7, 4096):
+        parser, items = JSONItemParser(), []
+        for i in range(0, len(body), chunk_size):
+            items.extend(parser.feed(body[i:i + chunk_size]))
+        items.extend(parser.close())
+        assert items == LISTING
+
+    parser = JSONItemParser()
+    assert parser.feed(b' {"content": "abc') == []
+    assert parser.close(truncated=True) == []
+
+    parser = JSONItemParser()
+    assert parser.feed(b'"text result"') == []
+    assert parser.close() == ["text result"]
+
+
+def test_adapter_stream_tool_call(input_path):
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path)))
+    call = {"function": {"name": "filesystem_list_directory", "arguments": {"path": "/"}}}
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client) as adapter:
+        adapter.list_tools_ollama()
+
+        with adapter.call_tool_stream(call, chunk_size=64) as stream:
+            assert list(stream.iter_json()) == LISTING
+            assert not stream.truncated
+
+        stream = adapter.call_tool_stream(call, max_bytes=250)
+        data = stream.read()
+        assert len(data) == 250 and stream.truncated
+        assert stream.response.is_closed
+
+        # Only complete items before the cut off are parsed
+        items = list(adapter.call_tool_stream(call, max_bytes=250).iter_json())
+        assert 0 < len(items) < len(LISTING) and items == LISTING[:len(items)]
+
+        with pytest.raises(httpx.HTTPStatusError):
+            adapter.call_tool_stream({"function": {"name": "filesystem_read_file", "arguments": {"path": "a"}}})
+
+
+def test_stream_limit_on_chunk_boundary(input_path):
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path)))
+    call = {"function": {"name": "filesystem_list_directory", "arguments": {"path": "/"}}}
+    body_size = len(json.dumps(LISTING, ensure_ascii=False).encode())
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client) as adapter:
+        adapter.list_tools_ollama()
+
+        # The limit ends exactly after the fourth chunk, the body goes on
+        stream = adapter.call_tool_stream(call, chunk_size=1024, max_bytes=4096)
+        items = list(stream.iter_json())
+        assert stream.truncated and stream.bytes_received == 4096
+        assert 0 < len(items) < len(LISTING) and items == LISTING[:len(items)]
+
+        # The limit ends exactly with the body
+        stream = adapter.call_tool_stream(call, chunk_size=body_size, max_bytes=body_size)
+        assert list(stream.iter_json()) == LISTING and not stream.truncated
+
+
+@pytest.mark.asyncio
+async def test_async_adapter_stream_tool_call(input_path):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(input_path, is_async=True)))
+    call = {"function": {"name": "filesystem_list_directory", "arguments": {"path": "/"}}}
+
+    async with AsyncOllamaMCPOAdapter(config=CONFIG, client=client) as adapter:
+        await adapter.list_tools_ollama()
+
+        async with await adapter.call_tool_stream(call) as stream:
+            assert [item async for item in stream.aiter_json()] == LISTING
+
+        stream = await adapter.call_tool_stream(call, max_bytes=1000)
+        assert len(await stream.read()) == 1000 and stream.truncated
+
+        stream = await adapter.call_tool_stream(call, chunk_size=1024, max_bytes=4096)
+        items = [item async for item in stream.aiter_json()]
+        assert stream.truncated and items == LISTING[:len(items)]
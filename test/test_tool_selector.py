@@ -0,0 +1,79 @@
+import time
+
+import httpx
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter
+from ollama_mcpo_adapter.tool_selector import ToolSelector, tokenize
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+TOPICS = ["weather", "calendar", "email", "invoice", "database", "kubernetes", "translation", "stock", "music", "maps"]
+ACTIONS = ["get", "list", "create", "update", "delete", "search", "export", "sync", "archive", "summarize"]
+
+
+def _synthetic_tools(count: int) -> list:
+    tools = []
+    for i in range(count):
+        topic, action = TOPICS[i % len(TOPICS)], ACTIONS[(i // len(TOPICS)) % len(ACTIONS)]
+        tools.append({"type": "function", "function": {
+            "name": f"{topic}-server_{action}_{topic}_{i}",
+            "description": f"{action.capitalize()} {topic} records of account {i}",
+            "parameters": {"type": "object", "properties": {"query": {"type": "string", "description": "Filter"}}}}})
+    return tools
+
+
+def _adapter(input_path) -> OllamaMCPOAdapter:
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=spec_bytes)))
+    return OllamaMCPOAdapter(config=CONFIG, client=client)
+
+
+def test_tokenize():
+    assert tokenize("filesystem_read_file") == ["filesystem", "read", "file"]
+    assert tokenize("getCurrentTime of the ddg-search HTTPServer") == ["get", "current", "time", "ddg", "search",
+                                                                       "http", "server"]
+
+
+def test_select_tools(input_path):
+    with _adapter(input_path) as adapter:
+        adapter.list_tools_ollama()
+        names = [t["function"]["name"] for t in adapter.select_tools("Please read the contents of notes.txt", k=3)]
+        assert names[0] == "filesystem_read_file"
+        assert 1 < len(names) <= 3
+
+        tools = adapter.select_tools("move the file", k=1, always=["filesystem_write_file"])
+        names = [t["function"]["name"] for t in tools]
+        assert names == ["filesystem_move_file", "filesystem_write_file"]
+
+        # The index follows registry changes
+        selector = adapter.tool_selector
+        assert adapter.tool_selector is selector
+        adapter.remove_server("filesystem")
+        assert adapter.select_tools("read a file") == []
+
+
+def test_select_latency(input_path):
+    with _adapter(input_path) as adapter:
+        tools = adapter.list_tools_ollama() + _synthetic_tools(500)
+
+    selector = ToolSelector(tools)
+    queries = ["what is the weather in Berlin tomorrow", "search my email for the invoice from March",
+               "list all files in the directory /tmp", "export the calendar of next week"] * 250
+
+    start = time.perf_counter()
+    results = [selector.select(query, k=8) for query in queries]
+    mean = (time.perf_counter() - start) / len(queries)
+
+    assert mean < 0.001
+    assert results[0][0]["function"]["name"].startswith("weather-server_")
+    assert results[2][0]["function"]["name"] == "filesystem_list_directory"
+
+
+def test_embedder():
+    """ An embedder adds similarity for queries without shared words """
+    vectors = {"weather": [1.0, 0.0], "email": [0.0, 1.0]}
+
+    def embed(texts):
+        return [vectors["weather"] if "weather" in text or "rain" in text else vectors["email"] for text in texts]
+
+    selector = ToolSelector(_synthetic_tools(20), embedder=embed, alpha=0.8)
+    assert selector.rank("will it rain", k=1)[0][0].startswith("weather-server_")
@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import httpx
+
+from ollama_mcpo_adapter import OllamaMCPOAdapter, AsyncOllamaMCPOAdapter
+from ollama_mcpo_adapter.metrics import Metrics
+from ollama_mcpo_adapter.schema import SchemaNormalizer
+from ollama_mcpo_adapter.validation import ArgumentValidator, SchemaValidator, VALIDATION_ERROR
+
+CONFIG = {"mcpServers": {"filesystem": {"command": "npx", "args": []}}}
+SCHEMA = {"type": "object", "required": ["path"], "properties": {
+    "path": {"type": "string", "minLength": 1},
+    "depth": {"type": "integer", "minimum": 0},
+    "mode": {"type": "string", "enum": ["text", "binary"]},
+    "recursive": {"type": "boolean"},
+    "edits": {"type": "array", "items": {"type": "object", "required": ["oldText", "newText"],
+                                         "properties": {"oldText": {"type": "string"},
+                                                        "newText": {"type": "string"}}}},
+    "key": {"anyOf": [{"type": "integer"}, {"type": "string"}]}}}
+
+
+def _handler(input_path, dispatched: list):
+    spec_bytes = input_path.joinpath('filesystem_openapi.json').read_bytes()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/openapi.json"):
+            return httpx.Response(200, content=spec_bytes)
+        dispatched.append(json.loads(request.content))
+        return httpx.Response(200, json="ok")
+
+    return handler
+
+
+def test_schema_validator_coercion():
+    validator = SchemaValidator(SCHEMA)
+    arguments = {"path": "a.txt", "depth": "2", "recursive": "false", "key": "5",
+                 "edits": '[{"oldText": "a", "newText": "b"}]', "mode": None}
+    checked, errors = validator.validate(arguments)
+    assert errors == []
+    assert checked == {"path": "a.txt", "depth": 2, "recursive": False, "key": "5",
+                       "edits": [{"oldText": "a", "newText": "b"}], "mode": None}
+    assert arguments["depth"] == "2"  # the input is not modified
+
+    valid = {"path": "a.txt", "depth": 3}
+    assert validator.validate(valid) == (valid, [])
+    assert validator.validate({"path": "a.txt", "depth": 2.0})[0]["depth"] == 2
+
+    _, errors = SchemaValidator(SCHEMA, coerce=False).validate({"path": "a.txt", "depth": "2"})
+    assert errors == [{"argument": "depth", "message": 'expected integer, got "2"'}]
+
+
+def test_schema_validator_errors():
+    validator = SchemaValidator(SCHEMA)
+    _, errors = validator.validate({"depth": -1, "mode": "csv", "recursive": 2, "key": [1],
+                                    "edits": [{"oldText": 1}]})
+    assert {e["argument"]: e["message"] for e in errors} == {
+        "path": "is required",
+        "depth": "must be at least 0",
+        "mode": 'must be one of ["text", "binary"], got "csv"',
+        "recursive": "expected boolean, got 2",
+        "key": "does not match any allowed schema, got [1]",
+        "edits[0].newText": "is required",
+        "edits[0].oldText": "expected string, got 1",
+    }
+    assert validator.validate({"path": True})[1] == [{"argument": "path", "message": "expected string, got true"}]
+    assert validator.validate({"path": "a", "depth": True})[1][0]["argument"] == "depth"
+    assert validator.validate(["a.txt"])[1][0]["message"] == 'arguments must be an object, got ["a.txt"]'
+
+
+def test_schema_validator_required_nullable():
+    # pydantic `x: str | None` without a default is required but accepts null
+    body = {"type": "object", "required": ["x"], "properties": {
+        "x": {"anyOf": [{"type": "string"}, {"type": "null"}], "title": "X"},
+        "y": {"anyOf": [{"type": "integer"}, {"type": "null"}], "default": None}}}
+    parameters = SchemaNormalizer(body).parameters(body)
+    assert parameters["properties"] == {"x": {"type": "string", "nullable": True},
+                                        "y": {"type": "integer", "default": None}}
+
+    validator = SchemaValidator(parameters)
+    assert validator.validate({"x": None}) == ({"x": None}, [])
+    assert validator.validate({"x": "a", "y": None}) == ({"x": "a", "y": None}, [])
+    assert validator.validate({"x": 1})[1] == [{"argument": "x", "message": "expected string, got 1"}]
+    assert validator.validate({})[1] == [{"argument": "x", "message": "is required"}]
+
+
+def test_schema_validator_unsupported_pattern():
+    # ECMA 262 unicode property escapes are not supported by Python's re
+    validator = SchemaValidator({"type": "object", "properties": {
+        "name": {"type": "string", "pattern": r"^\p{L}+$"},
+        "code": {"type": "string", "pattern": "^[A-Z]+$", "maxLength": 3}}})
+    assert validator.validate({"name": "Zoë", "code": "AB"}) == ({"name": "Zoë", "code": "AB"}, [])
+    assert validator.validate({"name": 1})[1] == [{"argument": "name", "message": "expected string, got 1"}]
+    assert validator.validate({"code": "ab"})[1] == [{"argument": "code", "message": "must match the pattern ^[A-Z]+$"}]
+
+
+def test_adapter_rejects_invalid_arguments(input_path):
+    dispatched = []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(input_path, dispatched)))
+    validator, metrics = ArgumentValidator(), Metrics()
+
+    with OllamaMCPOAdapter(config=CONFIG, client=client, validator=validator, metrics=metrics) as adapter:
+        adapter.list_tools_ollama()
+        # Tools with the same parameters share one validator
+        assert validator.stats()["validators"] < len(adapter.ollama_tools)
+
+        result = adapter.call_tool({"function": {"name": "filesystem_move_file", "arguments": {"source": "a"}}})
+        assert result["invalid_arguments"] == [{"argument": "destination", "message": "is required"}]
+        assert "destination is required" in result["error"]
+        assert dispatched == []
+
+        call = {"function": {"name": "filesystem_edit_file", "arguments": {"path": "a", "edits": [], "dryRun": "true"}}}
+        assert adapter.call_tool(call) == "ok"
+        assert dispatched == [{"path": "a", "edits": [], "dryRun": True}]
+
+    stats = validator.stats()
+    assert (stats["validated"], stats["coerced"], stats["rejected"]) == (2, 1, 1)
+    assert metrics.stats()["tools"]["filesystem_move_file"]["errors"] == {VALIDATION_ERROR: 1}
+
+
+def test_async_adapter_rejects_invalid_arguments(input_path):
+    dispatched = []
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_handler(input_path, dispatched)))
+        async with AsyncOllamaMCPOAdapter(config=CONFIG, client=client, validator=ArgumentValidator()) as adapter:
+            await adapter.list_tools_ollama()
+            return await adapter.call_tool({"function": {"name": "filesystem_read_file", "arguments": {}}})
+
+    result = asyncio.run(main())
+    assert result["invalid_arguments"] == [{"argument": "path", "message": "is required"}]
+    assert dispatched == []
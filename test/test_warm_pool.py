@@ -0,0 +1,99 @@
+import time
+
+import httpx
+
+from ollama_mcpo_adapter.warm_pool import MCPOWarmPool, WarmInstance, config_key
+
+
+def test_config_key(stub_config):
+    reordered = {"mcpServers": {"stub": dict(reversed(list(stub_config["mcpServers"]["stub"].items())))}}
+    assert config_key(stub_config) == config_key(reordered)
+    assert config_key(stub_config) != config_key({"mcpServers": {}})
+
+
+class _FakeService:
+    host, process = "127.0.0.1", None
+
+    def __init__(self, port: int, pool: MCPOWarmPool) -> None:
+        self.port, self.pool = port, pool
+        self.stopped_in_pool = None
+
+    def is_running(self) -> bool:
+        return True
+
+    def is_ready(self) -> bool:
+        return True
+
+    def stop(self) -> None:
+        self.stopped_in_pool = any(i.service is self for i in self.pool.instances)
+
+    def cleanup(self) -> None:
+        pass
+
+
+def test_reap_removes_instances_before_stopping():
+    with MCPOWarmPool(ports=[], ttl=60.0, reap_interval=None) as pool:
+        instances = [WarmInstance("key", _FakeService(port, pool)) for port in (4310, 4311, 4312)]
+        for instance in instances:
+            instance.ready.set()
+        instances[0].last_used -= 120
+        pool._instances.extend(instances)
+
+        # An instance acquired while the memory was measured is not reaped
+        def memory() -> int:
+            instances[1].in_use = True
+            return 100
+        instances[2].memory = memory
+        instances[1].memory = lambda: 100
+        pool.memory_budget = 1
+
+        assert pool.reap() == [instances[0], instances[2]]
+        assert instances[0].service.stopped_in_pool is False and instances[2].service.stopped_in_pool is False
+        assert pool.instances == [instances[1]] and instances[1].service.stopped_in_pool is None
+        instances[1].in_use = False
+
+
+def test_acquire_without_free_ports_for_the_standby(stub_config):
+    with MCPOWarmPool(ports=[], reap_interval=None) as pool:
+        key = config_key(stub_config)
+        instance = WarmInstance(key, _FakeService(4310, pool))
+        instance.ready.set()
+        pool._instances.append(instance)
+        pool._standby[key] = 1
+
+        # The standby can not be replenished, the warm instance is handed out anyway
+        service = pool.acquire(config=stub_config)
+        assert service is instance.service and instance.in_use
+        pool.release(service)
+        assert pool.stats() == {key: {"idle": 1, "in_use": 0, "standby": 1}}
+
+
+def test_warm_pool(stub_config, mcpo_available):
+    with MCPOWarmPool(ports=range(4300, 4303), ttl=60.0, reap_interval=None) as pool:
+        key = pool.prewarm(config=stub_config, wait=True)
+        assert pool.stats() == {key: {"idle": 1, "in_use": 0, "standby": 1}}
+
+        # A warm instance is handed out without waiting for a start
+        start = time.monotonic()
+        service = pool.acquire(config=stub_config)
+        assert time.monotonic() - start < 1.0
+        assert httpx.post(f"http://{service.host}:{service.port}/stub/add", json={"a": 1, "b": 2}).json() == 3.0
+
+        # The standby is replenished in the background
+        assert pool.stats()[key]["in_use"] == 1 and pool.stats()[key]["idle"] == 1
+
+        pool.release(service)
+        assert pool.stats()[key]["idle"] == 2
+
+        # Idle instances above the memory budget are reaped, least recently used first
+        for instance in pool.instances:
+            instance.ready.wait(30.0)
+        pool.memory_budget = 1
+        reaped = pool.reap()
+        assert len(reaped) == 2 and pool.instances == []
+        assert not service.is_running()
+
+        # Expired instances are reaped too
+        pool.memory_budget, pool.ttl = None, 0.0
+        pool.release(pool.acquire(config=stub_config))
+        assert len(pool.reap()) >= 1